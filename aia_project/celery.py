@@ -15,9 +15,38 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Autodiscover tasks from all applications listed in INSTALLED_APPS
 app.autodiscover_tasks()
 
+# Task modules that live outside of an app's tasks.py
+app.conf.imports = ("core.queue.user_import", "core.queue.email")
+
+
+@app.on_after_configure.connect
+def setup_assessment_tasks(sender, **kwargs):
+    """
+    The assessment tracker needs the assessment app, its tasks are only
+    loaded, and the expiry sweep only scheduled (`celery --app aia_project beat`),
+    once the app is installed.
+    """
+    from django.conf import settings
+
+    if not any(name.split(".")[0] == "assessment" for name in settings.INSTALLED_APPS):
+        return
+    sender.conf.imports = (*sender.conf.imports, "core.queue.assessment_tracker")
+    # in 'eta' mode every assessment schedules its own expiry
+    if settings.ASSESSMENT_EXPIRY_MODE == "sweep":
+        sender.conf.beat_schedule = {
+            **sender.conf.beat_schedule,
+            "sweep-expired-assessments": {
+                "task": "core.queue.assessment_tracker.sweep_expired_assessments",
+                "schedule": settings.ASSESSMENT_SWEEP_INTERVAL,
+            },
+        }
+
+
 # Optional configuration settings
 app.conf.update(
     broker_url=config("BROKER_URL"),  # Redis as the broker
     result_backend=config("RESULT_URL"),  # Redis as the backend for task results
     result_expires=int(config("EXPIRE_IN")),  # Task results expiration time
+    # ETA tasks (assessment expiry) must not be redelivered before they are due
+    broker_transport_options={"visibility_timeout": int(config("BROKER_VISIBILITY_TIMEOUT", default=7200))},
 )
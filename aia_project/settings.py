@@ -72,13 +72,27 @@ ROOT_URLCONF = 'aia_project.urls'
 # Add this REST framework default authentication configuration:
 REST_FRAMEWORK = {}
 
+# Shared caches: in-process LRU by default, redis when CACHE_BACKEND=redis
+CACHE_BACKEND = config("CACHE_BACKEND", default="local")
+CACHE_REDIS_URL = config("CACHE_REDIS_URL", default="redis://localhost:6379/1")
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=int(config("ACCESS_TOKEN_LIFETIME"))),  # Token lifetime
     'REFRESH_TOKEN_LIFETIME': timedelta(days=int(config("REFRESH_TOKEN_LIFETIME"))),  # Refresh token lifetime
-    'ROTATE_REFRESH_TOKENS': True,
+    # rotation relies on the outstanding tokens shared through redis, it is refused with the local backend
+    'ROTATE_REFRESH_TOKENS': config("ROTATE_REFRESH_TOKENS", default=CACHE_BACKEND == "redis", cast=bool),
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+# Verified access tokens remembered per process until they expire
+TOKEN_VERIFY_CACHE_SIZE = config("TOKEN_VERIFY_CACHE_SIZE", default=10000, cast=int)
+# 'claims': authorize from the role/status claims of the token, 'database': load the user first.
+# 'claims' relies on the revocations shared through redis, it is refused with the local backend.
+AUTHORIZATION_MODE = config("AUTHORIZATION_MODE", default="claims" if CACHE_BACKEND == "redis" else "database")
+# Revoked tokens and users are checked in memory, and reloaded from redis (CACHE_BACKEND=redis)
+# at most every REVOCATION_SYNC_INTERVAL seconds
+REVOCATION_SYNC_INTERVAL = config("REVOCATION_SYNC_INTERVAL", default=1, cast=float)
+
 WSGI_APPLICATION = 'aia_project.wsgi.application'
 
 # Database
@@ -97,6 +111,59 @@ EMAIL_PORT = config("EMAIL_PORT")
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 
+# Outgoing email dispatch: 'thread' (bounded in-process pool) or 'celery'
+EMAIL_DISPATCHER = config("EMAIL_DISPATCHER", default="thread")
+EMAIL_WORKERS = config("EMAIL_WORKERS", default=4, cast=int)
+EMAIL_QUEUE_SIZE = config("EMAIL_QUEUE_SIZE", default=1000, cast=int)
+EMAIL_QUEUE_TIMEOUT = config("EMAIL_QUEUE_TIMEOUT", default=5, cast=int)  # seconds to wait for a free slot
+EMAIL_MAX_RETRIES = config("EMAIL_MAX_RETRIES", default=3, cast=int)
+EMAIL_RETRY_BACKOFF = config("EMAIL_RETRY_BACKOFF", default=2, cast=int)  # seconds, doubled on every retry
+EMAIL_BATCH_SIZE = config("EMAIL_BATCH_SIZE", default=50, cast=int)  # messages sent per pooled connection use
+EMAIL_POOL_SIZE = config("EMAIL_POOL_SIZE", default=2, cast=int)  # open SMTP connections kept per process
+EMAIL_POOL_MAX_IDLE = config("EMAIL_POOL_MAX_IDLE", default=60, cast=int)  # seconds before an idle one is reopened
+
+# Authenticated user cache used by the auth decorators
+USER_CACHE_TTL = config("USER_CACHE_TTL", default=30, cast=int)
+USER_CACHE_MAX_SIZE = config("USER_CACHE_MAX_SIZE", default=10000, cast=int)
+
+# Pagination of users/list/: 'offset' (page numbers) or 'cursor' (keyset on created_at, id).
+# Cursor mode is opt-in, it ignores ?page= and drops the page key of the response
+USER_LIST_PAGINATION = config("USER_LIST_PAGINATION", default="offset")
+
+# total_count of paginated lists: 'exact' (COUNT(*) per page), 'cached' (per queryset, for the TTL)
+# or 'estimate' (PostgreSQL planner estimate past the threshold, cached)
+PAGINATION_COUNT_STRATEGY = config("PAGINATION_COUNT_STRATEGY", default="cached")
+PAGINATION_COUNT_CACHE_TTL = config("PAGINATION_COUNT_CACHE_TTL", default=60, cast=int)
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = config("PAGINATION_COUNT_ESTIMATE_THRESHOLD", default=10000, cast=int)
+
+# Rows per query of the bulk repository operations (bulk_create, bulk_update, update_where, ...)
+BULK_BATCH_SIZE = config("BULK_BATCH_SIZE", default=500, cast=int)
+
+# Bulk user import (CSV streaming)
+USER_IMPORT_CHUNK_SIZE = config("USER_IMPORT_CHUNK_SIZE", default=1000, cast=int)
+USER_IMPORT_BATCH_SIZE = config("USER_IMPORT_BATCH_SIZE", default=500, cast=int)
+USER_IMPORT_CHECKPOINT_TTL = config("USER_IMPORT_CHECKPOINT_TTL", default=86400, cast=int)
+USER_IMPORT_MODE = config("USER_IMPORT_MODE", default="async")  # 'async' (celery) or 'sync'
+USER_IMPORT_MAX_SIZE = config("USER_IMPORT_MAX_SIZE", default=50 * 1024 * 1024, cast=int)  # bytes
+# larger files must be imported async, a sync import has to finish within the gunicorn timeout
+USER_IMPORT_SYNC_MAX_SIZE = config("USER_IMPORT_SYNC_MAX_SIZE", default=1024 * 1024, cast=int)  # bytes
+USER_IMPORT_MAX_RETRIES = config("USER_IMPORT_MAX_RETRIES", default=5, cast=int)
+USER_IMPORT_RETRY_BACKOFF = config("USER_IMPORT_RETRY_BACKOFF", default=10, cast=int)  # seconds, doubled on every retry
+
+# last_login writes: 'buffered' (write-behind, flushed in bulk) or 'immediate'
+LAST_LOGIN_WRITE_MODE = config("LAST_LOGIN_WRITE_MODE", default="buffered")
+LAST_LOGIN_FLUSH_INTERVAL = config("LAST_LOGIN_FLUSH_INTERVAL", default=5, cast=float)  # max staleness, seconds
+LAST_LOGIN_BUFFER_SIZE = config("LAST_LOGIN_BUFFER_SIZE", default=1000, cast=int)  # flush early past this
+LAST_LOGIN_BATCH_SIZE = config("LAST_LOGIN_BATCH_SIZE", default=500, cast=int)  # users per UPDATE
+
+# Time a candidate has to finish an assessment
+ASSESSMENT_DURATION_MINUTES = config("ASSESSMENT_DURATION_MINUTES", default=60, cast=int)
+# 'sweep': one periodic bulk expiry for all assessments, 'eta': one scheduled task per assessment
+ASSESSMENT_EXPIRY_MODE = config("ASSESSMENT_EXPIRY_MODE", default="sweep")
+ASSESSMENT_SWEEP_INTERVAL = config("ASSESSMENT_SWEEP_INTERVAL", default=60, cast=int)  # seconds
+# how often the elapsed time polled by the clients (PROGRESS state of track_assessment_time) is refreshed
+ASSESSMENT_PROGRESS_INTERVAL = config("ASSESSMENT_PROGRESS_INTERVAL", default=60, cast=int)  # seconds
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -115,6 +182,38 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Rate limits of the endpoints running password hashes or sending emails,
+# scope: {identity: (max requests, window in seconds)}, counted over a sliding window
+RATE_LIMIT_ENABLED = config("RATE_LIMIT_ENABLED", default=True, cast=bool)
+RATE_LIMIT_TRUSTED_PROXIES = config("RATE_LIMIT_TRUSTED_PROXIES", default=0, cast=int)  # X-Forwarded-For hops
+RATE_LIMITS = {
+    "login": {
+        "ip": (config("RATE_LIMIT_LOGIN_IP", default=30, cast=int), 60),
+        "email": (config("RATE_LIMIT_LOGIN_EMAIL", default=10, cast=int), 300),
+    },
+    "super_admin_login": {
+        "ip": (config("RATE_LIMIT_SUPER_ADMIN_LOGIN_IP", default=10, cast=int), 60),
+        "email": (config("RATE_LIMIT_SUPER_ADMIN_LOGIN_EMAIL", default=5, cast=int), 300),
+    },
+    "forgot_password": {
+        "ip": (config("RATE_LIMIT_FORGOT_PASSWORD_IP", default=10, cast=int), 3600),
+        "email": (config("RATE_LIMIT_FORGOT_PASSWORD_EMAIL", default=3, cast=int), 3600),
+    },
+}
+
+# Password hashing, the first hasher hashes new passwords and re-hashes the others on login.
+# Benchmark the cost with `manage.py benchmark_password_hashing`.
+PASSWORD_HASHERS = [
+    "core.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASH_ITERATIONS = config("PASSWORD_HASH_ITERATIONS", default=870000, cast=int)  # PBKDF2 cost
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=0, cast=int)  # hashing processes, 0 hashes inline
+PASSWORD_HASH_TIMEOUT = config("PASSWORD_HASH_TIMEOUT", default=10, cast=float)  # seconds
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
@@ -6,4 +6,7 @@ class AuthConfig(AppConfig):
     name = 'auth_app'
 
     def ready(self):
+        from core.auth.checks import check_auth_settings
         import core.signals.user  # noqa
+
+        check_auth_settings()
@@ -0,0 +1,52 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes are built CONCURRENTLY, without locking users against writes
+    atomic = False
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='userentity',
+            index=models.Index(fields=['created_at', 'id'], name='users_created_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='userentity',
+            index=models.Index(fields=['role', 'created_at', 'id'], name='users_role_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='userentity',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='users_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='userentity',
+            index=models.Index(fields=['company', 'created_at', 'id'], name='users_company_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='userentity',
+            index=models.Index(condition=models.Q(('is_blocked', True)), fields=['created_at', 'id'],
+                               name='users_blocked_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='userentity',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'),
+                                                        name='gin_trgm_ops'),
+                name='users_email_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='userentity',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'),
+                                                        name='gin_trgm_ops'),
+                name='users_full_name_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_user_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserImport',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_id', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('file_path', models.CharField(max_length=255)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                              related_name='user_imports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_imports',
+            },
+        ),
+    ]
@@ -1 +1,2 @@
 from .user import UserEntity
+from .user_import import UserImport
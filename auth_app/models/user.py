@@ -1,6 +1,9 @@
 # auth_app/models/user.py
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin, Permission, Group
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from core.enums.enums import ROLES, ACCOUNT_STATUS
 from core.models.base import BaseModel
@@ -61,11 +64,13 @@ class UserEntity(AbstractBaseUser, PermissionsMixin, BaseModel, TimeStampModel):
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
     google_email_verification = models.BooleanField(default=False)
     is_blocked = models.BooleanField(default=False)
+    is_agreement_accepted = models.BooleanField(default=False)
     status = models.CharField(max_length=128, choices=ACCOUNT_STATUS.choices(),default=ACCOUNT_STATUS.COMPLETE.value[0])
     email_token_used = models.BooleanField(default=False)
     forgot_password_token_used = models.BooleanField(default=True)
     is_de_activated = models.BooleanField(default=False)
     is_staff = models.BooleanField(default=False)
+    company = models.ForeignKey("self", null=True, on_delete=models.CASCADE)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['role']
@@ -78,3 +83,16 @@ class UserEntity(AbstractBaseUser, PermissionsMixin, BaseModel, TimeStampModel):
         Metaclass to set db table name
         """
         db_table = "users"
+        # backs the filters of users/list/ (see UserRepository.find_for_list),
+        # every btree index ends with (created_at, id), the cursor pagination keyset
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="users_created_id_idx"),
+            models.Index(fields=["role", "created_at", "id"], name="users_role_created_idx"),
+            models.Index(fields=["status", "created_at", "id"], name="users_status_created_idx"),
+            models.Index(fields=["company", "created_at", "id"], name="users_company_created_idx"),
+            # few users are blocked, a partial index keeps it small
+            models.Index(fields=["created_at", "id"], condition=Q(is_blocked=True), name="users_blocked_created_idx"),
+            # prefix search (istartswith, i.e. UPPER(column) LIKE 'ABC%')
+            GinIndex(OpClass(Upper("email"), name="gin_trgm_ops"), name="users_email_trgm_idx"),
+            GinIndex(OpClass(Upper("full_name"), name="gin_trgm_ops"), name="users_full_name_trgm_idx"),
+        ]
@@ -0,0 +1,21 @@
+from django.db import models
+
+from core.models.base import BaseModel
+from core.models.timestamp import TimeStampModel
+
+
+class UserImport(BaseModel, TimeStampModel):
+    """
+    Model: background user import, records the company that started the
+    celery job so only that company can poll it.
+    """
+    job_id = models.CharField(max_length=255, primary_key=True)
+    company = models.ForeignKey("auth_app.UserEntity", on_delete=models.CASCADE, related_name="user_imports")
+    file_path = models.CharField(max_length=255)
+
+    # pylint: disable=too-few-public-methods
+    class Meta:
+        """
+        Metaclass to set db table name
+        """
+        db_table = "user_imports"
@@ -1 +1,2 @@
 from .user import UserRepository
+from .user_import import UserImportRepository
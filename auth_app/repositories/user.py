@@ -1,6 +1,17 @@
-from typing import Union, Optional, Dict, Any
+from datetime import datetime
+from typing import Union, Optional, Dict, Any, Iterable, List, Set, Tuple, Sequence
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
 from auth_app.models import UserEntity
+from core.auth.hashers import hash_password
+from core.auth.revocation import sync_user_revocation
 from core.base import BaseRepository
+from core.cache import ModelCache
+from core.enums.enums import USER_STATUS
+from core.signals.events import users_bulk_created
 
 
 class UserRepository(BaseRepository[UserEntity]):
@@ -11,6 +22,28 @@ class UserRepository(BaseRepository[UserEntity]):
     ...
     """
     model = UserEntity
+    # columns loaded by find_one_for_login
+    LOGIN_FIELDS = (
+        "id", "email", "password", "role", "full_name", "phone_number", "created_at", "last_login",
+        "google_email_verification", "is_blocked", "is_de_activated",
+    )
+    # query parameter -> lookup of the users/list/ filters
+    LIST_FILTERS = {
+        "role": "role",
+        "status": "status",
+        "is_blocked": "is_blocked",
+        "company": "company_id",
+        "created_after": "created_at__gte",
+        "created_before": "created_at__lt",
+    }
+    # columns the token revocation depends on (see USER_STATUS.for_user)
+    STATUS_FIELDS = frozenset({"is_blocked", "is_de_activated"})
+    cache = ModelCache(
+        UserEntity,
+        namespace="users",
+        ttl=settings.USER_CACHE_TTL,
+        max_size=settings.USER_CACHE_MAX_SIZE
+    )
 
     @staticmethod
     def create_user(data: Dict[str, Any]) -> UserEntity:
@@ -20,6 +53,41 @@ class UserRepository(BaseRepository[UserEntity]):
         """
         return UserRepository.model.objects.create_user(**data)
 
+    @staticmethod
+    def bulk_create_users(users_data: List[Dict[str, Any]], batch_size: int) -> List[UserEntity]:
+        """
+        Create many users with INSERTs of `batch_size` rows.
+
+        Passwords are marked unusable instead of hashing throwaway random
+        passwords, users set their own password when completing the account.
+        No post_save signal is sent, a single `users_bulk_created` event
+        carries the whole batch instead.
+
+        :param users_data: List[Dict[str, Any]] - UserEntity fields for every user.
+        :param batch_size: int - Number of rows per INSERT.
+        :return: List[UserEntity] - The created users, with their primary keys set.
+        """
+        users = []
+        for data in users_data:
+            data = dict(data)
+            email = UserRepository.model.objects.normalize_email(data.pop("email").strip())
+            user = UserRepository.model(email=email, **data)
+            user.set_unusable_password()
+            users.append(user)
+        users = UserRepository.model.objects.bulk_create(users, batch_size=batch_size)
+        users_bulk_created.send(sender=UserRepository.model, users=users)
+        return users
+
+    @staticmethod
+    def find_existing_emails(emails: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of `emails` already registered.
+
+        :param emails: Iterable[str] - The email addresses to look up.
+        :return: Set[str] - The emails that already belong to a user.
+        """
+        return set(UserRepository.model.objects.filter(email__in=list(emails)).values_list("email", flat=True))
+
     @staticmethod
     def find_one_by_email(email: str) -> Optional[UserEntity]:
         """
@@ -31,6 +99,194 @@ class UserRepository(BaseRepository[UserEntity]):
         """
         return UserRepository.find_one_by_q(email=email)  # Returns Optional[UserEntity]
 
+    @staticmethod
+    def find_one_for_login(email: str) -> Optional[UserEntity]:
+        """
+        Load a user for login, with only the columns the login checks, the
+        tokens and the login response (UserSerializer) need.
+
+        :param email: str - The email address of the user.
+        :return: Optional[UserEntity] - The user, or None if not found.
+        """
+        return UserRepository.model.objects.filter(email=email).only(*UserRepository.LOGIN_FIELDS).first()
+
+    @staticmethod
+    def update_last_login(user_id: int, last_login: datetime) -> None:
+        """
+        Write the last login of a user with a single UPDATE of that column.
+
+        :param user_id: int - The id of the user.
+        :param last_login: datetime - The login time.
+        """
+        UserRepository.model.objects.filter(pk=user_id).update(last_login=last_login)
+        # queryset updates send no post_save
+        UserRepository.invalidate_cache(user_id)
+
+    @staticmethod
+    def bulk_update_last_login(last_logins: Dict[int, datetime], batch_size: int) -> None:
+        """
+        Write the last login of many users, with one UPDATE ... CASE per batch.
+
+        :param last_logins: Dict[int, datetime] - Login time by user id.
+        :param batch_size: int - Number of users per UPDATE.
+        """
+        users = [UserRepository.model(pk=user_id, last_login=last_login)
+                 for user_id, last_login in last_logins.items()]
+        UserRepository.model.objects.bulk_update(users, ["last_login"], batch_size=batch_size)
+        # bulk updates send no post_save
+        for user_id in last_logins:
+            UserRepository.invalidate_cache(user_id)
+
+    @staticmethod
+    def find_for_list(filters: Dict[str, Any], columns: Optional[Sequence[str]] = None) -> QuerySet:
+        """
+        Users matching the whitelisted filters of users/list/, ordered on the
+        (created_at, id) keyset. With `columns`, value rows of only those
+        columns are loaded instead of full UserEntity instances.
+
+        Filters (see LIST_FILTERS) are equality or range lookups served by
+        the (column, created_at, id) indexes, `search` is a case-insensitive
+        prefix of the email or full name served by the trigram indexes.
+
+        :param filters: Dict[str, Any] - Validated ListUsersQuerySerializer data.
+        :param columns: Optional[Sequence[str]] - Columns of the value rows.
+        :return: QuerySet[UserEntity] or QuerySet[dict]
+        """
+        lookups = {
+            lookup: filters[name] for name, lookup in UserRepository.LIST_FILTERS.items() if name in filters
+        }
+        queryset = UserRepository.model.objects.filter(**lookups)
+
+        search = filters.get("search")
+        if search:
+            queryset = queryset.filter(Q(email__istartswith=search) | Q(full_name__istartswith=search))
+
+        if columns:
+            queryset = queryset.values(*columns)
+        if filters.get("ordering") == "created_at":
+            return queryset.order_by("created_at", "id")
+        return queryset.order_by("-created_at", "-id")
+
+    @staticmethod
+    def find_values_by_id(user_id: int, columns: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Load only some columns of a user.
+
+        :param user_id: int - The id of the user.
+        :param columns: Sequence[str] - The columns to load.
+        :return: Optional[Dict[str, Any]] - The value row, or None if not found.
+        """
+        return UserRepository.model.objects.filter(pk=user_id).values(*columns).first()
+
+    @staticmethod
+    def find_one_by_id_cached(user_id: int) -> Optional[UserEntity]:
+        """
+        Search for a user by id, going through the shared user cache first.
+
+        Cache entries are dropped whenever the user is saved or deleted
+        (see core/signals/user.py), so the cached row never outlives a write.
+
+        :param user_id: int - The id of the user.
+        :return: Optional[UserEntity] - The user, or None if not found.
+        """
+        user = UserRepository.cache.get(user_id)
+        if user is None:
+            user = UserRepository.find_one_by_id(user_id)
+            if user is not None:
+                UserRepository.cache.set(user)
+        return user
+
+    @staticmethod
+    def find_status_cached(user_id: int) -> Optional[Tuple[str, str]]:
+        """
+        Look up the role and status of a user through the user-status index,
+        a cache of (role, USER_STATUS value) next to the user cache, filled
+        from the role and status columns instead of a full row load.
+
+        :param user_id: int - The id of the user.
+        :return: Optional[Tuple[str, str]] - (role, status), or None if the user does not exist.
+        """
+        key = UserRepository.status_key(user_id)
+        entry = UserRepository.cache.backend.get(key)
+        if entry is None:
+            user = UserRepository.model.objects.filter(pk=user_id) \
+                .only("role", "is_blocked", "is_de_activated").first()
+            if user is None:
+                return None
+            entry = (user.role, USER_STATUS.for_user(user))
+            UserRepository.cache.backend.set(key, entry, UserRepository.cache.ttl)
+        return entry
+
+    @staticmethod
+    def status_key(user_id: int) -> str:
+        return f"user_status:{user_id}"
+
+    @staticmethod
+    def invalidate_cache(user_id: int) -> None:
+        """
+        Drop a user from the shared user cache and the user-status index.
+
+        :param user_id: int - The id of the user.
+        """
+        UserRepository.cache.invalidate(user_id)
+        UserRepository.cache.backend.delete(UserRepository.status_key(user_id))
+
+    @classmethod
+    def after_update(cls, entity_id: int, instance: Optional[UserEntity], fields: Iterable[str]) -> None:
+        """
+        Queryset updates send no post_save, do what the user signals
+        (core/signals/user.py) do on save: drop the cached user and sync the
+        token revocation when the status changed.
+
+        :param entity_id: int - The id of the updated user.
+        :param instance: Optional[UserEntity] - The user passed to the update, if any.
+        :param fields: Iterable[str] - The updated fields.
+        """
+        UserRepository.after_bulk_update([entity_id], fields, [instance] if instance is not None else None)
+
+    @classmethod
+    def after_bulk_update(cls, entity_ids: List[int], fields: Iterable[str],
+                          instances: Optional[List[UserEntity]] = None) -> None:
+        """
+        Same as `after_update`, for the users written by bulk_update and
+        update_where.
+
+        :param entity_ids: List[int] - The ids of the updated users.
+        :param fields: Iterable[str] - The updated fields.
+        :param instances: Optional[List[UserEntity]] - The updated users, from bulk_update (None for update_where).
+        """
+        for user_id in entity_ids:
+            UserRepository.invalidate_cache(user_id)
+
+        def invalidate_on_commit():
+            # drop them again once committed, a concurrent read may have cached the old rows
+            for user_id in entity_ids:
+                UserRepository.invalidate_cache(user_id)
+
+        transaction.on_commit(invalidate_on_commit)
+        if UserRepository.STATUS_FIELDS.isdisjoint(fields):
+            return
+        if instances is None:
+            transaction.on_commit(lambda: UserRepository.sync_revocation(entity_ids))
+            return
+
+        def sync_on_commit():
+            for user in instances:
+                sync_user_revocation(user)
+
+        transaction.on_commit(sync_on_commit)
+
+    @staticmethod
+    def sync_revocation(user_ids: List[int]) -> None:
+        """
+        Sync the token revocation of users not loaded by the caller.
+
+        :param user_ids: List[int] - The ids of the users.
+        """
+        users = UserRepository.model.objects.filter(pk__in=user_ids).only("id", *UserRepository.STATUS_FIELDS)
+        for user in users:
+            sync_user_revocation(user)
+
     @staticmethod
     def update_password(user: UserEntity, password: str) -> UserEntity:
         """
@@ -40,6 +296,6 @@ class UserRepository(BaseRepository[UserEntity]):
         :param password: str - The new password to set.
         :return: UserEntity - The updated user entity.
         """
-        user.set_password(password)
-        user.save()
+        user.password = hash_password(password)
+        user.save(update_fields=["password", "updated_at"])
         return user
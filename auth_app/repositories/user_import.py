@@ -0,0 +1,11 @@
+from auth_app.models import UserImport
+from core.base import BaseRepository
+
+
+class UserImportRepository(BaseRepository[UserImport]):
+    """
+    Usage:
+    >> UserImportRepository.create(job_id="...", company=user, file_path="...")
+    >> UserImportRepository.find_one_by_q(job_id="...", company_id=user.pk)
+    """
+    model = UserImport
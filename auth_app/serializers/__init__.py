@@ -1,4 +1,5 @@
 import auth_app.serializers.auth
 from .auth import ChangePasswordSerializer, LoginSerializer, SignupSerializer, EmailVerificationSerializer, \
     UpdateProfileSerializer, ImportUsersSerializer, UserUpdateSerializer, RefreshTokenSerializer, \
-    ForgotPasswordSerializer, ResetPasswordSerializer
+    ForgotPasswordSerializer, ResetPasswordSerializer, ListUsersQuerySerializer, \
+    UserFieldsQuerySerializer, UserValuesSerializer, compiled_user_serializer
@@ -1,7 +1,9 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from django.conf import settings
 from rest_framework import serializers
 from auth_app.models import UserEntity
-from core.enums.enums import ROLES, USER_UPDATE_ACTIONS
+from core.base.compiled_serializer import CompiledSerializer
+from core.enums.enums import ROLES, USER_UPDATE_ACTIONS, ACCOUNT_STATUS
 from core.utils.helper import validate_password
 
 
@@ -23,6 +25,41 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at", "updated_at"]  # Fields that are not editable by the user
 
 
+# read-only fast path of UserSerializer, for login, profile and user details
+compiled_user_serializer = CompiledSerializer(UserSerializer)
+
+
+class UserValuesSerializer:
+    """
+    Read-only fast path of UserSerializer for value rows (QuerySet.values()),
+    used by the user listings.
+
+    Rows are turned into dicts by a function compiled for the requested
+    fields (see CompiledSerializer), instead of building DRF fields and
+    running `to_representation` per field. The output is the same as
+    UserSerializer restricted to `fields`.
+
+    Usage:
+    >> rows = UserRepository.find().values(*UserValuesSerializer.FIELDS)
+    >> UserValuesSerializer().serialize_many(rows)
+    """
+    FIELDS = tuple(UserSerializer.Meta.fields)
+
+    def __init__(self, fields: Optional[Sequence[str]] = None):
+        self.fields = tuple(fields or self.FIELDS)
+        self._serialize = compiled_user_serializer.row_function(self.fields)
+
+    def serialize(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        :param row: A value row holding (at least) `fields`.
+        :return: The representation of the row, keys in `fields` order.
+        """
+        return self._serialize(row)
+
+    def serialize_many(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return list(map(self._serialize, rows))
+
+
 class SignupSerializer(serializers.Serializer):
     """
     Serializer for user registration (signup) functionality. Validates the data provided
@@ -166,9 +203,19 @@ class UserProfilePictureSerializer(serializers.ModelSerializer):
         model = UserEntity
         fields = ['profile_picture']
 
-#
-# class ImportUsersSerializer(serializers.Serializer):
-#     file = serializers.FileField(required=True)
+
+class ImportUsersSerializer(serializers.Serializer):
+    """
+    CSV upload of the user import, at most USER_IMPORT_MAX_SIZE bytes.
+    """
+    file = serializers.FileField(required=True)
+
+    def validate_file(self, value):
+        if not value.name.lower().endswith(".csv"):
+            raise serializers.ValidationError("invalid file type, upload a .csv file.")
+        if value.size > settings.USER_IMPORT_MAX_SIZE:
+            raise serializers.ValidationError(f"The file must not exceed {settings.USER_IMPORT_MAX_SIZE} bytes.")
+        return value
 
 
 class UpdateProfileSerializer(serializers.Serializer):
@@ -176,6 +223,40 @@ class UpdateProfileSerializer(serializers.Serializer):
     phone_number = serializers.CharField(write_only=True, required=False, max_length=15)
 
 
+class UserFieldsQuerySerializer(serializers.Serializer):
+    """
+    `fields=` projection of the user endpoints: a comma separated subset of
+    UserSerializer fields, validated into a tuple (all fields when missing).
+    """
+    fields = serializers.CharField(required=False)
+
+    def validate_fields(self, value: str):
+        fields = tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+        unknown = [name for name in fields if name not in UserValuesSerializer.FIELDS]
+        if not fields or unknown:
+            raise serializers.ValidationError(
+                f"Unknown fields {unknown}, choose from {list(UserValuesSerializer.FIELDS)}."
+                if unknown else "fields must not be empty."
+            )
+        return fields
+
+
+class ListUsersQuerySerializer(UserFieldsQuerySerializer):
+    """
+    Whitelisted query parameters of users/list/, every filter is backed by an
+    index of the users table (see UserEntity.Meta.indexes).
+    Validate `request.query_params.dict()`, with a QueryDict missing booleans read as False.
+    """
+    role = serializers.ChoiceField(choices=ROLES.choices(), required=False)
+    status = serializers.ChoiceField(choices=ACCOUNT_STATUS.choices(), required=False)
+    is_blocked = serializers.BooleanField(required=False)
+    company = serializers.IntegerField(required=False, min_value=1)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    search = serializers.CharField(required=False, max_length=256)  # prefix of the email or full name
+    ordering = serializers.ChoiceField(choices=["created_at", "-created_at"], required=False,
+                                       default="-created_at")
+
 
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(write_only=True, required=True,
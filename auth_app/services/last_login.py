@@ -0,0 +1,144 @@
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from auth_app.repositories.user import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginWriter:
+    """
+    Write-behind buffer for the last login of the users.
+
+    Logins only record their time in the buffer, the latest time per user
+    wins. A background thread flushes the buffer every `flush_interval`
+    seconds (the staleness bound), or as soon as it holds `max_size` users,
+    with one bulk UPDATE ... CASE per `batch_size` users. The buffer is
+    flushed once more when the process exits.
+
+    With CACHE_BACKEND=redis the buffer is a redis hash of ISO 8601 times
+    shared by every process, whichever process flushes writes the logins of
+    all of them.
+
+    Usage:
+    >> get_last_login_writer().record(user.pk, timezone.now())
+    """
+
+    def __init__(self, flush_interval: float, max_size: int, batch_size: int, redis_url: Optional[str] = None):
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.key = "last_login_buffer"
+        self._client = None
+        if redis_url is not None:
+            # redis is only required when the redis backend is selected
+            import redis
+
+            self._client = redis.Redis.from_url(redis_url)
+        self._buffer: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _start(self):
+        # the thread is started on first use, so forked gunicorn workers get their own
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._work, name="last-login-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def record(self, user_id: int, last_login: datetime) -> None:
+        """
+        :param user_id: The id of the user who logged in.
+        :param last_login: The login time.
+        """
+        self._start()
+        if self._client is not None:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.hset(self.key, str(user_id), last_login.isoformat())
+            pipe.hlen(self.key)
+            size = pipe.execute()[1]
+        else:
+            with self._lock:
+                self._buffer[user_id] = last_login
+                size = len(self._buffer)
+        if size >= self.max_size:
+            self._wakeup.set()
+
+    def _work(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush last logins: {str(e)}")
+
+    def _take(self) -> Dict[int, datetime]:
+        if self._client is not None:
+            # HGETALL and DEL in one MULTI/EXEC, a login is never flushed twice or lost
+            pipe = self._client.pipeline()
+            pipe.hgetall(self.key)
+            pipe.delete(self.key)
+            raw, _ = pipe.execute()
+            return {int(user_id): datetime.fromisoformat(value.decode()) for user_id, value in raw.items()}
+        with self._lock:
+            entries, self._buffer = self._buffer, {}
+        return entries
+
+    def _put_back(self, entries: Dict[int, datetime]) -> None:
+        for user_id, last_login in entries.items():
+            if self._client is not None:
+                self._client.hsetnx(self.key, str(user_id), last_login.isoformat())
+            else:
+                with self._lock:
+                    self._buffer.setdefault(user_id, last_login)
+
+    def flush(self) -> int:
+        """
+        Write the buffered logins.
+
+        :return: The number of users updated.
+        """
+        entries = self._take()
+        if not entries:
+            return 0
+        try:
+            UserRepository.bulk_update_last_login(entries, batch_size=self.batch_size)
+        except Exception:
+            # keep them for the next flush, newer logins recorded meanwhile win
+            self._put_back(entries)
+            raise
+        return len(entries)
+
+
+_writer: Optional[LastLoginWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_last_login_writer() -> LastLoginWriter:
+    """
+    Return the process wide last login writer.
+
+    :return: LastLoginWriter
+    """
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = LastLoginWriter(
+                    flush_interval=settings.LAST_LOGIN_FLUSH_INTERVAL,
+                    max_size=settings.LAST_LOGIN_BUFFER_SIZE,
+                    batch_size=settings.LAST_LOGIN_BATCH_SIZE,
+                    redis_url=settings.CACHE_REDIS_URL if settings.CACHE_BACKEND == "redis" else None,
+                )
+    return _writer
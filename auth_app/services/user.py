@@ -1,25 +1,33 @@
-from typing import Dict, Any
+import uuid
+from typing import Dict, Any, Optional, Sequence
 
-import pandas as pd
-from django.contrib.auth import authenticate
-from django.db import transaction
-from django.utils.datetime_safe import datetime
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet
+from django.utils import timezone
 from rest_framework import status
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 
 from auth_app.models.user import UserEntity
 from auth_app.repositories.user import UserRepository
-from auth_app.serializers import SignupSerializer
-from auth_app.serializers.auth import UserSerializer
+from auth_app.repositories.user_import import UserImportRepository
+from auth_app.serializers.auth import UserValuesSerializer, compiled_user_serializer
+from auth_app.services.last_login import get_last_login_writer
+from auth_app.services.user_import import UserImportService
 from auth_app.utils import AuthUtils
+from core.auth.claims import FAMILY_CLAIM, ROLE_CLAIM, STATUS_CLAIM
+from core.auth.hashers import hash_password, verify_password
+from core.auth.outstanding import outstanding_tokens
+from core.auth.revocation import revocation_reason, revoke_token, revoke_token_family, revoke_user_tokens
+from core.auth.status import check_user_status
+from core.auth.tokens import UserRefreshToken
 from core.base import BaseService
 from core.common.erro_message_type import APPErrorTypes
-from core.enums.enums import ACCOUNT_STATUS, USER_UPDATE_ACTIONS, ROLES
+from core.enums.enums import ACCOUNT_STATUS, USER_UPDATE_ACTIONS, ROLES, USER_STATUS, UPDATE_MODE
 from core.exceptions.base import ApiError
-from core.types import LoginResult, RefreshTokenResult
-from core.utils.helper import generate_password, decode_uid
-from core.utils.import_user_preprocess import preprocess_csv
+from core.queue.user_import import import_users_from_csv
+from core.types import LoginResult, RefreshTokenResult, ImportUsersResult
+from core.utils.helper import decode_uid
 from core.utils.verification_email_token_generator import email_verification_token
 
 
@@ -30,6 +38,16 @@ class UserService(BaseService[UserEntity]):
     """
     repository = UserRepository
 
+    @staticmethod
+    def find_one_by_id_cached(user_id: int) -> Optional[UserEntity]:
+        """
+        Retrieves a user by id through the shared user cache.
+
+        :param user_id: The ID of the user.
+        :return: UserEntity or None if not found.
+        """
+        return UserService.repository.find_one_by_id_cached(user_id)
+
     @staticmethod
     def signup_user(data) -> UserEntity:
         """
@@ -62,9 +80,11 @@ class UserService(BaseService[UserEntity]):
         """
             Authenticates a user and logs them in.
 
-            This method checks the provided email and password, verifies the account's
-            status (verified, not blocked, and not deactivated), and updates the last
-            login time. It returns a login result containing access and refresh tokens.
+            This method loads the user and the columns the login needs in a single
+            query, checks the password and the account's status (verified, not
+            blocked, and not deactivated), and updates the last login time with a
+            single column UPDATE. It returns a login result containing access and
+            refresh tokens, and the user data serialized from the loaded row.
 
             :param data: A dictionary containing:
                 - "email": The user's email (str).
@@ -76,31 +96,64 @@ class UserService(BaseService[UserEntity]):
 
             Errors:
                 - 400: Invalid credentials if authentication fails.
-                - 404: Resource not found if the user account is not found.
-        """
-        user = authenticate(email=data['email'], password=data['password'])
-        if not user:
-            if user is None:
-                raise ApiError(
-                    errors="invalid credentials",
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    message="credentials error",
-                    error_type=APPErrorTypes.CREDENTIALS_ERROR.value
-                )
+        """
+        user = UserService.repository.find_one_for_login(data['email'])
+        if user is None:
+            # hash anyway, so unknown emails take as long as wrong passwords
+            hash_password(data['password'])
+        if user is None or not UserService.check_password(user, data['password']):
+            raise ApiError(
+                errors="invalid credentials",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message="credentials error",
+                error_type=APPErrorTypes.CREDENTIALS_ERROR.value
+            )
         UserService.check_account_verified(user)
         UserService.check_account_blocked(user)
         UserService.check_account_deactivated(user)
 
         # update last login value
-        UserService.repository.update(user.pk, **{"last_login": datetime.now()})
+        user.last_login = timezone.now()
+        UserService.record_last_login(user.pk, user.last_login)
 
-        refresh_token = RefreshToken.for_user(user)
+        refresh_token = UserRefreshToken.for_user(user)
         return LoginResult(
             str(refresh_token),
             str(refresh_token.access_token),
-            UserSerializer(instance=user).data,
+            compiled_user_serializer(instance=user).data,
         )
 
+    @staticmethod
+    def check_password(user: UserEntity, password: str) -> bool:
+        """
+        Check the password of a user, on the hashing pool if enabled.
+
+        A correct password stored with another hasher or cost than the
+        configured one is re-hashed with it.
+
+        :param user: The user (UserEntity).
+        :param password: The raw password (str).
+        :return: bool: True if the password is correct.
+        """
+        is_correct, must_update = verify_password(password, user.password)
+        if is_correct and must_update:
+            UserService.repository.update_password(user, password)
+        return is_correct
+
+    @staticmethod
+    def record_last_login(user_id: int, last_login) -> None:
+        """
+        Store the last login of a user, through the write-behind buffer
+        unless LAST_LOGIN_WRITE_MODE is 'immediate'.
+
+        :param user_id: The ID of the user (int).
+        :param last_login: The login time (datetime).
+        """
+        if settings.LAST_LOGIN_WRITE_MODE == "immediate":
+            UserService.repository.update_last_login(user_id, last_login)
+        else:
+            get_last_login_writer().record(user_id, last_login)
+
     @staticmethod
     def update_user(user_id: int, data: Dict[str, Any]) -> UserEntity:
         """
@@ -128,7 +181,7 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.RESOURCE_NOT_FOUND.value
             )
 
-        return UserService.repository.update(user_id, **data)
+        return UserService.repository.update(user_id, instance=user, **data)
 
     @staticmethod
     def change_password(user: UserEntity, data: Dict[str, Any]) -> UserEntity:
@@ -165,7 +218,7 @@ class UserService(BaseService[UserEntity]):
             )
 
         # Check if the old password matches the user's current password
-        if not user.check_password(old_password):
+        if not UserService.check_password(user, old_password):
             raise ApiError(
                 errors="Old password is incorrect.",
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -173,7 +226,10 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.INVALID_CREDENTIALS.value
             )
 
-        return UserService.repository.update_password(user, password=new_password)
+        user = UserService.repository.update_password(user, password=new_password)
+        # sign out every session, including the current one
+        revoke_user_tokens(user)
+        return user
 
     @staticmethod
     def check_account_blocked(user: UserEntity) -> bool:
@@ -259,54 +315,42 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.EMAIL_LINK_INVALID.value
             )
 
-        UserService.update(user.pk, **{"google_email_verification": True, "email_token_used": True})
+        UserService.update(user.pk, instance=user, **{"google_email_verification": True, "email_token_used": True})
 
-        refresh_token = RefreshToken.for_user(user)
+        refresh_token = UserRefreshToken.for_user(user)
 
         return LoginResult(
             str(refresh_token),
             str(refresh_token.access_token),
-            UserSerializer(instance=user).data
+            compiled_user_serializer(instance=user).data
         )
 
     @staticmethod
     def refresh_token(data: Dict[str, Any]) -> RefreshTokenResult:
         """
-        Refreshes the user's access token using the provided refresh token.
+        Rotates the user's refresh token and issues a new access token.
 
-        This method validates the refresh token, retrieves the associated user,
-        and generates a new access token. If the refresh token is expired or invalid,
-        it raises an error.
+        With ROTATE_REFRESH_TOKENS the refresh token is consumed from the
+        outstanding tokens, a token used twice means it leaked: every token
+        of its family (the same login) is revoked. Without it the same
+        refresh token is returned with the new access token. The user is resolved from the cached user-status
+        index instead of loading the row, and the new tokens carry the
+        current role and status.
 
         :param data: A dictionary containing:
             - "refresh": The refresh token (str).
 
-        :return: RefreshTokenResult: An object containing the new access
-            token and the original refresh token.
+        :return: RefreshTokenResult: An object containing the new refresh
+            token and the new access token.
 
-        :raises ApiError: If the refresh token is expired or the user is not found.
+        :raises ApiError: If the refresh token is expired, revoked or reused, or the user is not found.
 
         :Error:
-            - 401: Refresh token expired if the token is invalid or expired.
+            - 401: Refresh token expired if the token is invalid, expired, revoked or reused.
+            - 403: If the account is blocked or deactivated.
         """
-
         try:
-            refresh = RefreshToken(data.get("refresh"))
-            user_id = refresh['user_id']
-            user = UserRepository.find_one_by_id(user_id)
-            if user is None:
-                raise ApiError(
-                    errors="Refresh token has expired. Please login again",
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    message="refresh token expired",
-                    error_type=APPErrorTypes.TOKEN_REFRESH_FAILED.value
-                )
-            access = AccessToken.for_user(user)
-            # Return the standardized response if successful
-            return RefreshTokenResult(
-                str(refresh),
-                str(access),
-            )
+            refresh = UserRefreshToken(data.get("refresh"))
         except TokenError as error:
             raise ApiError(
                 errors="refresh token has expired. Please login again",
@@ -315,6 +359,48 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.TOKEN_REFRESH_FAILED.value
             ) from error
 
+        payload = refresh.payload
+        rotate = settings.SIMPLE_JWT.get("ROTATE_REFRESH_TOKENS")
+        family = payload.get(FAMILY_CLAIM)
+        if rotate and family is not None and not outstanding_tokens.consume(payload["jti"]):
+            revoke_token_family(family)
+            raise ApiError(
+                errors="Refresh token has already been used. Please login again",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="refresh token reused",
+                error_type=APPErrorTypes.TOKEN_REFRESH_FAILED.value
+            )
+        check_user_status(revocation_reason(payload))
+
+        user_status = UserRepository.find_status_cached(payload["user_id"])
+        if user_status is None:
+            raise ApiError(
+                errors="Refresh token has expired. Please login again",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="refresh token expired",
+                error_type=APPErrorTypes.TOKEN_REFRESH_FAILED.value
+            )
+        role, user_status = user_status
+        check_user_status(user_status)
+        claims = {ROLE_CLAIM: role, STATUS_CLAIM: user_status}
+
+        if not rotate:
+            access = refresh.access_token
+            for claim, value in claims.items():
+                access[claim] = value
+            return RefreshTokenResult(
+                data.get("refresh"),
+                str(access),
+            )
+
+        # the used token stays revoked until it expires
+        revoke_token(payload)
+        refresh.rotate(claims)
+        return RefreshTokenResult(
+            str(refresh),
+            str(refresh.access_token),
+        )
+
     @staticmethod
     def complete_candidate_account(data: Dict[str, Any]) -> LoginResult:
         """
@@ -353,23 +439,24 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.EMAIL_LINK_INVALID.value
             )
 
-        UserService.repository.update(user.pk, **{
-            "google_email_verification": True,
-            "status": ACCOUNT_STATUS.COMPLETE.value[0],
-            "email_token_used": True,
-            "last_login": datetime.now()
-        })
-        user.set_password(data.get("password"))
+        # a single save, updating the row first and then saving the stale
+        # instance with the password would revert these fields
+        user.google_email_verification = True
+        user.status = ACCOUNT_STATUS.COMPLETE.value[0]
+        user.email_token_used = True
+        user.password = hash_password(data.get("password"))
         user.save()
+        user.last_login = timezone.now()
+        UserService.record_last_login(user.pk, user.last_login)
 
         AuthUtils.send_welcome_email(user.email)
 
-        refresh_token = RefreshToken.for_user(user)
+        refresh_token = UserRefreshToken.for_user(user)
 
         return LoginResult(
             str(refresh_token),
             str(refresh_token.access_token),
-            UserSerializer(instance=user).data
+            compiled_user_serializer(instance=user).data
         )
 
     @staticmethod
@@ -441,7 +528,8 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.USER_BLOCKED.value
             )
 
-        UserService.update(user.pk, **{"is_blocked": True})
+        UserService.update(user.pk, instance=user, **{"is_blocked": True})
+        revoke_user_tokens(user, USER_STATUS.BLOCKED.value[0])
         return user
 
     @staticmethod
@@ -460,7 +548,7 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.USER_UN_BLOCKED.value
             )
 
-        UserService.update(user.pk, **{"is_blocked": False})
+        UserService.update(user.pk, instance=user, **{"is_blocked": False})
         return user
 
     @staticmethod
@@ -479,7 +567,8 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.USER_DEACTIVATED.value
             )
 
-        UserService.update(user.pk, **{"is_de_activated": True})
+        UserService.update(user.pk, instance=user, **{"is_de_activated": True})
+        revoke_user_tokens(user, USER_STATUS.DEACTIVATED.value[0])
         return user
 
     @staticmethod
@@ -498,7 +587,7 @@ class UserService(BaseService[UserEntity]):
                 error_type=APPErrorTypes.USER_ACTIVATED.value
             )
 
-        UserService.update(user.pk, **{"is_de_activated": False})
+        UserService.update(user.pk, instance=user, **{"is_de_activated": False})
         return user
 
     @staticmethod
@@ -522,46 +611,101 @@ class UserService(BaseService[UserEntity]):
         return user
 
     @staticmethod
-    def import_user(data: Dict[str, Any], user: UserEntity) -> bool:
+    def check_import_file(csv_file) -> bool:
+        """
+        Check the uploaded file is a CSV file, else throw error
+        :param csv_file: The uploaded file.
+        :return: bool
+        :raises: ApiError Bad Request
+        """
+        if not csv_file.name.endswith(".csv"):
+            raise ApiError(
+                errors="invalid file type.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message="invalid file type",
+                error_type=APPErrorTypes.INVALID_FILE_TYPE.value
+            )
+        return True
+
+    @staticmethod
+    def import_user(data: Dict[str, Any], user: UserEntity) -> ImportUsersResult:
         """
         Import users from a CSV file.
 
+        The file is streamed in chunks and every chunk is committed on its own,
+        invalid rows are collected in the result instead of failing the import.
+
         :param data: A dictionary containing the CSV file to import.
         :param user: The user performing the import operation.
-        :return: True if the import is successful.
-        :raises ApiError: If the file type is invalid or if user validation fails.
+        :return: ImportUsersResult with the row counts and per-row errors.
+        :raises ApiError: If the file type is invalid, too large to import in the request
+            or a required column is missing.
         """
         csv_file = data.get("file")
+        UserService.check_import_file(csv_file)
+        if csv_file.size > settings.USER_IMPORT_SYNC_MAX_SIZE:
+            raise ApiError(
+                errors=f"files over {settings.USER_IMPORT_SYNC_MAX_SIZE} bytes must be imported with mode=async.",
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                message="file too large",
+                error_type=APPErrorTypes.FILE_TOO_LARGE.value
+            )
 
-        if not csv_file.name.endswith(".csv"):
+        return UserImportService(company=user).run(csv_file)
+
+    @staticmethod
+    def import_user_async(data: Dict[str, Any], user: UserEntity) -> str:
+        """
+        Store the uploaded CSV file and import it on a celery worker.
+        The job is recorded with the company starting it, the only one allowed to poll it.
+
+        :param data: A dictionary containing the CSV file to import.
+        :param user: The user performing the import operation.
+        :return: The job id to poll with get_import_status.
+        :raises ApiError: If the file type is invalid.
+        """
+        csv_file = data.get("file")
+        UserService.check_import_file(csv_file)
+
+        file_path = default_storage.save(f"imports/{uuid.uuid4().hex}.csv", csv_file)
+        job_id = str(uuid.uuid4())
+        UserImportRepository.create(job_id=job_id, company=user, file_path=file_path)
+        import_users_from_csv.apply_async(args=[file_path, user.pk], task_id=job_id)
+        return job_id
+
+    @staticmethod
+    def get_import_status(job_id: str, user: UserEntity) -> Dict[str, Any]:
+        """
+        Report the progress of a background import.
+
+        :param job_id: The job id returned by import_user_async.
+        :param user: The user polling the import, must be the one who started it.
+        :return: The job state with rows processed, rows failed and throughput.
+        :raises ApiError: If the job is unknown or belongs to another company.
+        """
+        if UserImportRepository.find_one_by_q(job_id=job_id, company_id=user.pk) is None:
             raise ApiError(
-                errors="invalid file type.",
-                status_code=status.HTTP_400_BAD_REQUEST,
-                message="invalid file type",
-                error_type=APPErrorTypes.INVALID_FILE_TYPE.value
+                errors="Resource not found",
+                status_code=status.HTTP_404_NOT_FOUND,
+                message="resource not found",
+                error_type=APPErrorTypes.RESOURCE_NOT_FOUND.value
             )
 
-        _df = pd.read_csv(csv_file)
-        process_data = preprocess_csv(_df)
-        try:
-            with transaction.atomic():
-                for user_data in process_data:
-                    ser = SignupSerializer(data=user_data)
-                    ser.initial_data['role'] = ROLES.CANDIDATE.value[0]  # Set additional fields
-                    ser.initial_data['password'] = generate_password()  # Generate a random password
-                    ser.initial_data['status'] = ACCOUNT_STATUS.PENDING.value[0]
-                    ser.initial_data["is_agreement_accepted"] = True
-                    ser.initial_data['company'] = user.pk
-                    if not ser.is_valid():
-                        raise ApiError(
-                            errors=ser.errors,
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            message="User validation failed",
-                            error_type=APPErrorTypes.VALIDATION_ERROR.value
-                        )
-                    UserService.repository.create_user(ser.validated_data)
-        except ApiError as error:
-            raise error from error
+        job = import_users_from_csv.AsyncResult(job_id)
+        info = job.info if isinstance(job.info, dict) else {}
+        result = {
+            "job_id": job_id,
+            "state": job.state,
+            "rows_processed": info.get("rows_processed", 0),
+            "rows_imported": info.get("rows_imported", 0),
+            "rows_failed": info.get("rows_failed", 0),
+            "rows_per_second": info.get("rows_per_second"),
+        }
+        if job.successful():
+            result["errors"] = info.get("errors", [])
+        elif job.failed():
+            result["errors"] = [{"row": None, "errors": [str(job.info)]}]
+        return result
 
     @staticmethod
     def add_user_manual(data: Dict[str, Any]) -> UserEntity:
@@ -574,16 +718,49 @@ class UserService(BaseService[UserEntity]):
         return UserService.repository.create_user(data)
 
     @staticmethod
-    def get_user(request_user: UserEntity, user_id: int) -> UserEntity:
+    def list_users(request_user: UserEntity, filters: Dict[str, Any]) -> QuerySet:
+        """
+        Users listed by users/list/ for the requesting user:
+        - SUPER_ADMIN: Can view all users.
+        - COMPANY: Can view only the users of their company (the `company` filter is forced).
+        - Others: Nothing.
+
+        Value rows of the requested `fields` (plus the cursor keyset) are
+        loaded, for UserValuesSerializer.
+
+        :param request_user: The user making the request.
+        :param filters: Validated ListUsersQuerySerializer data.
+        :return: QuerySet[dict]
+        """
+        fields = filters.get("fields") or UserValuesSerializer.FIELDS
+        columns = tuple(dict.fromkeys((*fields, "created_at", "id")))
+
+        if request_user.role == ROLES.SUPER_ADMIN.value[0]:
+            return UserService.repository.find_for_list(filters, columns)
+
+        if request_user.role == ROLES.COMPANY.value[0]:
+            return UserService.repository.find_for_list({**filters, "company": request_user.pk}, columns)
+
+        return UserService.repository.find().none().values(*columns)
+
+    @staticmethod
+    def get_user(request_user: UserEntity, user_id: int, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Retrieve a user by their ID, with access control checks.
 
+        Only the requested `fields` (and the columns of the access checks)
+        are loaded, and serialized with UserValuesSerializer.
+
         :param request_user: The user making the request.
         :param user_id: The ID of the user to retrieve.
-        :return: The UserEntity instance of the requested user.
+        :param fields: The UserSerializer fields to return, all of them by default.
+        :return: The serialized user.
         :raises ApiError: If the user does not exist or if access is forbidden.
         """
-        user = UserService.find_one_by_id(user_id)
+        serializer = UserValuesSerializer(fields)
+        user = UserService.repository.find_values_by_id(
+            user_id, tuple(dict.fromkeys((*serializer.fields, "id", "company_id")))
+        )
 
         # Check if the user exists
         if user is None:
@@ -596,17 +773,17 @@ class UserService(BaseService[UserEntity]):
 
         # Super Admin can access any user
         if request_user.role == ROLES.SUPER_ADMIN.value[0]:
-            return UserSerializer(instance=user).data
+            return serializer.serialize(user)
 
         # Organizer access checks
         if request_user.role == ROLES.COMPANY.value[0]:
             # Organizer can get their own details
-            if request_user.id == user.id:
-                return UserSerializer(instance=user).data
+            if request_user.id == user["id"]:
+                return serializer.serialize(user)
 
             # Organizer can get user details if the user belongs to the same company
-            if user.company is not None and request_user.id == user.company.id:
-                return UserSerializer(instance=user).data
+            if user["company_id"] is not None and request_user.id == user["company_id"]:
+                return serializer.serialize(user)
 
         # If access conditions are not met, raise Forbidden error
         raise ApiError(
@@ -629,7 +806,7 @@ class UserService(BaseService[UserEntity]):
             )
         UserService.check_account_verified(user)
 
-        UserService.update(user.pk, **{"forgot_password_token_used": False})
+        UserService.update(user.pk, instance=user, mode=UPDATE_MODE.QUERY, **{"forgot_password_token_used": False})
         AuthUtils.send_forgot_password_email(user)
 
         return True
@@ -650,6 +827,7 @@ class UserService(BaseService[UserEntity]):
             )
 
         UserService.repository.update_password(user, data.get("password"))
-        UserService.update(user.pk, **{"forgot_password_token_used": True})
+        UserService.update(user.pk, instance=user, mode=UPDATE_MODE.QUERY, **{"forgot_password_token_used": True})
+        revoke_user_tokens(user)
 
         return True
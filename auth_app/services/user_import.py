@@ -0,0 +1,171 @@
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+
+from auth_app.models.user import UserEntity
+from auth_app.repositories.user import UserRepository
+from core.cache import build_cache_backend
+from core.enums.enums import ACCOUNT_STATUS, ROLES
+from core.types import ImportUsersResult
+from core.utils.import_user_preprocess import map_headers, validate_headers, validate_chunk, raise_api_error
+
+logger = logging.getLogger(__name__)
+
+
+class UserImportService:
+    """
+    Streams a CSV file of candidates into the users table.
+
+    The file is read `chunk_size` rows at a time. Every chunk is validated,
+    inserted with bulk_create and committed on its own, then a checkpoint is
+    stored so an interrupted import of the same file resumes after the last
+    committed chunk. Invalid rows are reported instead of aborting the import.
+
+    Usage:
+    >> UserImportService(company=user).run(csv_file)
+    """
+
+    _checkpoints = None  # checkpoint store shared by every import of the process
+
+    def __init__(self, company: UserEntity, chunk_size: Optional[int] = None,
+                 batch_size: Optional[int] = None, import_id: Optional[str] = None,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        :param company: The company user performing the import.
+        :param chunk_size: Rows read, validated and committed at once.
+        :param batch_size: Rows per INSERT statement.
+        :param import_id: Checkpoint key, defaults to a fingerprint of the file and company.
+        :param on_progress: Called with the checkpoint after every committed chunk.
+        """
+        self.company = company
+        self.chunk_size = chunk_size or settings.USER_IMPORT_CHUNK_SIZE
+        self.batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+        self.import_id = import_id
+        self.on_progress = on_progress
+
+    @classmethod
+    def checkpoints(cls):
+        if cls._checkpoints is None:
+            cls._checkpoints = build_cache_backend()
+        return cls._checkpoints
+
+    def fingerprint(self, csv_file) -> str:
+        """
+        Hash the uploaded file (streamed, chunk by chunk) together with the company id.
+
+        :param csv_file: The uploaded file.
+        :return: str
+        """
+        digest = hashlib.sha256(str(self.company.pk).encode())
+        for data in csv_file.chunks():
+            digest.update(data)
+        csv_file.seek(0)
+        return digest.hexdigest()
+
+    def run(self, csv_file) -> ImportUsersResult:
+        """
+        Import every row of the file.
+
+        :param csv_file: The uploaded CSV file.
+        :return: ImportUsersResult with row counts and the per-row error report.
+        :raises ApiError: If the file is empty or misses a required column.
+        """
+        import_id = self.import_id or self.fingerprint(csv_file)
+        checkpoint_key = f"user_import:{import_id}"
+        checkpoint = self.checkpoints().get(checkpoint_key) or {
+            "rows_processed": 0, "rows_imported": 0, "errors": []
+        }
+        if checkpoint["rows_processed"]:
+            logger.info(f"Resuming user import {import_id} after row {checkpoint['rows_processed']}")
+
+        try:
+            reader = pd.read_csv(
+                csv_file,
+                dtype=str,
+                keep_default_na=False,
+                chunksize=self.chunk_size,
+                skiprows=range(1, checkpoint["rows_processed"] + 1),
+            )
+            valid_headers = None
+            for chunk in reader:
+                if valid_headers is None:
+                    valid_headers = map_headers(chunk.columns)
+                    validate_headers(valid_headers)
+
+                imported, errors = self.import_chunk(chunk, valid_headers, checkpoint["rows_processed"])
+
+                checkpoint["rows_processed"] += len(chunk)
+                checkpoint["rows_imported"] += imported
+                checkpoint["errors"].extend(errors)
+                self.checkpoints().set(checkpoint_key, checkpoint, settings.USER_IMPORT_CHECKPOINT_TTL)
+                if self.on_progress is not None:
+                    self.on_progress(checkpoint)
+        except pd.errors.EmptyDataError:
+            raise_api_error("The file is empty.")
+
+        # the import is complete, uploading the same file again starts over
+        self.checkpoints().delete(checkpoint_key)
+
+        return ImportUsersResult(
+            rows_processed=checkpoint["rows_processed"],
+            rows_imported=checkpoint["rows_imported"],
+            rows_failed=len(checkpoint["errors"]),
+            errors=checkpoint["errors"],
+        )
+
+    def import_chunk(self, chunk: pd.DataFrame, valid_headers: Dict[str, str], row_offset: int):
+        """
+        Validate and insert a single chunk inside its own transaction.
+
+        :param chunk: Rows of the CSV file.
+        :param valid_headers: Mapping of CSV header to DB column name.
+        :param row_offset: Number of data rows before this chunk.
+        :return: (number of imported users, row errors)
+        """
+        valid_rows, errors = validate_chunk(chunk, valid_headers, row_offset)
+
+        # drop emails repeated in the file or already registered
+        rows_by_email = {}
+        for row_number, data in valid_rows.items():
+            email = UserEntity.objects.normalize_email(data["email"].strip())
+            if email in rows_by_email:
+                errors.append({"row": row_number, "errors": [f"Duplicate email in file: {email}"]})
+                continue
+            rows_by_email[email] = (row_number, data)
+
+        existing = UserRepository.find_existing_emails(rows_by_email.keys())
+        users_data: List[Dict[str, Any]] = []
+        for email, (row_number, data) in rows_by_email.items():
+            if email in existing:
+                errors.append({"row": row_number, "errors": [f"User already exists: {email}"]})
+                continue
+            users_data.append(self.build_user_data(email, data))
+
+        errors.sort(key=lambda error: error["row"])
+        if not users_data:
+            return 0, errors
+
+        with transaction.atomic():
+            users = UserRepository.bulk_create_users(users_data, batch_size=self.batch_size)
+
+        return len(users), errors
+
+    def build_user_data(self, email: str, data: Dict[str, str]) -> Dict[str, Any]:
+        """
+        :param email: Normalized email of the candidate.
+        :param data: Validated row of the CSV file.
+        :return: UserEntity fields of the candidate.
+        """
+        return {
+            "email": email,
+            "full_name": data["full_name"].strip(),
+            "phone_number": data["phone_number"].strip(),
+            "role": ROLES.CANDIDATE.value[0],
+            "status": ACCOUNT_STATUS.PENDING.value[0],
+            "is_agreement_accepted": True,
+            "company": self.company,
+        }
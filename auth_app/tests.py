@@ -1,3 +1,467 @@
-from django.test import TestCase
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from auth_app.models import UserEntity
+from auth_app.repositories.user import UserRepository
+from auth_app.serializers.auth import (ListUsersQuerySerializer, UserSerializer, UserValuesSerializer,
+                                       compiled_user_serializer)
+from auth_app.services.last_login import LastLoginWriter
+from auth_app.services.user import UserService
+from core.auth.checks import check_auth_settings
+from core.auth.revocation import denylist, revocation_reason
+from core.auth.tokens import UserAccessToken, UserRefreshToken
+from core.base.compiled_serializer import CompiledSerializer
+from core.common.erro_message_type import APPErrorTypes
+from core.decorators.authorization import authorization
+from core.decorators.rate_limit import rate_limit
+from core.exceptions.base import ApiError
+from core.utils.rate_limit import LocalSlidingWindowCounter, RateLimiter
+
+
+class UserImportTests(TestCase):
+    """
+    A CSV upload goes through validation, deduplication and bulk insert.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = UserEntity.objects.create(email="company@example.com", role="company", full_name="Company")
+        UserEntity.objects.create(email="taken@example.com", role="candidate", full_name="Taken")
+
+    def test_import_valid_csv(self):
+        csv_file = SimpleUploadedFile("users.csv", (
+            "Full Name,Email,Phone Number\n"
+            "Jane Doe,jane@example.com,+5511999999999\n"
+            "John Roe,john@example.com,+5511888888888\n"
+            "Taken,taken@example.com,+5511777777777\n"
+        ).encode())
+
+        result = UserService.import_user({"file": csv_file}, self.company)
+
+        self.assertEqual((result.rows_processed, result.rows_imported, result.rows_failed), (3, 2, 1))
+        self.assertEqual(result.errors, [{"row": 3, "errors": ["User already exists: taken@example.com"]}])
+        jane = UserEntity.objects.get(email="jane@example.com")
+        self.assertEqual((jane.full_name, jane.role, jane.status), ("Jane Doe", "candidate", "pending"))
+        self.assertEqual(jane.company_id, self.company.pk)
+        self.assertTrue(jane.is_agreement_accepted)
+        self.assertFalse(jane.has_usable_password())
+
+
+class ImportUsersView:
+    @authorization(groups=["company"], permissions=["import_users"])
+    def post(self, request):
+        return request.user.pk
+
+
+@override_settings(AUTHORIZATION_MODE="claims")
+class ClaimsAuthorizationTests(TestCase):
+    """
+    With AUTHORIZATION_MODE 'claims' the role and status come from the
+    token, revocations must still reject the tokens of users who lost access.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = UserEntity.objects.create(
+            email="company@example.com", role="company", full_name="Company", status="active"
+        )
+
+    def setUp(self):
+        denylist.clear()
+        self.addCleanup(denylist.clear)
+
+    def post(self, user):
+        token = UserRefreshToken.for_user(user).access_token
+        request = RequestFactory().post("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return ImportUsersView().post(request)
+
+    def test_active_user_is_authorized(self):
+        self.assertEqual(self.post(self.company), self.company.pk)
+
+    def test_blocked_user_token_is_rejected(self):
+        token = UserRefreshToken.for_user(self.company).access_token
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.is_blocked = True
+            self.company.save()
+
+        request = RequestFactory().post("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        with self.assertRaises(ApiError) as raised:
+            ImportUsersView().post(request)
+        self.assertEqual(raised.exception.status_code, 403)
+        self.assertEqual(raised.exception.error_type, APPErrorTypes.USER_BLOCKED.value)
+
+    def test_bulk_update_revokes_without_reloading(self):
+        token = UserRefreshToken.for_user(self.company).access_token
+        self.company.is_blocked = True
+        # the UPDATE only, the revocation is synced from the instances passed
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks(execute=True):
+            UserRepository.bulk_update([self.company], ["is_blocked"])
+
+        self.assertEqual(revocation_reason(token.payload), "blocked")
+
+    def test_claims_mode_requires_redis(self):
+        # one process here, the check only runs at startup
+        with self.assertRaises(ImproperlyConfigured):
+            check_auth_settings()
+        with self.settings(AUTHORIZATION_MODE="database"):
+            check_auth_settings()
+
+
+@override_settings(SIMPLE_JWT={**settings.SIMPLE_JWT, "ROTATE_REFRESH_TOKENS": True})
+class RefreshTokenRotationTests(TestCase):
+    """
+    A rotated refresh token may not be used again, a reuse means it leaked
+    and revokes every token of the same login.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserEntity.objects.create(
+            email="company@example.com", role="company", full_name="Company", status="active"
+        )
+
+    def setUp(self):
+        denylist.clear()
+        self.addCleanup(denylist.clear)
+
+    def assertRefreshFails(self, refresh: str, message: str):
+        with self.assertRaises(ApiError) as raised:
+            UserService.refresh_token({"refresh": refresh})
+        self.assertEqual(raised.exception.status_code, 401)
+        self.assertEqual(raised.exception.message, message)
+
+    def test_rotation(self):
+        login = str(UserRefreshToken.for_user(self.user))
+        rotated = UserService.refresh_token({"refresh": login})
+
+        self.assertNotEqual(rotated.refresh_token, login)
+        self.assertEqual(UserAccessToken(rotated.access_token)["user_id"], str(self.user.pk))
+        UserService.refresh_token({"refresh": rotated.refresh_token})
+
+    def test_reuse_revokes_the_family(self):
+        login = str(UserRefreshToken.for_user(self.user))
+        rotated = UserService.refresh_token({"refresh": login})
+
+        self.assertRefreshFails(login, "refresh token reused")
+        # the tokens rotated from the same login are revoked too
+        self.assertRefreshFails(rotated.refresh_token, "login required")
+        request = RequestFactory().post("/", HTTP_AUTHORIZATION=f"Bearer {rotated.access_token}")
+        with self.assertRaises(ApiError):
+            ImportUsersView().post(request)
+        # another login of the same user is not affected
+        UserService.refresh_token({"refresh": str(UserRefreshToken.for_user(self.user))})
+
+    def test_rotation_requires_redis(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_auth_settings()
+
+    @override_settings(SIMPLE_JWT={**settings.SIMPLE_JWT, "ROTATE_REFRESH_TOKENS": False})
+    def test_without_rotation(self):
+        login = str(UserRefreshToken.for_user(self.user))
+
+        for _ in range(2):
+            result = UserService.refresh_token({"refresh": login})
+            self.assertEqual(result.refresh_token, login)
+            self.assertEqual(UserAccessToken(result.access_token)["role"], "company")
+
+
+class LoginView:
+    @rate_limit("login")
+    def post(self, request):
+        return "ok"
+
+
+@override_settings(
+    RATE_LIMIT_ENABLED=True,
+    RATE_LIMIT_TRUSTED_PROXIES=0,
+    RATE_LIMITS={"login": {"ip": (100, 60), "email": (3, 300)}},
+)
+class RateLimitTests(SimpleTestCase):
+    """
+    Requests over the limit of an identity are rejected with 429 and the
+    seconds to wait, before the view runs.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(RateLimiter, "_counter", LocalSlidingWindowCounter())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, email: str):
+        request = APIRequestFactory().post("/", {"email": email, "password": "secret"}, format="json")
+        return LoginView().post(Request(request, parsers=[JSONParser()]))
+
+    def test_429_after_the_email_limit(self):
+        for _ in range(3):
+            self.assertEqual(self.post("Jane@Example.com "), "ok")
+
+        with self.assertRaises(ApiError) as raised:
+            self.post("jane@example.com")
+        self.assertEqual(raised.exception.status_code, 429)
+        self.assertEqual(raised.exception.error_type, APPErrorTypes.TOO_MANY_REQUESTS.value)
+        retry_after = int(re.search(r"in (\d+) seconds", raised.exception.errors["message"]).group(1))
+        self.assertTrue(0 < retry_after <= 300)
+        # other emails from the same IP stay under the IP limit
+        self.assertEqual(self.post("john@example.com"), "ok")
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(5):
+            self.assertEqual(self.post("jane@example.com"), "ok")
+
+
+class LastLoginWriterTests(TestCase):
+    """
+    Buffered last logins: the newest login of a user is written, and a
+    failed flush keeps the logins for the next one.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = UserEntity.objects.create(email="alice@example.com", role="company", full_name="Alice")
+        cls.bob = UserEntity.objects.create(email="bob@example.com", role="company", full_name="Bob")
+        cls.login = datetime(2025, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        # the flush thread never wakes up on its own during a test
+        self.writer = LastLoginWriter(flush_interval=3600, max_size=1000, batch_size=500)
+
+    def last_login(self, user):
+        return UserEntity.objects.values_list("last_login", flat=True).get(pk=user.pk)
+
+    def test_newest_login_wins(self):
+        self.writer.record(self.alice.pk, self.login)
+        self.writer.record(self.alice.pk, self.login + timedelta(minutes=5))
+        self.writer.record(self.bob.pk, self.login)
+
+        self.assertEqual(self.writer.flush(), 2)
+        self.assertEqual(self.last_login(self.alice), self.login + timedelta(minutes=5))
+        self.assertEqual(self.last_login(self.bob), self.login)
+        self.assertEqual(self.writer.flush(), 0)
+
+    def test_failed_flush_keeps_the_logins(self):
+        self.writer.record(self.alice.pk, self.login)
+        self.writer.record(self.bob.pk, self.login)
+
+        def fail(last_logins, batch_size):
+            # alice logs in again while the flush is running
+            self.writer.record(self.alice.pk, self.login + timedelta(minutes=5))
+            raise DatabaseError("connection lost")
+
+        with mock.patch.object(UserRepository, "bulk_update_last_login", side_effect=fail):
+            with self.assertRaises(DatabaseError):
+                self.writer.flush()
+
+        self.assertEqual(self.writer.flush(), 2)
+        self.assertEqual(self.last_login(self.alice), self.login + timedelta(minutes=5))
+        self.assertEqual(self.last_login(self.bob), self.login)
+
+
+class UserListTests(TestCase):
+    """
+    Filters, sorting and prefix search of users/list/, and one query per page.
+    The query plans at scale are checked by `manage.py benchmark_user_list_plans`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserEntity.objects.create(email="admin@example.com", role="super_admin", full_name="Admin")
+        cls.company = UserEntity.objects.create(email="acme@example.com", role="company", full_name="Acme")
+        users = [
+            ("ann@example.com", "Ann Smith", "candidate", "pending", False, cls.company),
+            ("bob@example.com", "Bob Annan", "candidate", "complete", True, cls.company),
+            ("carl@example.com", "Carl Ng", "educator", "complete", False, None),
+            ("dana@anna.com", "Dana Roe", "candidate", "complete", False, None),
+        ]
+        cls.start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        for hours, (email, full_name, role, status, is_blocked, company) in enumerate(users, start=1):
+            user = UserEntity.objects.create(
+                email=email, full_name=full_name, role=role, status=status, is_blocked=is_blocked, company=company
+            )
+            # created_at is auto_now_add, spread the users one hour apart
+            UserEntity.objects.filter(pk=user.pk).update(created_at=cls.start + timedelta(hours=hours))
+        UserEntity.objects.filter(pk__in=[cls.admin.pk, cls.company.pk]).update(created_at=cls.start)
+
+    def emails(self, request_user=None, **params):
+        query = ListUsersQuerySerializer(data=params)
+        query.is_valid(raise_exception=True)
+        rows = UserService.list_users(request_user or self.admin, query.validated_data)
+        return [row["email"] for row in rows]
+
+    def test_filters(self):
+        self.assertEqual(self.emails(role="candidate"), ["dana@anna.com", "bob@example.com", "ann@example.com"])
+        self.assertEqual(self.emails(status="pending"), ["ann@example.com"])
+        self.assertEqual(self.emails(is_blocked=True), ["bob@example.com"])
+        self.assertEqual(self.emails(role="candidate", is_blocked=False), ["dana@anna.com", "ann@example.com"])
+        self.assertEqual(
+            self.emails(created_after=self.start + timedelta(hours=2), created_before=self.start + timedelta(hours=4)),
+            ["carl@example.com", "bob@example.com"],
+        )
+
+    def test_company_only_lists_its_users(self):
+        self.assertEqual(self.emails(self.company), ["bob@example.com", "ann@example.com"])
+        self.assertEqual(self.emails(self.company, company=self.admin.pk), ["bob@example.com", "ann@example.com"])
+
+    def test_sort_on_created_at_then_id(self):
+        everyone = ["admin@example.com", "acme@example.com", "ann@example.com", "bob@example.com",
+                    "carl@example.com", "dana@anna.com"]
+        self.assertEqual(self.emails(ordering="created_at"), everyone)
+        self.assertEqual(self.emails(), everyone[::-1])
+
+    def test_prefix_search(self):
+        # case-insensitive prefix of the email or the full name, not a substring
+        self.assertEqual(self.emails(search="ANN"), ["ann@example.com"])
+        self.assertEqual(self.emails(search="bob ann"), ["bob@example.com"])
+        self.assertEqual(self.emails(search="anna"), [])
+        self.assertEqual(self.emails(search="Dana@"), ["dana@anna.com"])
+
+    def test_page_is_one_query(self):
+        query = ListUsersQuerySerializer(data={"role": "candidate"})
+        query.is_valid(raise_exception=True)
+        with self.assertNumQueries(1):
+            rows = UserService.list_users(self.admin, query.validated_data)[:2]
+            page = UserValuesSerializer().serialize_many(rows)
+        self.assertEqual([row["email"] for row in page], ["dana@anna.com", "bob@example.com"])
+        self.assertEqual(set(page[0]), set(UserValuesSerializer.FIELDS))
+
+
+class CompiledSerializerParityTests(SimpleTestCase):
+    """
+    CompiledSerializer must produce exactly what the DRF serializer produces.
+    """
+
+    @staticmethod
+    def make_user(**fields):
+        values = {
+            "id": 7, "full_name": "Jane Doe", "email": "jane@example.com", "phone_number": "+5511999999999",
+            "role": "company", "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            "last_login": datetime(2024, 6, 2, 8, 0, tzinfo=dt_timezone.utc),
+        }
+        values.update(fields)
+        return UserEntity(**values)
+
+    def assertParity(self, serializer_class, compiled, instance):
+        expected = serializer_class(instance=instance).data
+        actual = compiled(instance=instance).data
+        self.assertEqual(actual, expected)
+        self.assertEqual(list(actual), list(expected))
+
+    def test_user_serializer(self):
+        self.assertParity(UserSerializer, compiled_user_serializer, self.make_user())
+
+    def test_none_values(self):
+        self.assertParity(UserSerializer, compiled_user_serializer, self.make_user(phone_number=None, last_login=None))
+
+    @override_settings(TIME_ZONE="UTC")
+    def test_utc_datetimes(self):
+        with timezone.override("UTC"):
+            self.assertParity(UserSerializer, compiled_user_serializer, self.make_user())
+
+    def test_current_timezone(self):
+        with timezone.override("Asia/Karachi"):
+            self.assertParity(UserSerializer, compiled_user_serializer, self.make_user())
+
+    @override_settings(TIME_ZONE="America/Sao_Paulo")
+    def test_non_utc_time_zone(self):
+        self.assertParity(UserSerializer, compiled_user_serializer, self.make_user())
+        self.assertParity(
+            UserSerializer, compiled_user_serializer, self.make_user(created_at=datetime(2024, 1, 1, 0, 0))
+        )
+        self.assertEqual(compiled_user_serializer(instance=self.make_user()).data["created_at"],
+                         "2024-05-01T09:30:15.123456-03:00")
+
+    def test_naive_datetimes(self):
+        self.assertParity(
+            UserSerializer, compiled_user_serializer, self.make_user(created_at=datetime(2024, 1, 1, 0, 0))
+        )
+
+    def test_many(self):
+        users = [self.make_user(id=index, email=f"user{index}@example.com") for index in range(1, 4)]
+        self.assertEqual(
+            compiled_user_serializer(instance=users, many=True).data,
+            UserSerializer(instance=users, many=True).data
+        )
+
+    def test_value_rows(self):
+        user = self.make_user()
+        row = {name: getattr(user, name) for name in UserValuesSerializer.FIELDS}
+        self.assertEqual(UserValuesSerializer().serialize(row), UserSerializer(instance=user).data)
+        self.assertEqual(
+            UserValuesSerializer(("email", "created_at")).serialize(row),
+            {"email": row["email"], "created_at": UserSerializer(instance=user).data["created_at"]}
+        )
+
+    def test_fallback_fields(self):
+        class RichUserSerializer(serializers.ModelSerializer):
+            display_name = serializers.SerializerMethodField()
+            contact = serializers.EmailField(source="email")
+            password = serializers.CharField(write_only=True)
+
+            class Meta:
+                model = UserEntity
+                fields = ["id", "role", "display_name", "contact", "password", "created_at"]
+
+            def get_display_name(self, user):
+                return user.full_name.upper()
+
+        compiled = CompiledSerializer(RichUserSerializer)
+        self.assertParity(RichUserSerializer, compiled, self.make_user())
+        self.assertNotIn("password", compiled.fields)
+        with self.assertRaises(ValueError):
+            compiled.row_function(("display_name",))
+
+    def test_custom_field_subclass(self):
+        class UpperEmailField(serializers.EmailField):
+            def to_representation(self, value):
+                return value.upper()
+
+        class PlainEmailField(serializers.EmailField):
+            pass
+
+        class CustomUserSerializer(serializers.ModelSerializer):
+            email = UpperEmailField()
+            contact = PlainEmailField(source="email")
+
+            class Meta:
+                model = UserEntity
+                fields = ["id", "email", "contact"]
+
+        compiled = CompiledSerializer(CustomUserSerializer)
+        self.assertParity(CustomUserSerializer, compiled, self.make_user())
+        self.assertEqual(compiled(instance=self.make_user()).data["email"], "JANE@EXAMPLE.COM")
+        # the overridden to_representation goes through the DRF field, the plain subclass is inlined
+        self.assertEqual(compiled.source.count("instance.email"), 1)
+        with self.assertRaises(ValueError):
+            compiled.row_function(("email",))
+        self.assertEqual(compiled.row_function(("contact",))({"email": "jane@example.com"}),
+                         {"contact": "jane@example.com"})
+
+    def test_skip_field(self):
+        class NicknameUserSerializer(serializers.ModelSerializer):
+            # not required and not on the model: skipped when the instance has no nickname
+            nickname = serializers.CharField(required=False)
+
+            class Meta:
+                model = UserEntity
+                fields = ["id", "nickname", "email"]
+
+        compiled = CompiledSerializer(NicknameUserSerializer)
+        user = self.make_user()
+        self.assertParity(NicknameUserSerializer, compiled, user)
+        self.assertEqual(list(compiled(instance=user).data), ["id", "email"])
+
+        user.nickname = "jd"
+        self.assertParity(NicknameUserSerializer, compiled, user)
+        self.assertEqual(compiled(instance=user).data["nickname"], "jd")
@@ -1,7 +1,7 @@
 from django.urls import path
 
 from auth_app.views.user import ListAllUser, UserUpdateView, UserProfileView, UserProfileUpdatePicture, \
-    UserDeleteView, ImportUsers, AddUserView, GetUser, UpdateProfileView
+    UserDeleteView, ImportUsers, ImportUsersStatus, AddUserView, GetUser, UpdateProfileView
 
 urlpatterns = [
     path("admin/edit/user/", UserUpdateView.as_view(), name="super_admin_edit_user"),
@@ -10,6 +10,7 @@ urlpatterns = [
     path("profile/picture/", UserProfileUpdatePicture.as_view(), name="upload_profile_picture"),
     path("admin/delete/<int:id>/", UserDeleteView.as_view(), name="user_delete_view"),
     path("teams/import/", ImportUsers.as_view(), name="import_users"),
+    path("teams/import/<str:job_id>/", ImportUsersStatus.as_view(), name="import_users_status"),
     path("candidate/account/add/", AddUserView.as_view(), name="add_user"),
     path("view/<int:user_id>/", GetUser.as_view(), name="view_user"),
     path("profile/edit/", UpdateProfileView.as_view(), name="update_profile"),
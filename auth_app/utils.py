@@ -1,8 +1,6 @@
-from decouple import config
+from typing import List
 
-from auth_app.models import UserEntity
-from core.utils.helper import generate_token, generate_uid
-from pkg.services.email_service import EmailServicefrom decouple import config
+from decouple import config
 
 from auth_app.models import UserEntity
 from core.utils.helper import generate_token, generate_uid
@@ -27,10 +25,7 @@ class AuthUtils:
         Send Email for verification
         :param instance of user
         """
-        token = generate_token(instance)
-        uid = generate_uid(instance.pk)
-        # Build verification link
-        verification_link = f"{config('FRONTEND_URL')}/account/verify/email/?uid={uid}&token={token}"
+        verification_link = AuthUtils.build_link("/account/verify/email/", instance)
         recipient_list = [instance.email]  # Get the user's email from the instance
         EmailService.send_verification_email(recipient_list, verification_link)
 
@@ -40,11 +35,7 @@ class AuthUtils:
         Send Email for forgot password
         :param instance: UserEntity
         """
-
-        token = generate_token(instance)
-        uid = generate_uid(instance.pk)
-
-        verification_link = f"{config('FRONTEND_URL')}/account/reset/password/?uid={uid}&token={token}"
+        verification_link = AuthUtils.build_link("/account/reset/password/", instance)
         recipient_list = [instance.email]  # Get the user's email from the instance
         EmailService.send_forgot_password_email(recipient_list, verification_link)
 
@@ -54,9 +45,39 @@ class AuthUtils:
         Send Email for complete account process for candidate
         :param instance of user
         """
-        token = generate_token(instance)
-        uid = generate_uid(instance.pk)
-        # Build verification link
-        verification_link = f"{config('FRONTEND_URL')}/account/complete/?uid={uid}&token={token}"
+        verification_link = AuthUtils.build_link("/account/complete/", instance)
         recipient_list = [instance.email]  # Get the user's email from the instance
         EmailService.send_candidate_account_create_email(recipient_list, verification_link)
+
+    @staticmethod
+    def build_link(path: str, instance: UserEntity) -> str:
+        """
+        Build a frontend link carrying the uid and token of the user
+        :param path: frontend path, e.g. /account/complete/
+        :param instance: UserEntity
+        """
+        token = generate_token(instance)
+        uid = generate_uid(instance.pk)
+        return f"{config('FRONTEND_URL')}{path}?uid={uid}&token={token}"
+
+    @staticmethod
+    def send_signup_verification_emails(instances: List[UserEntity]):
+        """
+        Send verification emails for a batch of created users
+        :param instances: list of users
+        """
+        EmailService.send_verification_emails([
+            (instance.email, AuthUtils.build_link("/account/verify/email/", instance))
+            for instance in instances
+        ])
+
+    @staticmethod
+    def send_candidate_emails_for_account_creation(instances: List[UserEntity]):
+        """
+        Send complete account emails for a batch of created candidates
+        :param instances: list of users
+        """
+        EmailService.send_candidate_account_create_emails([
+            (instance.email, AuthUtils.build_link("/account/complete/", instance))
+            for instance in instances
+        ])
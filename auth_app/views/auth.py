@@ -10,6 +10,7 @@ from core.base import BaseView
 from core.decorators.api_response import api_response
 from core.decorators.authentication import login_required
 from core.decorators.get_user_from_request import get_user_from_request
+from core.decorators.rate_limit import rate_limit
 
 
 class SignupView(BaseView):
@@ -41,6 +42,7 @@ class LoginView(BaseView):
     serializer_class = LoginSerializer
 
     @api_response
+    @rate_limit("login")
     def post(self, request: Request) -> Response:
         """
         :param: request[Request]
@@ -112,6 +114,7 @@ class LoginSuperAdmin(BaseView):
     serializer_class = LoginSerializer
 
     @api_response
+    @rate_limit("super_admin_login")
     def post(self, request: Request) -> Response:
         """
         :param: request[Request]
@@ -164,6 +167,7 @@ class ForgotPasswordView(BaseView):
     serializer_class = ForgotPasswordSerializer
 
     @api_response
+    @rate_limit("forgot_password")
     def post(self, request: Request) -> Response:
         """
         Handles POST request for initiating a forgot password request.
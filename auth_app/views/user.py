@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import status
 from rest_framework.generics import ListAPIView, DestroyAPIView
 from rest_framework.request import Request
@@ -5,26 +6,47 @@ from rest_framework.response import Response
 
 from auth_app.repositories.user import UserRepository
 from auth_app.serializers.auth import UserSerializer, UserUpdateSerializer, UserProfilePictureSerializer, \
-    ImportUsersSerializer, UpdateProfileSerializer
+    ImportUsersSerializer, UpdateProfileSerializer, ListUsersQuerySerializer, UserFieldsQuerySerializer, \
+    UserValuesSerializer, compiled_user_serializer
 from auth_app.services.user import UserService
 from core.base.base_view import BaseView
+from core.common.erro_message_type import APPErrorTypes
 from core.decorators.api_response import api_response
 from core.decorators.authentication import login_required
 from core.decorators.authorization import authorization
 from core.decorators.get_user_from_request import get_user_from_request
 from core.decorators.pagination_decorator import paginate_list_view
 from core.enums.enums import ROLES, ACCOUNT_STATUS
+from core.exceptions.base import ApiError
 from core.utils.helper import generate_password
 
 
+def validate_query_params(request: Request, serializer_class) -> dict:
+    """
+    Validate the query parameters of a request.
+    :raise: ApiError Bad Request
+    """
+    # a QueryDict reads missing booleans as False
+    serializer = serializer_class(data=request.query_params.dict())
+    if not serializer.is_valid():
+        raise ApiError(
+            errors=serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message="validation error",
+            error_type=APPErrorTypes.VALIDATION_ERROR.value,
+        )
+    return serializer.validated_data
+
+
 # admin view api only
-@paginate_list_view
+@paginate_list_view(mode=settings.USER_LIST_PAGINATION)
 class ListAllUser(ListAPIView):
     """
     API View to list all users.
     This view is only accessible to users with 'view_users' permission.
 
-    Pagination is applied via the @paginate_list_view decorator.
+    Pagination is applied via the @paginate_list_view decorator, with
+    page numbers, or cursors on (created_at, id) when USER_LIST_PAGINATION is 'cursor'.
     """
 
     queryset = UserRepository.find()  # Fetch all users from the UserRepository
@@ -36,6 +58,9 @@ class ListAllUser(ListAPIView):
         """
         Handles GET request to list all users.
         This method requires the 'view_users' permission for authorized access.
+        Query parameters: role, status, is_blocked, company, created_after,
+        created_before, search (email / full name prefix), ordering and
+        fields (comma separated projection of the UserSerializer fields).
 
         :param request: Request object containing the HTTP request data
         :return: Paginated list of users serialized by UserSerializer
@@ -44,21 +69,24 @@ class ListAllUser(ListAPIView):
 
     def get_queryset(self):
         """
-        Filters queryset based on user role:
-        - SUPER_ADMIN: Can view all users.
-        - COMPANY: Can view only users associated by their company (the user).
+        Filters queryset based on user role (see UserService.list_users) and
+        the whitelisted query parameters (see ListUsersQuerySerializer).
         """
-        user = self.request.user
-
-        if user.role == ROLES.SUPER_ADMIN.value[0]:
-            # SUPER_ADMIN can see all users
-            return UserRepository.find()
+        query = validate_query_params(self.request, ListUsersQuerySerializer)
+        self.projection = query.get("fields")
+        return UserService.list_users(self.request.user, query)
 
-        if user.role == ROLES.COMPANY.value[0]:
-            # COMPANY can only see user they associated (where company is the user)
-            return UserRepository.find().filter(organization=user)  # Or filter(company=user)
-
-        return UserRepository.find().none()  # In case no role matches, return an empty queryset
+    def list(self, request, *args, **kwargs):
+        """
+        Serializes the value rows of the page with UserValuesSerializer
+        instead of UserSerializer.
+        """
+        queryset = self.get_queryset()
+        serializer = UserValuesSerializer(self.projection)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(serializer.serialize_many(queryset))
+        return self.get_paginated_response(serializer.serialize_many(page))
 
 
 class UserUpdateView(BaseView):
@@ -100,7 +128,7 @@ class UserProfileView(BaseView):
         :param request: The HTTP request object.
         :return: Response containing the user's profile data.
         """
-        user = UserSerializer(instance=request.user).data
+        user = compiled_user_serializer(instance=request.user).data
         return Response({"user": user})
 
 
@@ -177,8 +205,34 @@ class ImportUsers(BaseView):
         """
         validated_data = self.validate_serializer(request)
 
-        UserService.import_user(validated_data, request.user)
-        return Response({"message": "Users imported successfully"})
+        # ?mode=sync|async overrides the configured import mode
+        if request.query_params.get("mode", settings.USER_IMPORT_MODE) == "async":
+            job_id = UserService.import_user_async(validated_data, request.user)
+            return Response({"message": "Users import started", "job_id": job_id},
+                            status=status.HTTP_202_ACCEPTED)
+
+        result = UserService.import_user(validated_data, request.user)
+        return Response({"message": "Users imported successfully", **result.to_dict()})
+
+
+class ImportUsersStatus(BaseView):
+    """
+    View to poll the progress of a background user import.
+
+    Reports rows processed, rows failed and throughput while the import runs,
+    and the per-row error report once it is done.
+    """
+
+    @api_response
+    @authorization(groups=[ROLES.COMPANY.value[0]], permissions=["import_users"])
+    def get(self, request: Request, job_id: str) -> Response:
+        """
+        get request
+        :param request:
+        :param job_id: The job id returned by the import endpoint.
+        :return: Response
+        """
+        return Response({"job": UserService.get_import_status(job_id, request.user)})
 
 
 class AddUserView(BaseView):
@@ -226,8 +280,10 @@ class GetUser(BaseView):
     def get(self, request: Request, user_id: int):
         """
         Handle GET request to retrieve user information.
+        Supports the `fields` projection (comma separated UserSerializer fields).
         """
-        return Response({"user": UserService.get_user(request.user, user_id)})
+        query = validate_query_params(request, UserFieldsQuerySerializer)
+        return Response({"user": UserService.get_user(request.user, user_id, query.get("fields"))})
 
 
 class UpdateProfileView(BaseView):
@@ -256,4 +312,4 @@ class UpdateProfileView(BaseView):
         user = request.user
         validated_data = self.validate_serializer(request)
         updated_user = UserService.update_user(user.pk, validated_data)
-        return Response(UserSerializer(instance=updated_user).data)
+        return Response(compiled_user_serializer(instance=updated_user).data)
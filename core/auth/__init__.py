@@ -0,0 +1,5 @@
+from .claims import FAMILY_CLAIM, ROLE_CLAIM, STATUS_CLAIM
+from .outstanding import OutstandingTokens, outstanding_tokens
+from .status import check_user_status
+from .tokens import UserAccessToken, UserRefreshToken, user_claims
+from .verifier import TokenVerifier, get_token_verifier
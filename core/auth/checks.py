@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+def check_auth_settings() -> None:
+    """
+    Refuse to start with auth settings that are only safe when the
+    revocations are shared between processes (CACHE_BACKEND=redis).
+
+    With the local backend a user blocked on one worker stays authorized on
+    the others until their tokens expire, so the token claims cannot stand
+    in for the user row, and a refresh token issued by one worker (or before
+    a restart) is unknown to the others, so rotating it looks like a reuse.
+
+    :raises ImproperlyConfigured: If AUTHORIZATION_MODE is 'claims' or
+        ROTATE_REFRESH_TOKENS is set without redis.
+    """
+    if settings.CACHE_BACKEND == "redis":
+        return
+    if settings.AUTHORIZATION_MODE == "claims":
+        raise ImproperlyConfigured(
+            "AUTHORIZATION_MODE='claims' requires CACHE_BACKEND='redis', "
+            "use AUTHORIZATION_MODE='database' with the local backend."
+        )
+    if settings.SIMPLE_JWT.get("ROTATE_REFRESH_TOKENS"):
+        raise ImproperlyConfigured(
+            "ROTATE_REFRESH_TOKENS requires CACHE_BACKEND='redis' to share the outstanding refresh tokens, "
+            "disable it with the local backend."
+        )
@@ -0,0 +1,5 @@
+# Claims embedded in the tokens on top of the simplejwt ones
+ROLE_CLAIM = "role"
+STATUS_CLAIM = "status"
+# shared by the tokens rotated from the same login
+FAMILY_CLAIM = "family"
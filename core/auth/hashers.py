@@ -0,0 +1,114 @@
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from typing import Any, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+
+from core.common.erro_message_type import APPErrorTypes
+from core.exceptions.base import ApiError
+
+logger = logging.getLogger(__name__)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher with the cost (iterations) set per deployment by
+    PASSWORD_HASH_ITERATIONS, see the benchmark_password_hashing command.
+
+    Hashes made with another cost still verify, and are re-hashed with
+    the configured one on the next successful login (must_update).
+    """
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+def _init_worker():
+    # spawned workers import the settings themselves, forked ones inherit them
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _verify_password(password: str, encoded: str) -> Tuple[bool, bool]:
+    return hashers.verify_password(password, encoded)
+
+
+def _make_password(password: Optional[str]) -> str:
+    return hashers.make_password(password)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the process pool hashing passwords, None when PASSWORD_HASH_WORKERS
+    is 0 and passwords are hashed in the calling thread.
+
+    :return: Optional[ProcessPoolExecutor]
+    """
+    global _pool
+    if _pool is None and settings.PASSWORD_HASH_WORKERS > 0:
+        with _pool_lock:
+            # created on first use, so forked gunicorn workers get their own
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, initializer=_init_worker)
+    return _pool
+
+
+def _run_on_pool(pool: ProcessPoolExecutor, function: Callable[..., Any], *args) -> Any:
+    """
+    Run a hashing function on the pool, waiting up to PASSWORD_HASH_TIMEOUT.
+
+    :raises ApiError: 503 if the pool is saturated and the hash did not complete in time.
+    """
+    future = pool.submit(function, *args)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT)
+    except TimeoutError:
+        # drop it if still queued, nobody waits for the result anymore
+        future.cancel()
+        logger.warning(f"Password hashing did not complete within {settings.PASSWORD_HASH_TIMEOUT}s.")
+        raise ApiError(
+            errors="The server is busy, please try again later.",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            message="service unavailable",
+            error_type=APPErrorTypes.SERVICE_UNAVAILABLE.value
+        )
+
+
+def verify_password(password: str, encoded: str) -> Tuple[bool, bool]:
+    """
+    Check a password against its hash, on the hashing pool if enabled.
+
+    :param password: The raw password.
+    :param encoded: The stored hash.
+    :return: (is_correct, must_update), must_update when the hash uses another hasher or cost.
+    :raises ApiError: 503 if the hashing pool is saturated.
+    """
+    pool = get_hashing_pool()
+    if pool is None:
+        return _verify_password(password, encoded)
+    return _run_on_pool(pool, _verify_password, password, encoded)
+
+
+def hash_password(password: Optional[str]) -> str:
+    """
+    Hash a password with the preferred hasher, on the hashing pool if enabled.
+
+    :param password: The raw password, None makes an unusable password.
+    :return: The encoded hash.
+    :raises ApiError: 503 if the hashing pool is saturated.
+    """
+    pool = get_hashing_pool()
+    if pool is None:
+        return _make_password(password)
+    return _run_on_pool(pool, _make_password, password)
@@ -0,0 +1,56 @@
+from typing import Optional
+
+from django.conf import settings
+
+from core.cache.backends import CacheBackend, build_cache_backend
+
+
+class OutstandingTokens:
+    """
+    Refresh tokens issued and not used yet, by jti.
+
+    A refresh token is consumed (atomically dropped) when it is rotated, so
+    a second use of the same token is detected as a reuse. A token missing
+    from the store is treated as reused (fail closed): with the local
+    backend every process only knows the tokens it issued, so rotation is
+    refused without CACHE_BACKEND=redis (see core/auth/checks.py).
+
+    Usage:
+    >> outstanding_tokens.add(jti, ttl)
+    >> outstanding_tokens.consume(jti)  # True once, False on reuse
+    """
+
+    def __init__(self, namespace: str, max_size: int = 100000):
+        self.namespace = namespace
+        self.max_size = max_size
+        self._backend: Optional[CacheBackend] = None
+
+    @property
+    def backend(self) -> CacheBackend:
+        # built lazily so settings are fully loaded before picking the backend
+        if self._backend is None:
+            self._backend = build_cache_backend(max_size=self.max_size)
+        return self._backend
+
+    @property
+    def ttl(self) -> int:
+        return int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds())
+
+    def key(self, jti: str) -> str:
+        return f"{self.namespace}:{jti}"
+
+    def add(self, jti: str) -> None:
+        """
+        :param jti: jti of the refresh token just issued
+        """
+        self.backend.set(self.key(jti), True, self.ttl)
+
+    def consume(self, jti: str) -> bool:
+        """
+        :param jti: jti of the refresh token being rotated
+        :return: False if the token was already used, or is unknown to the store.
+        """
+        return self.backend.pop(self.key(jti)) is not None
+
+
+outstanding_tokens = OutstandingTokens(namespace="outstanding_tokens")
@@ -0,0 +1,261 @@
+import json
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+
+from core.auth.claims import FAMILY_CLAIM
+from core.enums.enums import USER_STATUS
+
+logger = logging.getLogger(__name__)
+
+# reason of tokens revoked on their own (jti), with their family, or issued before a password change
+REVOKED = "revoked"
+
+
+class Denylist:
+    """
+    Revoked keys with a value and an expiry, checked in memory.
+
+    Every process keeps the entries in a dict, so a check is a dict lookup.
+    With CACHE_BACKEND=redis every entry is also written to its own redis
+    key (JSON, expiring with the entry) and its key appended to a change
+    stream. A process reads the changes made since its last sync, at most
+    every `sync_interval` seconds, and fetches only the changed keys, so
+    revocations made by other processes apply within that interval.
+
+    Usage:
+    >> denylist.add("jti:abc", "revoked", ttl=3600)
+    >> denylist.get("jti:abc")  # "revoked"
+    """
+
+    def __init__(self, namespace: str, max_changes: int = 100000, prune_interval: float = 60):
+        self.namespace = namespace
+        self.changes_key = f"{namespace}:changes"
+        self.max_changes = max_changes
+        self.prune_interval = prune_interval
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        self._client = None
+        self._client_ready = False
+        self._last_change = None
+        self._next_sync = 0.0
+        self._next_prune = 0.0
+
+    @property
+    def client(self):
+        # built lazily so settings are fully loaded before picking the backend
+        if not self._client_ready:
+            if getattr(settings, "CACHE_BACKEND", "local") == "redis":
+                # redis is only required when the redis backend is selected
+                import redis
+
+                self._client = redis.Redis.from_url(settings.CACHE_REDIS_URL)
+            self._client_ready = True
+        return self._client
+
+    def entry_key(self, key: str) -> str:
+        return f"{self.namespace}:entry:{key}"
+
+    def add(self, key: str, value: Any, ttl: float) -> None:
+        """
+        :param key: the revoked key
+        :param value: value returned by get, JSON serializable (tuples come back as tuples)
+        :param ttl: seconds to keep the entry
+        """
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+        if self.client is not None:
+            pipe = self.client.pipeline()
+            pipe.set(self.entry_key(key), json.dumps([value, expires_at]), ex=max(1, math.ceil(ttl)))
+            pipe.xadd(self.changes_key, {"key": key}, maxlen=self.max_changes, approximate=True)
+            pipe.execute()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        :param key: the key to check
+        :return: the value of the entry, or None if the key is not revoked.
+        """
+        self._sync()
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + settings.REVOCATION_SYNC_INTERVAL
+        if now >= self._next_prune:
+            self._next_prune = now + self.prune_interval
+            wall_time = time.time()
+            with self._lock:
+                self._entries = {key: entry for key, entry in self._entries.items() if entry[1] > wall_time}
+        if self.client is None:
+            return
+
+        try:
+            if self._last_change is None:
+                self._load()
+                return
+            changes = self.client.xread({self.changes_key: self._last_change}, count=self.max_changes)
+            changes = changes[0][1] if changes else []
+            if len(changes) >= self.max_changes:
+                # fell behind, older changes may have been trimmed from the stream
+                self._load()
+                return
+            if changes:
+                keys = list({fields[b"key"].decode() for _, fields in changes})
+                self._apply(keys, self.client.mget([self.entry_key(key) for key in keys]))
+                self._last_change = changes[-1][0]
+        except Exception as e:
+            # keep checking against the entries already loaded
+            logger.warning(f"Could not sync the revocation denylist: {str(e)}")
+
+    def _load(self) -> None:
+        """
+        Load every entry, from the last change on: changes made while
+        loading are read again on the next sync.
+        """
+        last = self.client.xrevrange(self.changes_key, count=1)
+        last_change = last[0][0] if last else b"0-0"
+        prefix = self.entry_key("")
+        entries = {}
+        names = list(self.client.scan_iter(match=f"{prefix}*", count=1000))
+        for start in range(0, len(names), 1000):
+            batch = names[start:start + 1000]
+            for name, raw in zip(batch, self.client.mget(batch)):
+                entry = self._decode(raw)
+                if entry is not None:
+                    entries[name.decode()[len(prefix):]] = entry
+        with self._lock:
+            self._entries = entries
+            self._last_change = last_change
+
+    def _apply(self, keys: List[str], raws: List[Optional[bytes]]) -> None:
+        with self._lock:
+            for key, raw in zip(keys, raws):
+                entry = self._decode(raw)
+                if entry is None:
+                    # expired or cleared
+                    self._entries.pop(key, None)
+                else:
+                    self._entries[key] = entry
+
+    @staticmethod
+    def _decode(raw: Optional[bytes]) -> Optional[Tuple[Any, float]]:
+        if raw is None:
+            return None
+        value, expires_at = json.loads(raw)
+        if isinstance(value, list):
+            value = tuple(value)
+        return value, expires_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+        if self.client is not None:
+            names = list(self.client.scan_iter(match=f"{self.entry_key('')}*", count=1000))
+            self.client.delete(self.changes_key, *names)
+            self._last_change = None
+
+
+denylist = Denylist(namespace="revocations")
+
+
+def token_lifetime() -> float:
+    """
+    Seconds the longest living token issued now stays valid.
+    """
+    return settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()
+
+
+def user_key(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def jti_key(jti: str) -> str:
+    return f"jti:{jti}"
+
+
+def family_key(family: str) -> str:
+    return f"family:{family}"
+
+
+def revoke_user_tokens(user, status: str = None) -> None:
+    """
+    Revoke every token issued to a user so far, on block, deactivation or
+    password change. Tokens issued afterwards are accepted while the status
+    is active.
+
+    :param user: UserEntity
+    :param status: USER_STATUS value, defaults to the current status of the user.
+    """
+    status = status or USER_STATUS.for_user(user)
+    denylist.add(user_key(user.pk), (status, time.time()), token_lifetime())
+
+
+def sync_user_revocation(user) -> None:
+    """
+    Revoke the tokens of a user who lost access, or record that the user got
+    access back (tokens issued before the revocation stay revoked).
+
+    :param user: UserEntity
+    """
+    status = USER_STATUS.for_user(user)
+    entry = denylist.get(user_key(user.pk))
+    if entry is not None and entry[0] == status:
+        return
+    if status != USER_STATUS.ACTIVE.value[0]:
+        revoke_user_tokens(user, status)
+    elif entry is not None:
+        denylist.add(user_key(user.pk), (status, entry[1]), token_lifetime())
+
+
+def revoke_token(payload: Dict[str, Any]) -> None:
+    """
+    Revoke a single token until it expires.
+
+    :param payload: the verified token payload
+    """
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0:
+        denylist.add(jti_key(payload[api_settings.JTI_CLAIM]), REVOKED, ttl)
+
+
+def revoke_token_family(family: str) -> None:
+    """
+    Revoke every token rotated from the same login, on refresh token reuse.
+
+    :param family: the family claim of the tokens
+    """
+    denylist.add(family_key(family), REVOKED, token_lifetime())
+
+
+def revocation_reason(payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Why a verified token may no longer be used.
+
+    :param payload: the verified token payload
+    :return: a USER_STATUS value or REVOKED, None if the token is valid.
+    """
+    if denylist.get(jti_key(payload.get(api_settings.JTI_CLAIM))) is not None:
+        return REVOKED
+    family = payload.get(FAMILY_CLAIM)
+    if family is not None and denylist.get(family_key(family)) is not None:
+        return REVOKED
+    entry = denylist.get(user_key(payload.get(api_settings.USER_ID_CLAIM)))
+    if entry is None:
+        return None
+    status, revoked_at = entry
+    if status != USER_STATUS.ACTIVE.value[0]:
+        return status
+    if payload.get("iat", 0) < int(revoked_at):
+        return REVOKED
+    return None
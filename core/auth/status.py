@@ -0,0 +1,36 @@
+from rest_framework import status
+
+from core.common.erro_message_type import APPErrorTypes
+from core.enums.enums import USER_STATUS
+from core.exceptions.base import ApiError
+
+
+def check_user_status(user_status: str):
+    """
+    Raise if the user of a token may no longer use the application.
+
+    :param user_status: USER_STATUS value (status claim or revocation reason), or None.
+    :raises ApiError: If the user is blocked, deactivated, deleted or the token revoked.
+    """
+    if user_status is None or user_status == USER_STATUS.ACTIVE.value[0]:
+        return
+    if user_status == USER_STATUS.BLOCKED.value[0]:
+        raise ApiError(
+            errors="sorry your account has been blocked, please contact admin!",
+            status_code=status.HTTP_403_FORBIDDEN,
+            message="account blocked",
+            error_type=APPErrorTypes.USER_BLOCKED.value
+        )
+    if user_status == USER_STATUS.DEACTIVATED.value[0]:
+        raise ApiError(
+            errors="sorry your account has been deactivated, please contact admin!",
+            status_code=status.HTTP_403_FORBIDDEN,
+            message="account deactivated",
+            error_type=APPErrorTypes.USER_DEACTIVATED.value
+        )
+    raise ApiError(
+        errors="Token has been revoked.",
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        message="login required",
+        error_type=APPErrorTypes.UNAUTHORIZED_ACCESS.value
+    )
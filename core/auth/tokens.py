@@ -0,0 +1,75 @@
+import uuid
+from typing import Any, Dict
+
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from core.auth.claims import FAMILY_CLAIM, ROLE_CLAIM, STATUS_CLAIM
+from core.auth.outstanding import outstanding_tokens
+from core.enums.enums import USER_STATUS
+
+
+def user_claims(user) -> Dict[str, Any]:
+    """
+    Claims describing the user, so authorization can read them from the
+    verified token instead of loading the user row.
+
+    :param user: UserEntity
+    :return: Dict[str, Any]
+    """
+    return {ROLE_CLAIM: user.role, STATUS_CLAIM: USER_STATUS.for_user(user)}
+
+
+class UserAccessToken(AccessToken):
+    """
+    Access token carrying the role and status claims of the user.
+    """
+
+    @classmethod
+    def for_user(cls, user) -> "UserAccessToken":
+        token = super().for_user(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the role and status claims of the user, the
+    access tokens derived from it (`.access_token`) copy them.
+
+    With ROTATE_REFRESH_TOKENS every refresh token issued is registered as
+    outstanding, it can be rotated once (see `rotate`).
+
+    Usage:
+    >> refresh_token = UserRefreshToken.for_user(user)
+    >> str(refresh_token), str(refresh_token.access_token)
+    """
+    access_token_class = UserAccessToken
+
+    @classmethod
+    def for_user(cls, user) -> "UserRefreshToken":
+        token = super().for_user(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        # a new family per login, kept by every rotation
+        token[FAMILY_CLAIM] = uuid.uuid4().hex
+        if settings.SIMPLE_JWT.get("ROTATE_REFRESH_TOKENS"):
+            outstanding_tokens.add(token[api_settings.JTI_CLAIM])
+        return token
+
+    def rotate(self, claims: Dict[str, Any]) -> None:
+        """
+        Turn this token into its successor: new jti, expiry and issue time,
+        with up to date user claims, registered as outstanding.
+
+        :param claims: user claims, see user_claims.
+        """
+        for claim, value in claims.items():
+            self[claim] = value
+        self.payload.setdefault(FAMILY_CLAIM, uuid.uuid4().hex)
+        self.set_jti()
+        self.set_exp()
+        self.set_iat()
+        outstanding_tokens.add(self[api_settings.JTI_CLAIM])
@@ -0,0 +1,88 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import (ExpiredTokenError, TokenBackendError,
+                                                 TokenBackendExpiredToken, TokenError)
+from rest_framework_simplejwt.settings import api_settings
+
+from core.cache.backends import LocalLRUCache
+
+
+class TokenVerifier:
+    """
+    Verifies the tokens issued by simplejwt.
+
+    It decodes with simplejwt's prebuilt TokenBackend, so keys, algorithm,
+    audience, issuer and leeway all come from SIMPLE_JWT and the issuing and
+    verifying sides cannot drift. Verified tokens are remembered in a bounded
+    LRU until they expire, a token presented again costs a dict lookup
+    instead of a signature check.
+
+    Usage:
+    >> payload = get_token_verifier().verify(token)  # raises TokenError
+    """
+
+    def __init__(self, backend: TokenBackend, token_type: str, max_size: int):
+        self.backend = backend
+        self.token_type = token_type
+        self.leeway = backend.get_leeway().total_seconds()
+        self._verified = LocalLRUCache(max_size=max_size)
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        :param token: the encoded token
+        :return: the token payload
+        :raises ExpiredTokenError: if the token has expired.
+        :raises TokenError: if the token is malformed, forged or not a `token_type` token.
+        """
+        payload = self._verified.get(token)
+        if payload is not None:
+            return dict(payload)
+
+        try:
+            payload = self.backend.decode(token, verify=True)
+        except TokenBackendExpiredToken as error:
+            raise ExpiredTokenError("Token has expired.") from error
+        except TokenBackendError as error:
+            raise TokenError("Invalid token.") from error
+
+        if payload.get(api_settings.TOKEN_TYPE_CLAIM) != self.token_type \
+                or api_settings.USER_ID_CLAIM not in payload:
+            raise TokenError("Invalid token.")
+
+        # remembered until the token expires, the LRU evicts the oldest first
+        expires_in = payload.get("exp", 0) + self.leeway - time.time()
+        if expires_in > 0:
+            self._verified.set(token, payload, expires_in)
+        return dict(payload)
+
+    def clear(self) -> None:
+        self._verified.clear()
+
+
+_verifier: Optional[TokenVerifier] = None
+_verifier_lock = threading.Lock()
+
+
+def get_token_verifier() -> TokenVerifier:
+    """
+    Return the process wide access token verifier.
+
+    :return: TokenVerifier
+    """
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                # imported here, simplejwt builds the backend from settings on import
+                from rest_framework_simplejwt.state import token_backend
+
+                _verifier = TokenVerifier(
+                    backend=token_backend,
+                    token_type="access",
+                    max_size=settings.TOKEN_VERIFY_CACHE_SIZE,
+                )
+    return _verifier
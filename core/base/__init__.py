@@ -2,3 +2,4 @@ from .base_repository import BaseRepository
 from .base_service import BaseService
 from .base_view import BaseView
 from .result_to_dict import BaseResult
+from .compiled_serializer import CompiledSerializer
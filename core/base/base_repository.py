@@ -1,5 +1,14 @@
-from typing import TypeVar, Generic, Type, List, Optional
+from datetime import datetime
+from typing import TypeVar, Generic, Type, List, Optional, Iterable, Any, Dict, Union
+
+from django.conf import settings
 from django.db.models import Model
+from django.utils import timezone
+from rest_framework import status
+
+from core.common.erro_message_type import APPErrorTypes
+from core.enums.enums import UPDATE_MODE
+from core.exceptions.base import ApiError
 
 # Define a TypeVar for the entity
 T = TypeVar('T', bound=Model)
@@ -57,21 +66,119 @@ class BaseRepository(Generic[T]):
         return entity
 
     @classmethod
-    def update(cls, entity_id: int, **kwargs) -> Optional[T]:
+    def update(cls, entity_id: int, instance: Optional[T] = None,
+               mode: UPDATE_MODE = UPDATE_MODE.FIELDS,
+               expected_updated_at: Optional[datetime] = None, **kwargs) -> Optional[T]:
         """
         Updates an existing instance of the model by its ID with the provided data.
 
+        - UPDATE_MODE.SAVE saves every column, like `entity.save()`.
+        - UPDATE_MODE.FIELDS (default) saves only the updated columns (and the
+          auto_now ones), so concurrent writes to other columns are kept.
+        - UPDATE_MODE.QUERY runs a single UPDATE ... WHERE pk without loading
+          the entity.
+
+        Callers already holding the entity pass it as `instance`, which skips
+        the re-fetch. With `expected_updated_at` the update is optimistic: it
+        is written with a conditional UPDATE that only matches while the row
+        still has that `updated_at`, and a 409 conflict is raised otherwise.
+
+        SAVE and FIELDS send post_save. Queryset updates (QUERY mode and
+        optimistic updates) do not, `after_update` is called instead.
+
         :param entity_id: The primary key (ID) of the model instance to update.
+        :param instance: The model instance, if already loaded.
+        :param mode: UPDATE_MODE - How the update is written.
+        :param expected_updated_at: The `updated_at` the caller read, for optimistic updates.
         :param kwargs: Fields and their new values to update in the instance.
         :return: The updated instance, or None if the instance was not found.
+                 In QUERY mode, without `instance`, a partial instance holding
+                 only the primary key and the updated fields.
+        :raise: ApiError Conflict when `expected_updated_at` no longer matches.
         """
-        entity = cls.find_one_by_id(entity_id)
+        if mode == UPDATE_MODE.QUERY or expected_updated_at is not None:
+            return cls.update_by_query(entity_id, instance, expected_updated_at, **kwargs)
+
+        entity = instance if instance is not None else cls.find_one_by_id(entity_id)
         if entity:
             for attr, value in kwargs.items():
                 setattr(entity, attr, value)
-            entity.save()
+            if mode == UPDATE_MODE.SAVE:
+                entity.save()
+            else:
+                entity.save(update_fields=[*kwargs, *cls.auto_now_fields()])
         return entity
 
+    @classmethod
+    def update_by_query(cls, entity_id: int, instance: Optional[T] = None,
+                        expected_updated_at: Optional[datetime] = None, **kwargs) -> Optional[T]:
+        """
+        Write an update with a single UPDATE ... WHERE pk (and updated_at,
+        for optimistic updates). See `update`.
+
+        :param entity_id: The primary key (ID) of the model instance to update.
+        :param instance: The model instance, if already loaded, updated in memory too.
+        :param expected_updated_at: The `updated_at` the caller read, for optimistic updates.
+        :param kwargs: Fields and their new values.
+        :return: The updated (or partial) instance, or None if the instance was not found.
+        :raise: ApiError Conflict when `expected_updated_at` no longer matches.
+        """
+        values: Dict[str, Any] = dict(kwargs)
+        now = timezone.now()
+        for name in cls.auto_now_fields():
+            values.setdefault(name, now)
+
+        queryset = cls.model.objects.filter(pk=entity_id)
+        if expected_updated_at is not None:
+            updated = queryset.filter(updated_at=expected_updated_at).update(**values)
+            if not updated and queryset.exists():
+                raise ApiError(
+                    errors="The resource was modified by another request.",
+                    status_code=status.HTTP_409_CONFLICT,
+                    message="conflict",
+                    error_type=APPErrorTypes.CONFLICT.value
+                )
+        else:
+            updated = queryset.update(**values)
+        if not updated:
+            return None
+
+        entity = instance if instance is not None else cls.model(pk=entity_id)
+        for attr, value in values.items():
+            setattr(entity, attr, value)
+        cls.after_update(entity_id, instance, set(kwargs))
+        return entity
+
+    @classmethod
+    def after_update(cls, entity_id: int, instance: Optional[T], fields: Iterable[str]) -> None:
+        """
+        Called after a queryset update, which sends no post_save. Repositories
+        whose models have post_save receivers (caches, ...) override it.
+
+        :param entity_id: The primary key (ID) of the updated instance.
+        :param instance: The instance passed to the update, if any.
+        :param fields: The updated fields.
+        """
+
+    @classmethod
+    def after_bulk_update(cls, entity_ids: List[Any], fields: Iterable[str],
+                          instances: Optional[List[T]] = None) -> None:
+        """
+        Called after `bulk_update` and `update_where`, which send no post_save.
+        Same as `after_update`, for many instances.
+
+        :param entity_ids: The primary keys (IDs) of the updated instances.
+        :param fields: The updated fields.
+        :param instances: The updated instances, passed by `bulk_update` (None for `update_where`).
+        """
+
+    @classmethod
+    def auto_now_fields(cls) -> List[str]:
+        """
+        :return: The names of the auto_now fields of the model (e.g. updated_at).
+        """
+        return [field.name for field in cls.model._meta.concrete_fields if getattr(field, "auto_now", False)]
+
     @classmethod
     def delete(cls, entity_id: int) -> bool:
         """
@@ -85,3 +192,127 @@ class BaseRepository(Generic[T]):
             entity.delete()
             return True
         return False
+
+    @classmethod
+    def find_by_ids(cls, entity_ids: Iterable[Any], batch_size: Optional[int] = None) -> Dict[Any, T]:
+        """
+        Retrieves many instances of the model by their IDs, one query per batch.
+
+        :param entity_ids: The primary keys (IDs) to look up.
+        :param batch_size: IDs per query, defaults to settings.BULK_BATCH_SIZE.
+        :return: The instances found, keyed by ID. Missing IDs are left out.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        entities: Dict[Any, T] = {}
+        for chunk in cls.chunks(entity_ids, batch_size):
+            entities.update(cls.model.objects.in_bulk(chunk))
+        return entities
+
+    @classmethod
+    def bulk_create(cls, entities: Iterable[Union[T, Dict[str, Any]]],
+                    batch_size: Optional[int] = None) -> List[T]:
+        """
+        Creates many instances of the model, with one INSERT per batch.
+
+        No post_save signal is sent, repositories needing one publish their
+        own event (see UserRepository.bulk_create_users).
+
+        :param entities: Model instances, or dicts of their fields.
+        :param batch_size: Rows per INSERT, defaults to settings.BULK_BATCH_SIZE.
+        :return: The created instances (the number created is their length).
+        """
+        entities = [entity if isinstance(entity, Model) else cls.model(**entity) for entity in entities]
+        return cls.model.objects.bulk_create(entities, batch_size=cls.resolve_batch_size(batch_size))
+
+    @classmethod
+    def bulk_update(cls, entities: Iterable[T], fields: Iterable[str],
+                    batch_size: Optional[int] = None) -> int:
+        """
+        Writes the given fields of many instances, with one UPDATE ... CASE
+        per batch. The auto_now fields are written too.
+
+        :param entities: The model instances, holding their new values.
+        :param fields: The fields to write.
+        :param batch_size: Rows per UPDATE, defaults to settings.BULK_BATCH_SIZE.
+        :return: The number of rows updated.
+        """
+        entities = list(entities)
+        fields = list(fields)
+        if not entities or not fields:
+            return 0
+        auto_now_fields = cls.auto_now_fields()
+        now = timezone.now()
+        for entity in entities:
+            for name in auto_now_fields:
+                setattr(entity, name, now)
+        updated = cls.model.objects.bulk_update(
+            entities, [*fields, *auto_now_fields], batch_size=cls.resolve_batch_size(batch_size)
+        )
+        cls.after_bulk_update([entity.pk for entity in entities], fields, entities)
+        return updated
+
+    @classmethod
+    def update_where(cls, values: Dict[str, Any], batch_size: Optional[int] = None, **kwargs) -> int:
+        """
+        Updates every instance matching the filters with the same values.
+
+        The matching IDs are read first and updated with one
+        UPDATE ... WHERE id IN (...) per batch, so large updates do not hold
+        locks on the whole set at once. Rows matching only after the IDs are
+        read are not updated.
+
+        :param values: Fields and their new values.
+        :param batch_size: Rows per UPDATE, defaults to settings.BULK_BATCH_SIZE.
+        :param kwargs: Query parameters to filter the model instances.
+        :return: The number of rows updated.
+        """
+        if not values:
+            return 0
+        values = dict(values)
+        now = timezone.now()
+        for name in cls.auto_now_fields():
+            values.setdefault(name, now)
+
+        queryset = cls.model.objects.filter(**kwargs)
+        entity_ids = list(queryset.values_list("pk", flat=True))
+        updated = 0
+        for chunk in cls.chunks(entity_ids, batch_size):
+            updated += queryset.filter(pk__in=chunk).update(**values)
+        if entity_ids:
+            cls.after_bulk_update(entity_ids, values.keys())
+        return updated
+
+    @classmethod
+    def delete_where(cls, batch_size: Optional[int] = None, **kwargs) -> int:
+        """
+        Deletes every instance matching the filters, one batch of IDs at a
+        time. post_delete is sent for every instance, as with `delete`.
+
+        :param batch_size: Rows per DELETE, defaults to settings.BULK_BATCH_SIZE.
+        :param kwargs: Query parameters to filter the model instances.
+        :return: The number of instances of the model deleted (cascades excluded).
+        """
+        queryset = cls.model.objects.filter(**kwargs)
+        entity_ids = list(queryset.values_list("pk", flat=True))
+        deleted = 0
+        for chunk in cls.chunks(entity_ids, batch_size):
+            _, per_model = queryset.filter(pk__in=chunk).delete()
+            deleted += per_model.get(cls.model._meta.label, 0)
+        return deleted
+
+    @staticmethod
+    def resolve_batch_size(batch_size: Optional[int] = None) -> int:
+        """
+        :param batch_size: The batch size requested by the caller, if any.
+        :return: The batch size to use.
+        """
+        return batch_size or settings.BULK_BATCH_SIZE
+
+    @classmethod
+    def chunks(cls, items: List[Any], batch_size: Optional[int] = None) -> Iterable[List[Any]]:
+        """
+        Split `items` into lists of at most `batch_size` items.
+        """
+        size = cls.resolve_batch_size(batch_size)
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
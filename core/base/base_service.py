@@ -1,5 +1,7 @@
-from typing import TypeVar, Generic, Type, List, Optional
+from datetime import datetime
+from typing import TypeVar, Generic, Type, List, Optional, Iterable, Any, Dict, Union
 from core.base.base_repository import BaseRepository
+from core.enums.enums import UPDATE_MODE
 from django.db.models import Model
 
 # Use the same TypeVar for the service
@@ -58,15 +60,23 @@ class BaseService(Generic[T]):
         return cls.repository.create(**kwargs)
 
     @classmethod
-    def update(cls, entity_id: int, **kwargs) -> Optional[T]:
+    def update(cls, entity_id: int, instance: Optional[T] = None,
+               mode: UPDATE_MODE = UPDATE_MODE.FIELDS,
+               expected_updated_at: Optional[datetime] = None, **kwargs) -> Optional[T]:
         """
         Updates an existing instance of the model by its ID via the repository.
+        See BaseRepository.update for the update modes.
 
         :param entity_id: The primary key (ID) of the model instance to update.
+        :param instance: The model instance, if already loaded (skips the re-fetch).
+        :param mode: UPDATE_MODE - How the update is written.
+        :param expected_updated_at: The `updated_at` the caller read, for optimistic updates.
         :param kwargs: Fields and their new values to update in the instance.
         :return: The updated instance, or None if the instance was not found.
         """
-        return cls.repository.update(entity_id, **kwargs)
+        return cls.repository.update(
+            entity_id, instance=instance, mode=mode, expected_updated_at=expected_updated_at, **kwargs
+        )
 
     @classmethod
     def delete(cls, entity_id: int) -> bool:
@@ -77,3 +87,62 @@ class BaseService(Generic[T]):
         :return: True if the instance was found and deleted, False otherwise.
         """
         return cls.repository.delete(entity_id)
+
+    @classmethod
+    def find_by_ids(cls, entity_ids: Iterable[Any], batch_size: Optional[int] = None) -> Dict[Any, T]:
+        """
+        Retrieves many instances of the model by their IDs via the repository.
+
+        :param entity_ids: The primary keys (IDs) to look up.
+        :param batch_size: IDs per query, defaults to settings.BULK_BATCH_SIZE.
+        :return: The instances found, keyed by ID.
+        """
+        return cls.repository.find_by_ids(entity_ids, batch_size=batch_size)
+
+    @classmethod
+    def bulk_create(cls, entities: Iterable[Union[T, Dict[str, Any]]],
+                    batch_size: Optional[int] = None) -> List[T]:
+        """
+        Creates many instances of the model via the repository, one INSERT per batch.
+
+        :param entities: Model instances, or dicts of their fields.
+        :param batch_size: Rows per INSERT, defaults to settings.BULK_BATCH_SIZE.
+        :return: The created instances.
+        """
+        return cls.repository.bulk_create(entities, batch_size=batch_size)
+
+    @classmethod
+    def bulk_update(cls, entities: Iterable[T], fields: Iterable[str],
+                    batch_size: Optional[int] = None) -> int:
+        """
+        Writes the given fields of many instances via the repository.
+
+        :param entities: The model instances, holding their new values.
+        :param fields: The fields to write.
+        :param batch_size: Rows per UPDATE, defaults to settings.BULK_BATCH_SIZE.
+        :return: The number of rows updated.
+        """
+        return cls.repository.bulk_update(entities, fields, batch_size=batch_size)
+
+    @classmethod
+    def update_where(cls, values: Dict[str, Any], batch_size: Optional[int] = None, **kwargs) -> int:
+        """
+        Updates every instance matching the filters via the repository.
+
+        :param values: Fields and their new values.
+        :param batch_size: Rows per UPDATE, defaults to settings.BULK_BATCH_SIZE.
+        :param kwargs: Query parameters to filter the model instances.
+        :return: The number of rows updated.
+        """
+        return cls.repository.update_where(values, batch_size=batch_size, **kwargs)
+
+    @classmethod
+    def delete_where(cls, batch_size: Optional[int] = None, **kwargs) -> int:
+        """
+        Deletes every instance matching the filters via the repository.
+
+        :param batch_size: Rows per DELETE, defaults to settings.BULK_BATCH_SIZE.
+        :param kwargs: Query parameters to filter the model instances.
+        :return: The number of instances deleted.
+        """
+        return cls.repository.delete_where(batch_size=batch_size, **kwargs)
@@ -0,0 +1,268 @@
+import threading
+from datetime import timezone as dt_timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, fields as drf_fields
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.serializers import BaseSerializer, ModelSerializer
+from rest_framework.settings import api_settings
+
+_SKIP = object()  # value of a fallback field raising SkipField, dropped from the output
+
+
+def datetime_formatter(field: drf_fields.DateTimeField) -> Callable[[Any], Any]:
+    """
+    Formatter doing what `DateTimeField.to_representation` does: convert to
+    the field (or current) timezone and render DATETIME_FORMAT, ISO 8601
+    with 'Z' for UTC by default.
+    """
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = getattr(field, "timezone", None)
+
+    def format_datetime(value):
+        if not value:
+            return None
+        if output_format is None or isinstance(value, str):
+            return value
+        target = field_timezone if field_timezone is not None else (
+            timezone.get_current_timezone() if settings.USE_TZ else None
+        )
+        if target is not None:
+            value = value.astimezone(target) if timezone.is_aware(value) else timezone.make_aware(value, target)
+        elif timezone.is_aware(value):
+            value = timezone.make_naive(value, dt_timezone.utc)
+        if output_format.lower() != ISO_8601:
+            return value.strftime(output_format)
+        value = value.isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+def date_formatter(field: drf_fields.DateField) -> Callable[[Any], Any]:
+    """
+    Formatter doing what `DateField.to_representation` does.
+    """
+    output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+    if output_format is None:
+        return field.to_representation
+
+    def format_date(value):
+        if not value:
+            return None
+        if isinstance(value, str):
+            return value
+        if output_format.lower() == ISO_8601:
+            return value.isoformat()
+        return value.strftime(output_format)
+
+    return format_date
+
+
+# DRF `to_representation` -> formatter factory, matched on the method so
+# subclasses overriding it (custom fields) fall back to the DRF field
+FORMATTERS: Dict[Callable, Callable[[drf_fields.Field], Optional[Callable[[Any], Any]]]] = {
+    drf_fields.CharField.to_representation: lambda field: str,
+    drf_fields.IntegerField.to_representation: lambda field: int,
+    drf_fields.FloatField.to_representation: lambda field: float,
+    drf_fields.DateTimeField.to_representation: datetime_formatter,
+    drf_fields.DateField.to_representation: date_formatter,
+}
+
+
+class CompiledSerializer:
+    """
+    Read-only serializer generated from a DRF serializer class.
+
+    The field map of the serializer is read once, and a function
+    specialized for it is generated (plain attribute reads and one formatter
+    per field, e.g. datetime isoformat), so serializing an instance does not
+    go through `to_representation` field by field. The output is identical
+    to `serializer_class(instance).data`.
+
+    Fields whose source is a concrete model column and whose type has a
+    formatter (see FORMATTERS) are inlined. Any other field (relations,
+    method fields, custom fields, dotted sources) falls back to its DRF
+    `get_attribute` / `to_representation`.
+
+    The serializer is compiled on first use, once apps are ready, and the
+    functions for value rows (QuerySet.values()) are compiled once per
+    field set.
+
+    Usage:
+    >> compiled_user_serializer = CompiledSerializer(UserSerializer)
+    >> compiled_user_serializer(instance=user).data
+    >> compiled_user_serializer(instance=users, many=True).data
+    >> compiled_user_serializer.serialize_rows(queryset.values(...), fields=("id", "email"))
+    """
+
+    def __init__(self, serializer_class: Type[BaseSerializer]):
+        self.serializer_class = serializer_class
+        self._lock = threading.Lock()
+        self._columns: Optional[List[Tuple[str, Optional[str], Callable, Any]]] = None
+        self._serialize: Optional[Callable[[Any], Dict[str, Any]]] = None
+        self._row_functions: Dict[Tuple[str, ...], Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+        self.source: Optional[str] = None  # generated code, for debugging
+
+    def __call__(self, instance: Any = None, many: bool = False) -> "CompiledData":
+        """
+        Drop-in replacement of `serializer_class(instance=..., many=...)` for read-only use.
+        """
+        return CompiledData(self, instance, many)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        :return: The output keys, in the serializer order.
+        """
+        self._compile()
+        return tuple(key for key, _, _, _ in self._columns)
+
+    def serialize(self, instance: Any) -> Dict[str, Any]:
+        """
+        :param instance: The object to serialize.
+        :return: The same dict as `serializer_class(instance).data`.
+        """
+        self._compile()
+        return self._serialize(instance)
+
+    def serialize_many(self, instances: Iterable[Any]) -> List[Dict[str, Any]]:
+        self._compile()
+        return list(map(self._serialize, instances))
+
+    def row_function(self, fields: Optional[Sequence[str]] = None) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Function serializing value rows holding (at least) the source column
+        of every field of `fields`, keys in `fields` order.
+
+        :param fields: The output keys, all of them by default.
+        :return: Callable[[dict], dict]
+        :raise: ValueError for unknown fields or fields not read from a column.
+        """
+        self._compile()
+        fields = tuple(fields) if fields else self.fields
+        function = self._row_functions.get(fields)
+        if function is None:
+            with self._lock:
+                function = self._row_functions.get(fields)
+                if function is None:
+                    function = self._compile_rows(fields)
+                    self._row_functions[fields] = function
+        return function
+
+    def serialize_rows(self, rows: Iterable[Dict[str, Any]],
+                       fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        return list(map(self.row_function(fields), rows))
+
+    def _compile(self) -> None:
+        if self._serialize is not None:
+            return
+        with self._lock:
+            if self._serialize is None:
+                self._columns = self._build_columns()
+                self._serialize = self._compile_instances()
+
+    def _build_columns(self) -> List[Tuple[str, Optional[str], Callable, Any]]:
+        """
+        :return: (output key, source column or None, formatter, DRF field) per readable field.
+        """
+        serializer = self.serializer_class()
+        model = getattr(getattr(serializer, "Meta", None), "model", None) \
+            if isinstance(serializer, ModelSerializer) else None
+        columns = []
+        for field in serializer._readable_fields:
+            source = self._source_column(field, model)
+            factory = FORMATTERS.get(type(field).to_representation)
+            formatter = factory(field) if factory is not None else None
+            if source is None or formatter is None:
+                columns.append((field.field_name, None, self._fallback(field), field))
+            else:
+                columns.append((field.field_name, source, formatter, field))
+        return columns
+
+    @staticmethod
+    def _source_column(field: drf_fields.Field, model) -> Optional[str]:
+        if model is None or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not getattr(model_field, "concrete", False) or model_field.is_relation:
+            return None
+        return field.source_attrs[0]
+
+    @staticmethod
+    def _fallback(field: drf_fields.Field) -> Callable[[Any], Any]:
+        # what Serializer.to_representation does for a single field
+        def represent(instance):
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                return _SKIP
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            if check_for_none is None:
+                return None
+            return field.to_representation(attribute)
+
+        return represent
+
+    def _compile_instances(self) -> Callable[[Any], Dict[str, Any]]:
+        namespace: Dict[str, Any] = {"_SKIP": _SKIP}
+        reads, items = [], []
+        for index, (key, source, formatter, _) in enumerate(self._columns):
+            namespace[f"f{index}"] = formatter
+            if source is None:
+                items.append(f"{key!r}: f{index}(instance)")
+            else:
+                reads.append(f"    v{index} = instance.{source}")
+                items.append(f"{key!r}: None if v{index} is None else f{index}(v{index})")
+        body = "\n".join(reads)
+        if any(source is None for _, source, _, _ in self._columns):
+            result = "    data = {%s}\n" \
+                     "    if _SKIP in data.values():\n" \
+                     "        data = {key: value for key, value in data.items() if value is not _SKIP}\n" \
+                     "    return data" % ", ".join(items)
+        else:
+            result = "    return {%s}" % ", ".join(items)
+        self.source = f"def serialize(instance):\n{body}\n{result}\n"
+        exec(compile(self.source, f"<compiled {self.serializer_class.__name__}>", "exec"), namespace)
+        return namespace["serialize"]
+
+    def _compile_rows(self, fields: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        columns = {key: (source, formatter) for key, source, formatter, _ in self._columns}
+        namespace: Dict[str, Any] = {}
+        reads, items = [], []
+        for index, key in enumerate(fields):
+            if key not in columns or columns[key][0] is None:
+                raise ValueError(f"'{key}' can not be serialized from a value row.")
+            source, formatter = columns[key]
+            namespace[f"f{index}"] = formatter
+            reads.append(f"    v{index} = row[{source!r}]")
+            items.append(f"{key!r}: None if v{index} is None else f{index}(v{index})")
+        source_code = "def serialize_row(row):\n%s\n    return {%s}\n" % ("\n".join(reads), ", ".join(items))
+        exec(compile(source_code, f"<compiled {self.serializer_class.__name__} rows>", "exec"), namespace)
+        return namespace["serialize_row"]
+
+
+class CompiledData:
+    """
+    Result of `CompiledSerializer(...)`, serializes lazily on `.data` like DRF serializers.
+    """
+
+    def __init__(self, serializer: CompiledSerializer, instance: Any, many: bool):
+        self.serializer = serializer
+        self.instance = instance
+        self.many = many
+
+    @property
+    def data(self):
+        if self.many:
+            return self.serializer.serialize_many(self.instance)
+        return self.serializer.serialize(self.instance)
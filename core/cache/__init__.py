@@ -0,0 +1,2 @@
+from .backends import CacheBackend, LocalLRUCache, RedisCache, build_cache_backend
+from .model_cache import ModelCache
@@ -0,0 +1,135 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from django.conf import settings
+
+
+class CacheBackend:
+    """
+    Minimal key/value interface shared by the in-process and the redis caches.
+
+    Subclasses store arbitrary picklable values with a time to live (seconds).
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        :param key: cache key
+        :return: the cached value, or None if missing or expired.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """
+        :param key: cache key
+        :param value: value to store
+        :param ttl: time to live in seconds
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """
+        :param key: cache key to drop, missing keys are ignored.
+        """
+        raise NotImplementedError
+
+    def pop(self, key: str) -> Optional[Any]:
+        """
+        Atomically get and drop a key, only one caller gets the value.
+
+        :param key: cache key
+        :return: the cached value, or None if missing or expired.
+        """
+        raise NotImplementedError
+
+
+class LocalLRUCache(CacheBackend):
+    """
+    Thread safe, size bounded LRU cache living in the worker process.
+
+    Entries expire after their ttl, and the least recently used entry is
+    evicted once `max_size` is reached.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.pop(key, None)
+        if item is None or item[1] < time.monotonic():
+            return None
+        return item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis backed cache shared by every worker, values are pickled.
+    """
+
+    def __init__(self, url: str):
+        # redis is only required when the redis backend is selected
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self._client.set(key, pickle.dumps(value), ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def pop(self, key: str) -> Optional[Any]:
+        # GET and DEL in one MULTI/EXEC transaction
+        pipe = self._client.pipeline()
+        pipe.get(key)
+        pipe.delete(key)
+        raw, _ = pipe.execute()
+        return pickle.loads(raw) if raw is not None else None
+
+
+def build_cache_backend(max_size: int = 10000) -> CacheBackend:
+    """
+    Build the cache backend selected by `settings.CACHE_BACKEND`.
+
+    :param max_size: maximum number of entries for the local backend.
+    :return: CacheBackend
+    """
+    if getattr(settings, "CACHE_BACKEND", "local") == "redis":
+        return RedisCache(settings.CACHE_REDIS_URL)
+    return LocalLRUCache(max_size=max_size)
@@ -0,0 +1,79 @@
+from typing import Generic, Optional, Type, TypeVar
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.db.models.fields.files import FieldFile
+
+from core.cache.backends import CacheBackend, build_cache_backend
+
+T = TypeVar('T', bound=Model)
+
+
+class ModelCache(Generic[T]):
+    """
+    Caches model rows by primary key.
+
+    Rows are stored as plain tuples of column values, so every hit builds a
+    fresh instance and callers can never mutate a shared cached object.
+
+    Usage:
+    >> cache = ModelCache(UserEntity, namespace="users", ttl=30)
+    >> cache.set(user)
+    >> cache.get(user.pk)
+    >> cache.invalidate(user.pk)
+    """
+
+    def __init__(self, model: Type[T], namespace: str, ttl: int, max_size: int = 10000):
+        self.model = model
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_size = max_size
+        self._backend: Optional[CacheBackend] = None
+        self._field_names = None
+
+    @property
+    def backend(self) -> CacheBackend:
+        # built lazily so settings are fully loaded before picking the backend
+        if self._backend is None:
+            self._backend = build_cache_backend(max_size=self.max_size)
+        return self._backend
+
+    @property
+    def field_names(self):
+        if self._field_names is None:
+            self._field_names = [field.attname for field in self.model._meta.concrete_fields]
+        return self._field_names
+
+    def key(self, pk) -> str:
+        return f"{self.namespace}:{pk}"
+
+    def get(self, pk) -> Optional[T]:
+        """
+        :param pk: primary key of the row
+        :return: a new model instance built from the cached row, or None.
+        """
+        values = self.backend.get(self.key(pk))
+        if values is None:
+            return None
+        return self.model.from_db(DEFAULT_DB_ALIAS, self.field_names, values)
+
+    def set(self, instance: T) -> None:
+        """
+        :param instance: model instance to cache under its primary key.
+        """
+        values = tuple(self._raw_value(instance, name) for name in self.field_names)
+        self.backend.set(self.key(instance.pk), values, self.ttl)
+
+    @staticmethod
+    def _raw_value(instance: T, name: str):
+        value = getattr(instance, name)
+        # file fields are stored by name, the same way they come from the database
+        if isinstance(value, FieldFile):
+            return value.name
+        return value
+
+    def invalidate(self, pk) -> None:
+        """
+        :param pk: primary key of the row to drop from the cache.
+        """
+        self.backend.delete(self.key(pk))
@@ -22,10 +22,14 @@ class APPErrorTypes(enum.Enum):
     UNHANDLED_ERROR = (4053, "unhandled error")
 
     INVALID_FILE_TYPE = (4060, "invalid file type")
+    FILE_TOO_LARGE = (4061, "file too large")
 
     OPERATION_NOT_ALLOWED = (4070, "operation not allowed")
 
     CONFLICT = (4075, "conflict")
 
+    TOO_MANY_REQUESTS = (4029, "too many requests")
+
     API_NOT_FOUND = (4080, "API not found")
     INTERNAL_SERVER_ERROR = (5001, "internal server error")
+    SERVICE_UNAVAILABLE = (5003, "service unavailable")
@@ -66,3 +66,6 @@ Permissions = {
         'view_assessment_result',  # single assessment
     ],
 }
+
+# Permissions of every role as frozensets, built once for O(1) lookups
+RolePermissions = {role: frozenset(permissions) for role, permissions in Permissions.items()}
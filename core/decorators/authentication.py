@@ -1,9 +1,11 @@
 from functools import wraps
 
-import jwt
-from django.conf import settings
 from rest_framework import status
+from rest_framework_simplejwt.exceptions import ExpiredTokenError, TokenError
 
+from core.auth.revocation import revocation_reason
+from core.auth.status import check_user_status
+from core.auth.verifier import get_token_verifier
 from core.common.erro_message_type import APPErrorTypes
 from core.exceptions.base import ApiError
 
@@ -29,7 +31,7 @@ def login_required(func):
                     errors=[{"message": "Invalid token type."}],
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     message="login required",
-                    type=APPErrorTypes.UNAUTHORIZED_ACCESS.value
+                    error_type=APPErrorTypes.UNAUTHORIZED_ACCESS.value
                 )
         except ValueError as error:
             raise ApiError(
@@ -40,25 +42,28 @@ def login_required(func):
             ) from error
 
         try:
-            # Decode the JWT token without database lookup
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+            # Verify the JWT token without database lookup, with the same
+            # backend that issues the tokens (see core/auth/verifier.py)
+            payload = get_token_verifier().verify(token)
             # Attach the payload (user info) to the request
             request.user_payload = payload  # Instead of request.user
 
-        except jwt.ExpiredSignatureError as error:
+        except ExpiredTokenError as error:
             raise ApiError(
                 errors="Token has expired.",
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 message="login required",
                 error_type=APPErrorTypes.UNAUTHORIZED_ACCESS.value
             ) from error
-        except jwt.InvalidTokenError as error:
+        except TokenError as error:
             raise ApiError(
                 errors="Invalid token.",
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 message="login required",
                 error_type=APPErrorTypes.UNAUTHORIZED_ACCESS.value
             ) from error
+        # Revoked tokens and users who lost access, checked in memory
+        check_user_status(revocation_reason(payload))
         # Proceed to the view with JWT payload attached to the request
         return func(self, request, *args, **kwargs)
 
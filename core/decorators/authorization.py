@@ -1,20 +1,58 @@
 from functools import wraps
-from typing import List
+from typing import FrozenSet, List
 
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 from rest_framework import status
 
 from auth_app.models import UserEntity
+from core.auth.claims import ROLE_CLAIM, STATUS_CLAIM
+from core.auth.status import check_user_status
 from core.common.erro_message_type import APPErrorTypes
-from core.common.permisions import Permissions
+from core.common.permisions import RolePermissions
 from core.decorators.authentication import login_required
-from core.decorators.get_user_from_request import get_user_from_request
+from core.decorators.get_user_from_request import get_request_user, get_user_from_request
 from core.exceptions.base import ApiError
 
 
+def authorized_roles(groups: List[str], permissions: List[str]) -> FrozenSet[str]:
+    """
+    Roles allowed by `groups` and granted at least one of `permissions`.
+
+    Args:
+        groups (List[str]): A list of group names, a name may hold several comma separated roles.
+        permissions (List[str]): A list of permission names.
+
+    Returns:
+        FrozenSet[str]: The authorized roles.
+    """
+    groups = frozenset(",".join(groups).lower().split(","))
+    permissions = frozenset(permissions)
+    return frozenset(
+        role for role, role_permissions in RolePermissions.items()
+        if role.lower() in groups and not permissions.isdisjoint(role_permissions)
+    )
+
+
+def forbidden():
+    return ApiError(
+        errors="Forbidden resource",
+        status_code=status.HTTP_403_FORBIDDEN,
+        message="forbidden resource",
+        error_type=APPErrorTypes.FORBIDDEN_RESOURCE_ACCESS.value
+    )
+
+
 def authorization(groups: List[str], permissions: List[str]):
     """
     Decorator to authorize users based on groups and permissions.
 
+    The roles allowed by the groups and the permissions are resolved once,
+    when the view is decorated. With AUTHORIZATION_MODE 'claims' the role
+    and status are read from the verified token and the user is only loaded
+    if the view uses `request.user`, with 'database' the user is loaded
+    first (tokens issued without the claims always take that path).
+
     Args:
         groups (List[str]): A list of group names to check.
         permissions (List[str]): A list of permission names to check.
@@ -22,29 +60,32 @@ def authorization(groups: List[str], permissions: List[str]):
     Returns:
         Callable: A decorator that wraps the original function.
     """
+    roles = authorized_roles(groups, permissions)
 
     def decorator_func(func):
+        @get_user_from_request
+        def authorize_from_database(self, request, *args, **kwargs):
+            user: UserEntity = request.user
+            # check if user has a role passed to route, with one of the permissions
+            if user.role not in roles:
+                raise forbidden()
+            return func(self, request, *args, **kwargs)
+
         @wraps(func)
         @login_required
-        @get_user_from_request
         def wrapper(self, request, *args, **kwargs):
-            user: UserEntity = request.user
-            # check if user has the role passed to route
-            if user.role.lower() not in ",".join(groups).lower().split(","):
-                raise ApiError(
-                    errors="Forbidden resource",
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    message="forbidden resource",
-                    error_type=APPErrorTypes.FORBIDDEN_RESOURCE_ACCESS.value
-                )
-            # check if user has the permissions passed to route
-            if not any(perm in Permissions[user.role] for perm in permissions):
-                raise ApiError(
-                    errors="Forbidden resource",
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    message="forbidden resource",
-                    error_type=APPErrorTypes.FORBIDDEN_RESOURCE_ACCESS.value
-                )
+            payload = request.user_payload
+            role = payload.get(ROLE_CLAIM)
+            if settings.AUTHORIZATION_MODE != "claims" or role is None:
+                return authorize_from_database(self, request, *args, **kwargs)
+
+            # revoked users were rejected by login_required, the claim covers the rest
+            check_user_status(payload.get(STATUS_CLAIM))
+            # check if user has a role passed to route, with one of the permissions
+            if role not in roles:
+                raise forbidden()
+            # the user row is only loaded if the view reads it
+            request.user = SimpleLazyObject(lambda: get_request_user(request))
             # If all checks pass, call the original function
             return func(self, request, *args, **kwargs)
 
@@ -1,18 +1,34 @@
 # decorators.py
 from rest_framework import generics
 
-from core.utils.paginator import Pagination
+from core.utils.paginator import CursorPagination, Pagination
 
+PAGINATION_CLASSES = {
+    "offset": Pagination,
+    "cursor": CursorPagination,
+}
 
-def paginate_list_view(view_class):
+
+def paginate_list_view(view_class=None, *, mode: str = "offset"):
     """
     Decorator to apply pagination to ListAPIView.
+
+    :param mode: 'offset' (page numbers, Pagination) or 'cursor' (keyset, CursorPagination).
+
+    Usage:
+    >> @paginate_list_view
+    >> @paginate_list_view(mode="cursor")
     """
+    if view_class is None:
+        return lambda cls: paginate_list_view(cls, mode=mode)
+
     # Check if the view class is a subclass of ListAPIView
     if not issubclass(view_class, generics.ListAPIView):
         raise ValueError("The view class must inherit from ListAPIView.")
+    if mode not in PAGINATION_CLASSES:
+        raise ValueError(f"Unknown pagination mode '{mode}'.")
 
     # Set the pagination class
-    view_class.pagination_class = Pagination
+    view_class.pagination_class = PAGINATION_CLASSES[mode]
 
     return view_class
@@ -0,0 +1,57 @@
+from functools import wraps
+
+from django.conf import settings
+from rest_framework import status
+
+from core.common.erro_message_type import APPErrorTypes
+from core.exceptions.base import ApiError
+from core.utils.rate_limit import RateLimiter
+
+
+def client_ip(request) -> str:
+    """
+    The address of the client, taken from X-Forwarded-For when the app runs
+    behind RATE_LIMIT_TRUSTED_PROXIES proxies.
+    """
+    proxies = settings.RATE_LIMIT_TRUSTED_PROXIES
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if proxies and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(",")]
+        return addresses[max(len(addresses) - proxies, 0)]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def rate_limit(scope: str):
+    """
+    Decorator rejecting requests over the limits of `settings.RATE_LIMITS[scope]`,
+    per client IP and per email of the request body, before the view runs.
+
+    Args:
+        scope (str): The key of the endpoint limits in RATE_LIMITS.
+
+    Returns:
+        Callable: A decorator that wraps the original function.
+    """
+    limiter = RateLimiter(scope)
+
+    def decorator_func(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            if settings.RATE_LIMIT_ENABLED:
+                email = request.data.get("email") if hasattr(request.data, "get") else None
+                retry_after = limiter.check(
+                    ip=client_ip(request),
+                    email=email.strip().lower() if isinstance(email, str) else None,
+                )
+                if retry_after is not None:
+                    raise ApiError(
+                        errors=f"Too many requests, please try again in {retry_after} seconds.",
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        message="too many requests",
+                        error_type=APPErrorTypes.TOO_MANY_REQUESTS.value
+                    )
+            return func(self, request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator_func
@@ -99,6 +99,20 @@ class USER_UPDATE_ACTIONS(enum.Enum):
         return [(tag.value, tag.name) for tag in cls]
 
 
+class UPDATE_MODE(enum.Enum):
+    """
+    Enumeration for the ways a repository writes an update.
+
+    Attributes:
+        SAVE: Load the entity and save every column (post_save is sent).
+        FIELDS: Save only the updated columns, save(update_fields=...) (post_save is sent).
+        QUERY: A single UPDATE ... WHERE pk, the entity is not loaded (no post_save).
+    """
+    SAVE = "save"
+    FIELDS = "fields"
+    QUERY = "query"
+
+
 class ACCOUNT_STATUS(enum.Enum):
     """
     Enumeration for representing account statuses.
@@ -125,6 +139,52 @@ class ACCOUNT_STATUS(enum.Enum):
         return [(tag.value[0], tag.value[1]) for tag in cls]
 
 
+class USER_STATUS(enum.Enum):
+    """
+    Enumeration for representing whether a user may use the application,
+    embedded in the access tokens as the `status` claim.
+
+    Attributes:
+        ACTIVE: Represents a user allowed to sign in.
+        BLOCKED: Represents a user blocked by an admin.
+        DEACTIVATED: Represents a deactivated user.
+        DELETED: Represents a deleted user, only used for revocation.
+
+    Methods:
+        choices: Returns a list of tuples containing the
+        user status values and their corresponding labels.
+        for_user: Returns the status value of a user.
+    """
+    ACTIVE = "active", _("Active")
+    BLOCKED = "blocked", _("Blocked")
+    DEACTIVATED = "deactivated", _("Deactivated")
+    DELETED = "deleted", _("Deleted")
+
+    @classmethod
+    def choices(cls):
+        """
+        Returns a list of tuples containing the user
+        status values and their corresponding labels.
+
+        :return: List of tuples [(value, label), ...]
+        """
+        return [(tag.value[0], tag.value[1]) for tag in cls]
+
+    @classmethod
+    def for_user(cls, user) -> str:
+        """
+        Returns the status value of a user, blocked takes precedence.
+
+        :param user: UserEntity
+        :return: str
+        """
+        if user.is_blocked:
+            return cls.BLOCKED.value[0]
+        if user.is_de_activated:
+            return cls.DEACTIVATED.value[0]
+        return cls.ACTIVE.value[0]
+
+
 class SUBSCRIPTION_STATUS(enum.Enum):
     """
     Enumeration for representing subscription statuses.
@@ -0,0 +1,100 @@
+import socketserver
+import threading
+import time
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+
+from pkg.services.email_connection_pool import EmailConnectionPool
+
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """
+    Minimal SMTP server session that accepts and discards every message.
+    """
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 localhost benchmark sink")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="ignore").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 end data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:  # MAIL, RCPT, RSET, NOOP
+                self.reply("250 OK")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Command(BaseCommand):
+    help = 'Benchmark email delivery against a local SMTP stand-in, one connection per message vs pooled batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=500, help="number of messages per run")
+        parser.add_argument("--batch-size", type=int, default=50, help="messages per pooled batch")
+        parser.add_argument("--pool-size", type=int, default=2, help="pooled connections")
+
+    def handle(self, *args, **options):
+        server = SMTPSink(("127.0.0.1", 0), SMTPSinkHandler)
+        host, port = server.server_address
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        messages = [self.build_message(index) for index in range(options["messages"])]
+        try:
+            before = self.run_per_message(messages, host, port)
+            after = self.run_pooled(messages, host, port, options["batch_size"], options["pool_size"])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(f"messages: {len(messages)}")
+        self.stdout.write(f"connection per message: {before:.1f} msg/s")
+        self.stdout.write(f"pooled batches:         {after:.1f} msg/s ({after / before:.1f}x)")
+
+    @staticmethod
+    def build_message(index: int) -> EmailMultiAlternatives:
+        email = EmailMultiAlternatives(
+            "Create Account", f"Complete your account: https://example.com/{index}",
+            from_email="noreply@example.com", to=[f"candidate{index}@example.com"]
+        )
+        email.attach_alternative(f'<a href="https://example.com/{index}">Complete Account</a>', "text/html")
+        return email
+
+    @staticmethod
+    def run_per_message(messages, host, port) -> float:
+        started_at = time.perf_counter()
+        for message in messages:
+            # what EmailMultiAlternatives.send() does without a connection
+            message.connection = get_connection(SMTP_BACKEND, host=host, port=port, fail_silently=False)
+            message.send()
+        return len(messages) / (time.perf_counter() - started_at)
+
+    @staticmethod
+    def run_pooled(messages, host, port, batch_size, pool_size) -> float:
+        for message in messages:
+            message.connection = None
+        pool = EmailConnectionPool(size=pool_size, backend=SMTP_BACKEND, host=host, port=port)
+        started_at = time.perf_counter()
+        for start in range(0, len(messages), batch_size):
+            pool.send_messages(messages[start:start + batch_size])
+        elapsed = time.perf_counter() - started_at
+        pool.close()
+        return len(messages) / elapsed
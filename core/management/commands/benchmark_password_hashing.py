@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.auth.hashers import PBKDF2PasswordHasher
+
+
+class Command(BaseCommand):
+    help = 'Benchmark password hashing cost settings, reports logins per second per core for each'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations", type=int, nargs="+",
+            default=[260000, 600000, 870000, 1200000], help="PBKDF2 iterations to compare"
+        )
+        parser.add_argument("--samples", type=int, default=10, help="password checks per setting")
+
+    def handle(self, *args, **options):
+        hasher = PBKDF2PasswordHasher()
+        salt = hasher.salt()
+        self.stdout.write(f"configured: PASSWORD_HASH_ITERATIONS={settings.PASSWORD_HASH_ITERATIONS}")
+        self.stdout.write(f"{'iterations':>12} {'ms/check':>10} {'logins/s/core':>15}")
+        for iterations in options["iterations"]:
+            encoded = hasher.encode("benchmark-password", salt, iterations)
+            started_at = time.perf_counter()
+            for _ in range(options["samples"]):
+                # a login is one check of the stored hash
+                hasher.verify("benchmark-password", encoded)
+            elapsed = (time.perf_counter() - started_at) / options["samples"]
+            self.stdout.write(f"{iterations:>12} {elapsed * 1000:>10.1f} {1 / elapsed:>15.1f}")
@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from auth_app.models import UserEntity
+from auth_app.serializers.auth import UserSerializer, UserValuesSerializer, compiled_user_serializer
+from core.enums.enums import ROLES
+
+
+class Command(BaseCommand):
+    help = 'Benchmark UserSerializer(...).data against the compiled read-only serializer'
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100, help="users per page")
+        parser.add_argument("--rounds", type=int, default=200, help="pages serialized per run")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        users = [
+            UserEntity(
+                id=index, full_name=f"User {index}", email=f"user{index}@example.com", phone_number="+5511999999999",
+                role=ROLES.CANDIDATE.value[0], created_at=now - timedelta(minutes=index),
+                last_login=now if index % 2 else None,
+            )
+            for index in range(1, options["users"] + 1)
+        ]
+        rows = [{name: getattr(user, name) for name in UserValuesSerializer.FIELDS} for user in users]
+        rounds = options["rounds"]
+        serialized = len(users) * rounds
+
+        if compiled_user_serializer.serialize_many(users) != UserSerializer(instance=users, many=True).data:
+            self.stderr.write("compiled output differs from UserSerializer")
+            return
+
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            for user in users:
+                UserSerializer(instance=user).data
+        single_before = serialized / (time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            for user in users:
+                compiled_user_serializer(instance=user).data
+        single_after = serialized / (time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            UserSerializer(instance=users, many=True).data
+        page_before = serialized / (time.perf_counter() - started_at)
+
+        values_serializer = UserValuesSerializer()
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            values_serializer.serialize_many(rows)
+        page_after = serialized / (time.perf_counter() - started_at)
+
+        self.stdout.write(f"users serialized: {serialized} ({len(users)} per page)")
+        self.stdout.write(f"UserSerializer(user).data:         {single_before:,.0f} users/s")
+        self.stdout.write(f"compiled_user_serializer(user):    {single_after:,.0f} users/s "
+                          f"({single_after / single_before:.1f}x)")
+        self.stdout.write(f"UserSerializer(page, many=True):   {page_before:,.0f} users/s")
+        self.stdout.write(f"UserValuesSerializer (value rows): {page_after:,.0f} users/s "
+                          f"({page_after / page_before:.1f}x)")
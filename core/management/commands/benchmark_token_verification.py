@@ -0,0 +1,44 @@
+import time
+
+import jwt
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from auth_app.models import UserEntity
+from core.auth.tokens import UserRefreshToken
+from core.auth.verifier import TokenVerifier
+from core.enums.enums import ROLES
+
+
+class Command(BaseCommand):
+    help = 'Benchmark access token verification, PyJWT decode per request vs the shared cached verifier'
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=1000, help="number of distinct tokens (users)")
+        parser.add_argument("--requests", type=int, default=20, help="requests per token")
+
+    def handle(self, *args, **options):
+        # the verifier is built from simplejwt settings, imported once apps are ready
+        from rest_framework_simplejwt.state import token_backend
+
+        tokens = [
+            str(UserRefreshToken.for_user(UserEntity(id=index, role=ROLES.COMPANY.value[0])).access_token)
+            for index in range(1, options["tokens"] + 1)
+        ]
+        requests = tokens * options["requests"]
+
+        started_at = time.perf_counter()
+        for token in requests:
+            # what login_required did before
+            jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        before = len(requests) / (time.perf_counter() - started_at)
+
+        verifier = TokenVerifier(backend=token_backend, token_type="access", max_size=len(tokens))
+        started_at = time.perf_counter()
+        for token in requests:
+            verifier.verify(token)
+        after = len(requests) / (time.perf_counter() - started_at)
+
+        self.stdout.write(f"verifications: {len(requests)} ({len(tokens)} tokens)")
+        self.stdout.write(f"pyjwt decode per request: {before:,.0f} verifications/s")
+        self.stdout.write(f"shared cached verifier:   {after:,.0f} verifications/s ({after / before:.1f}x)")
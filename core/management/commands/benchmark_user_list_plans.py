@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from auth_app.repositories.user import UserRepository
+
+
+class Command(BaseCommand):
+    help = 'Check the indexes serving the users/list/ filters on PostgreSQL, with generated users rolled back'
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000, help="users generated for the query plans")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("query plans are checked on PostgreSQL")
+
+        failures = []
+        with transaction.atomic():
+            self.generate_users(options["users"])
+            users = UserRepository.model.objects
+            company_id = users.order_by("id").values_list("id", flat=True).first()
+            newest = users.order_by("-created_at").values_list("created_at", flat=True).first()
+            # filters, one page as the cursor pagination queries it, and the expected indexes
+            checks = [
+                ("unfiltered", {}, ["users_created_id_idx"]),
+                ("ascending", {"ordering": "created_at"}, ["users_created_id_idx"]),
+                ("role", {"role": "company"}, ["users_role_created_idx"]),
+                ("status", {"status": "pending"}, ["users_status_created_idx"]),
+                ("company", {"company": company_id}, ["users_company_created_idx"]),
+                ("is_blocked", {"is_blocked": True}, ["users_blocked_created_idx"]),
+                ("created_before", {"created_before": newest}, ["users_created_id_idx"]),
+                ("search", {"search": "user12345"}, ["users_email_trgm_idx", "users_full_name_trgm_idx"]),
+            ]
+            for name, filters, indexes in checks:
+                plan = UserRepository.find_for_list(filters)[:11].explain()
+                missing = [index for index in indexes if index not in plan]
+                self.stdout.write(f"{name:<15} {'ok' if not missing else 'missing ' + ', '.join(missing)}")
+                if missing:
+                    failures.append(name)
+                    self.stdout.write(plan)
+            # the generated users are never committed
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"filters not served by their index: {', '.join(failures)}")
+
+    @staticmethod
+    def generate_users(count: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO users (
+                    password, is_superuser, created_at, updated_at, full_name, email, role,
+                    google_email_verification, is_blocked, status, email_token_used,
+                    forgot_password_token_used, is_de_activated, is_staff, is_agreement_accepted
+                )
+                SELECT
+                    '!', false, now() - n * interval '1 second', now(), 'user ' || n, 'user' || n || '@example.com',
+                    (ARRAY['super_admin', 'educator', 'company', 'candidate'])[1 + n %% 4],
+                    true, n %% 1000 = 0, CASE WHEN n %% 50 = 0 THEN 'pending' ELSE 'complete' END, false,
+                    true, false, false, false
+                FROM generate_series(1, %s) AS n
+                """,
+                [count]
+            )
+            cursor.execute("UPDATE users SET company_id = (SELECT min(id) FROM users) WHERE id % 100 = 0")
+            cursor.execute("ANALYZE users")
@@ -1,21 +1,75 @@
 import logging
-import time  # Import time module
-from datetime import timedelta
+from datetime import datetime, timedelta
 
-from celery import shared_task
+from celery import shared_task, states
+from celery.exceptions import Ignore
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
-from assessment.models import AssessmentStatus
+from assessment.models import Assessment, AssessmentStatus
 from assessment.repositories import AssessmentRepository
+from core.signals.events import assessments_expired
 
 # Set up the logger
 logger = logging.getLogger(__name__)
 
 
+def assessment_duration() -> timedelta:
+    """
+    Time a candidate has to finish an assessment.
+    """
+    return timedelta(minutes=settings.ASSESSMENT_DURATION_MINUTES)
+
+
+def assessment_time_elapsed(deadline: datetime, now: datetime = None) -> timedelta:
+    """
+    Compute the elapsed time of an assessment from its deadline, instead of
+    incrementing a counter while it runs.
+
+    Args:
+        deadline (datetime): When the assessment expires.
+        now (datetime): Reference time, defaults to now.
+
+    Returns:
+        timedelta: Elapsed time, between 0 and the assessment duration.
+    """
+    now = now or timezone.now()
+    started_at = deadline - assessment_duration()
+    return min(max(now - started_at, timedelta(0)), assessment_duration())
+
+
+def assessment_progress(deadline: datetime, now: datetime = None) -> dict:
+    """
+    PROGRESS state meta of track_assessment_time, polled by the clients.
+
+    Args:
+        deadline (datetime): When the assessment expires.
+        now (datetime): Reference time, defaults to now.
+
+    Returns:
+        dict: The elapsed time in seconds and the deadline.
+    """
+    return {
+        'time_elapsed': assessment_time_elapsed(deadline, now).total_seconds(),
+        'deadline': deadline.isoformat(),
+    }
+
+
 @shared_task(bind=True, max_retries=5)
 def track_assessment_time(self, assessment_id: int):
     """
-    Background task to track the elapsed time for an assessment.
+    Background task to start tracking the time of an assessment.
+
+    The deadline is stored once, in the `deadline` column of the assessment
+    (the assessment app adds it, nullable and indexed, in its migrations).
+    It is then enforced by the periodic sweep_expired_assessments task, or by
+    an expire_assessment task scheduled for it when ASSESSMENT_EXPIRY_MODE
+    is 'eta', so no worker is held while the assessment runs.
+
+    The task stays in the PROGRESS state, with the elapsed time, until the
+    assessment is completed: publish_assessment_progress refreshes it every
+    ASSESSMENT_PROGRESS_INTERVAL seconds and then marks it successful.
 
     Args:
         assessment_id (int): The ID of the assessment to track.
@@ -24,48 +78,130 @@ def track_assessment_time(self, assessment_id: int):
         logger.info(f"Starting to track time for assessment ID: {assessment_id}")
 
         assessment = AssessmentRepository.find_by_id(assessment_id)
+        deadline = assessment.deadline
+        if deadline is None:
+            deadline = timezone.now() + assessment_duration()
+            AssessmentRepository.update(assessment_id=assessment.id, deadline=deadline)
+
+        # in 'sweep' mode sweep_expired_assessments picks the deadline up
+        if settings.ASSESSMENT_EXPIRY_MODE == "eta":
+            expire_assessment.apply_async(args=[assessment_id], eta=deadline)
+        logger.info(f"Assessment ID {assessment_id} expires at {deadline.isoformat()}.")
+
+        self.update_state(state='PROGRESS', meta=assessment_progress(deadline))
+        publish_assessment_progress.apply_async(
+            args=[assessment_id, self.request.id], countdown=settings.ASSESSMENT_PROGRESS_INTERVAL
+        )
 
-        # Ensure time_elapsed is initialized
-        if assessment.time_elapsed is None:
-            assessment.time_elapsed = timedelta(0)  # Initialize to 0 duration
-            logger.info(f"Initialized time_elapsed for assessment ID {assessment_id} to 0.")
+    except Exception as e:
+        logger.error(f"Error occurred while tracking assessment time for ID {assessment_id}: {str(e)}")
+        raise e
 
-        # Update the time elapsed every 60 seconds for 25 iterations (total 60 minutes)
-        for _ in range(60):
-            # Wait for 10 seconds
-            self.update_state(state='PROGRESS', meta={'time_elapsed': assessment.time_elapsed.total_seconds()})
-            assessment = AssessmentRepository.find_by_id(assessment_id)
-            if assessment.status == AssessmentStatus.COMPLETED.value:
-                break
+    # keep the PROGRESS state, publish_assessment_progress completes the task
+    raise Ignore()
 
-            # Increment elapsed time by 10 seconds
-            assessment.time_elapsed += timedelta(seconds=60)
-            assessment.save()  # Save the updated assessment
 
-            logger.info(
-                f"Updated time_elapsed for assessment ID {assessment_id}: {assessment.time_elapsed.total_seconds()} seconds.")
+@shared_task(bind=True, max_retries=5)
+def publish_assessment_progress(self, assessment_id: int, task_id: str):
+    """
+    Background task refreshing the PROGRESS state of the track_assessment_time
+    task `task_id`, it runs every ASSESSMENT_PROGRESS_INTERVAL seconds, a
+    single read, until the assessment is completed.
 
-            time.sleep(60)  # Sleep for 60 seconds
+    Args:
+        assessment_id (int): The ID of the tracked assessment.
+        task_id (str): The ID of the track_assessment_time task polled by the clients.
+    """
+    assessment = AssessmentRepository.find_by_id(assessment_id)
+    if assessment is None or assessment.status == AssessmentStatus.COMPLETED.value or assessment.deadline is None:
+        track_assessment_time.backend.store_result(task_id, None, states.SUCCESS)
+        logger.info(f"Completed tracking time for assessment ID: {assessment_id}.")
+        return
+
+    now = timezone.now()
+    self.update_state(task_id=task_id, state='PROGRESS', meta=assessment_progress(assessment.deadline, now))
+    # the last refresh runs right after the deadline, once the assessment is expired
+    remaining = max((assessment.deadline - now).total_seconds(), 0) + 1
+    publish_assessment_progress.apply_async(
+        args=[assessment_id, task_id], countdown=min(settings.ASSESSMENT_PROGRESS_INTERVAL, remaining)
+    )
+
+
+@shared_task(bind=True, max_retries=5)
+def expire_assessment(self, assessment_id: int):
+    """
+    Background task fired at the deadline of an assessment, marks it as
+    completed unless the candidate already finished it.
 
+    Args:
+        assessment_id (int): The ID of the assessment to expire.
+    """
+    try:
         assessment = AssessmentRepository.find_by_id(assessment_id)
-        if assessment.status != AssessmentStatus.COMPLETED.value:
-            # Mark the assessment as completed after the loop
-            AssessmentRepository.update(
-                assessment_id=assessment.id,
-                is_active=False,
-                completed_at=timezone.now(),
-                status=AssessmentStatus.COMPLETED.value,
-                session_token=None,
-                session_expiry=None
-            )
-
-        logger.info(f"Completed tracking time for assessment ID: {assessment_id}. Assessment marked as inactive.")
+        if assessment is None or assessment.status == AssessmentStatus.COMPLETED.value:
+            return
+
+        now = timezone.now()
+        deadline = assessment.deadline or now
+        if deadline > now:
+            # the deadline moved since this task was scheduled
+            expire_assessment.apply_async(args=[assessment_id], eta=deadline)
+            return
+
+        AssessmentRepository.update(
+            assessment_id=assessment.id,
+            is_active=False,
+            completed_at=now,
+            time_elapsed=assessment_time_elapsed(deadline, now),
+            status=AssessmentStatus.COMPLETED.value,
+            session_token=None,
+            session_expiry=None
+        )
+
+        logger.info(f"Assessment ID {assessment_id} expired. Assessment marked as inactive.")
 
     except Exception as e:
-        logger.error(f"Error occurred while tracking assessment time for ID {assessment_id}: {str(e)}")
+        logger.error(f"Error occurred while expiring assessment ID {assessment_id}: {str(e)}")
         raise e
 
 
+@shared_task(bind=True, max_retries=5)
+def sweep_expired_assessments(self):
+    """
+    Periodic task (celery beat) completing every assessment past its deadline.
+
+    Expired assessments are found with one query on the deadline and
+    completed with a single UPDATE ... WHERE. A single assessments_expired
+    event is then published for all of them.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        # skip rows locked by a concurrent sweep or an expire_assessment task
+        assessment_ids = list(
+            Assessment.objects.select_for_update(skip_locked=True)
+            .filter(deadline__lte=now)
+            .exclude(status=AssessmentStatus.COMPLETED.value)
+            .values_list("id", flat=True)
+        )
+        if not assessment_ids:
+            return {'expired': 0}
+
+        Assessment.objects.filter(id__in=assessment_ids).update(
+            is_active=False,
+            completed_at=now,
+            time_elapsed=assessment_duration(),
+            status=AssessmentStatus.COMPLETED.value,
+            session_token=None,
+            session_expiry=None
+        )
+
+    assessments_expired.send(sender=Assessment, assessment_ids=assessment_ids)
+
+    logger.info(f"Expired {len(assessment_ids)} assessment(s).")
+    return {'expired': len(assessment_ids)}
+
+
 @shared_task(max_retries=5, bind=True)
 def track_team_assessment_time(self, team_id: int):
     """
@@ -0,0 +1,62 @@
+import logging
+from typing import Any, Dict, List
+
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+
+from pkg.services.email_connection_pool import get_email_connection_pool
+
+# Set up the logger
+logger = logging.getLogger(__name__)
+
+
+def serialize_email(email: EmailMultiAlternatives) -> Dict[str, Any]:
+    """
+    Convert an email into a JSON friendly payload for the celery queue.
+
+    :param email: The email to send.
+    :return: Dict[str, Any]
+    """
+    return {
+        "subject": email.subject,
+        "body": email.body,
+        "from_email": email.from_email,
+        "to": list(email.to),
+        "alternatives": [list(alternative) for alternative in getattr(email, "alternatives", [])],
+    }
+
+
+def deserialize_email(payload: Dict[str, Any]) -> EmailMultiAlternatives:
+    """
+    Build the email back from a payload made by serialize_email.
+
+    :param payload: Dict[str, Any]
+    :return: EmailMultiAlternatives
+    """
+    email = EmailMultiAlternatives(
+        payload["subject"], payload["body"], from_email=payload["from_email"], to=payload["to"]
+    )
+    for content, mimetype in payload["alternatives"]:
+        email.attach_alternative(content, mimetype)
+    return email
+
+
+@shared_task(bind=True, max_retries=settings.EMAIL_MAX_RETRIES)
+def send_email_messages(self, payloads: List[Dict[str, Any]]):
+    """
+    Background task to send a batch of emails over one pooled connection.
+    Only the emails that failed are retried, with exponential backoff.
+
+    Args:
+        payloads (List[Dict[str, Any]]): The emails, as built by serialize_email.
+    """
+    emails = [deserialize_email(payload) for payload in payloads]
+    sent, failed = get_email_connection_pool().send_messages(emails)
+    logger.info(f"Sent {sent} of {len(emails)} email(s).")
+
+    if failed:
+        raise self.retry(
+            args=[[serialize_email(email) for email in failed]],
+            countdown=settings.EMAIL_RETRY_BACKOFF * (2 ** self.request.retries),
+        )
@@ -0,0 +1,81 @@
+import logging
+import time
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from auth_app.repositories.user import UserRepository
+from auth_app.services.user_import import UserImportService
+from core.exceptions.base import ApiError
+
+# Set up the logger
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=settings.USER_IMPORT_MAX_RETRIES)
+def import_users_from_csv(self, file_path: str, company_id: int):
+    """
+    Background task to import the users of a stored CSV upload.
+
+    Progress is reported through the task state, so the status endpoint can
+    poll rows processed, rows failed and throughput while the import runs.
+    Failures are retried with exponential backoff. A retry keeps the task id,
+    which is the import checkpoint key, so it resumes after the last
+    committed chunk when the checkpoints are shared (CACHE_BACKEND=redis);
+    otherwise the users already imported are reported as existing.
+    Invalid files are not retried. The upload is deleted once the import
+    completes or fails for good.
+
+    Args:
+        file_path (str): Path of the upload in the default storage.
+        company_id (int): The ID of the company user performing the import.
+    """
+    started_at = time.monotonic()
+
+    def report_progress(checkpoint):
+        elapsed = time.monotonic() - started_at
+        self.update_state(state='PROGRESS', meta={
+            'company_id': company_id,
+            'rows_processed': checkpoint["rows_processed"],
+            'rows_imported': checkpoint["rows_imported"],
+            'rows_failed': len(checkpoint["errors"]),
+            'rows_per_second': round(checkpoint["rows_processed"] / elapsed, 2) if elapsed else None,
+        })
+
+    try:
+        logger.info(f"Starting user import {self.request.id} for company ID: {company_id}")
+        company = UserRepository.find_one_by_id(company_id)
+
+        with default_storage.open(file_path, "rb") as csv_file:
+            result = UserImportService(
+                company=company,
+                import_id=self.request.id,
+                on_progress=report_progress,
+            ).run(csv_file)
+
+        default_storage.delete(file_path)
+        elapsed = time.monotonic() - started_at
+        logger.info(
+            f"Completed user import {self.request.id}: {result.rows_imported} imported, "
+            f"{result.rows_failed} failed in {elapsed:.2f} seconds.")
+
+        return {
+            'company_id': company_id,
+            'rows_per_second': round(result.rows_processed / elapsed, 2) if elapsed else None,
+            **result.to_dict(),
+        }
+
+    except ApiError as e:
+        # the file is empty or misses a required column, a retry would fail the same way
+        logger.error(f"Invalid file for user import {self.request.id}: {str(e)}")
+        default_storage.delete(file_path)
+        raise e
+
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            logger.warning(f"User import {self.request.id} failed, retrying: {str(e)}")
+            raise self.retry(exc=e, countdown=settings.USER_IMPORT_RETRY_BACKOFF * (2 ** self.request.retries))
+        logger.error(f"Error occurred while importing users for job {self.request.id}: {str(e)}")
+        default_storage.delete(file_path)
+        raise e
@@ -0,0 +1,9 @@
+from django.dispatch import Signal
+
+# Sent once per bulk insert of users, with the created users as `users`.
+# bulk_create sends no post_save, receivers handle the whole batch at once.
+users_bulk_created = Signal()
+
+# Sent once per expiry sweep, with the ids of the assessments it completed as
+# `assessment_ids`.
+assessments_expired = Signal()
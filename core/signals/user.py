@@ -1,10 +1,14 @@
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from auth_app.models.user import UserEntity
+from auth_app.repositories.user import UserRepository
 from auth_app.utils import AuthUtils
-from core.enums.enums import ROLES
+from core.auth.revocation import revoke_user_tokens, sync_user_revocation
+from core.enums.enums import ROLES, USER_STATUS
+from core.signals.events import users_bulk_created
+from core.utils.counting import invalidate_counts
 
 
 @receiver(post_save, sender=UserEntity)
@@ -22,3 +26,81 @@ def send_welcome_email_on_signup(sender, instance, created, **kwargs):
         transaction.on_commit(lambda: AuthUtils.send_signup_verification_email(instance))
     elif created and instance.role.lower() == ROLES.CANDIDATE.value[0].lower():
         transaction.on_commit(lambda: AuthUtils.send_candidate_email_for_account_creation(instance))
+
+
+@receiver(users_bulk_created, sender=UserEntity)
+def send_emails_on_bulk_create(sender, users, **kwargs):
+    """
+    Signal to send the account emails of a whole batch of created users.
+    :param sender: The model class.
+    :param users: The users created by the bulk insert.
+    """
+    candidate_role = ROLES.CANDIDATE.value[0].lower()
+    candidates = [user for user in users if user.role.lower() == candidate_role]
+    others = [user for user in users if user.role.lower() != candidate_role]
+    # make sure send emails when transaction is commited
+    if candidates:
+        transaction.on_commit(lambda: AuthUtils.send_candidate_emails_for_account_creation(candidates))
+    if others:
+        transaction.on_commit(lambda: AuthUtils.send_signup_verification_emails(others))
+
+
+@receiver(post_save, sender=UserEntity)
+@receiver(post_delete, sender=UserEntity)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """
+    Signal to drop the user from the shared user cache on every write.
+    Covers repository updates, password updates and block/deactivate actions.
+    :param sender: The model class.
+    :param instance: The actual instance being saved or deleted.
+    """
+    user_id = instance.pk
+    UserRepository.invalidate_cache(user_id)
+    # drop it again once committed, a concurrent read may have cached the old row
+    transaction.on_commit(lambda: UserRepository.invalidate_cache(user_id))
+
+
+@receiver(post_save, sender=UserEntity)
+@receiver(post_delete, sender=UserEntity)
+def invalidate_user_counts(sender, instance, created=False, **kwargs):
+    """
+    Signal to drop the cached user counts of the paginated lists once a
+    user is created or deleted.
+    :param sender: The model class.
+    :param instance: The actual instance being saved or deleted.
+    :param created: A boolean; True if a new record was created (False on delete).
+    """
+    if created or kwargs.get("signal") is post_delete:
+        transaction.on_commit(lambda: invalidate_counts(sender))
+
+
+@receiver(users_bulk_created, sender=UserEntity)
+def invalidate_user_counts_on_bulk_create(sender, users, **kwargs):
+    """
+    Signal to drop the cached user counts once a batch of users is created.
+    :param sender: The model class.
+    :param users: The users created by the bulk insert.
+    """
+    transaction.on_commit(lambda: invalidate_counts(sender))
+
+
+@receiver(post_save, sender=UserEntity)
+def sync_user_revocation_on_save(sender, instance, **kwargs):
+    """
+    Signal to revoke (or restore) the tokens of a user once blocked,
+    deactivated, unblocked or activated. Token claims are not re-read until
+    the token expires, the revocation makes the change effective at once.
+    :param sender: The model class.
+    :param instance: The actual instance being saved.
+    """
+    transaction.on_commit(lambda: sync_user_revocation(instance))
+
+
+@receiver(post_delete, sender=UserEntity)
+def revoke_user_on_delete(sender, instance, **kwargs):
+    """
+    Signal to revoke the tokens of a deleted user.
+    :param sender: The model class.
+    :param instance: The actual instance being deleted.
+    """
+    transaction.on_commit(lambda: revoke_user_tokens(instance, USER_STATUS.DELETED.value[0]))
@@ -1 +1 @@
-from .user import LoginResult, RefreshTokenResult
\ No newline at end of file
+from .user import LoginResult, RefreshTokenResult, ImportUsersResult
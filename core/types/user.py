@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
 from auth_app.models import UserEntity
 from core.base import BaseResult
 
@@ -11,3 +13,11 @@ class RefreshTokenResult(BaseResult):
 @dataclass(frozen=True)
 class LoginResult(RefreshTokenResult):
     user: UserEntity
+
+
+@dataclass(frozen=True)
+class ImportUsersResult(BaseResult):
+    rows_processed: int
+    rows_imported: int
+    rows_failed: int
+    errors: List[Dict[str, Any]] = field(default_factory=list)
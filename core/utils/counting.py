@@ -0,0 +1,169 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Optional, Type
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import Model, QuerySet
+
+from core.cache.backends import CacheBackend, build_cache_backend
+
+
+class CountStrategy:
+    """
+    Base class of the ways the paginators compute `total_count`.
+    """
+
+    def count(self, queryset: QuerySet) -> int:
+        """
+        :param queryset: The queryset being paginated.
+        :return: The number of rows of the queryset.
+        """
+        raise NotImplementedError
+
+
+class ExactCount(CountStrategy):
+    """
+    A COUNT(*) on every call.
+    """
+
+    def count(self, queryset: QuerySet) -> int:
+        return queryset.count()
+
+
+class CachedCount(CountStrategy):
+    """
+    Caches the count of every queryset signature (its SQL and parameters)
+    for `ttl` seconds, in the shared cache backend.
+
+    Keys embed a version per table, `invalidate` bumps it so every count of
+    the table is recomputed (e.g. when a user is created or deleted).
+    Updates that only move rows between filters are picked up after `ttl`.
+    """
+
+    def __init__(self, ttl: int, backend: CacheBackend, fallback: CountStrategy = None):
+        self.ttl = ttl
+        self.backend = backend
+        self.fallback = fallback or ExactCount()
+
+    @staticmethod
+    def version_key(model: Type[Model]) -> str:
+        return f"count_version:{model._meta.db_table}"
+
+    def key(self, queryset: QuerySet) -> str:
+        sql, params = queryset.query.sql_with_params()
+        signature = hashlib.sha1(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+        version = self.backend.get(self.version_key(queryset.model)) or 0
+        return f"count:{queryset.model._meta.db_table}:{version}:{signature}"
+
+    def count(self, queryset: QuerySet) -> int:
+        try:
+            key = self.key(queryset)
+        except EmptyResultSet:  # e.g. queryset.none()
+            return 0
+        count = self.backend.get(key)
+        if count is None:
+            count = self.fallback.count(queryset)
+            self.backend.set(key, count, self.ttl)
+        return count
+
+    def invalidate(self, model: Type[Model]) -> None:
+        """
+        Drop every cached count of the table of `model`.
+
+        :param model: The model whose rows were created or deleted.
+        """
+        # a new version instead of a counter, the backends have no atomic increment
+        self.backend.set(self.version_key(model), time.time_ns(), self.ttl)
+
+
+class EstimatedCount(CountStrategy):
+    """
+    Reads the row estimate of the PostgreSQL planner instead of counting:
+    `pg_class.reltuples` for unfiltered querysets, the `Plan Rows` of
+    EXPLAIN otherwise.
+
+    Estimates below `threshold` are replaced with an exact count, small
+    results are cheap to count and their estimates are the least accurate.
+    Other databases, and tables never analyzed, use the exact count.
+    """
+
+    def __init__(self, threshold: int, fallback: CountStrategy = None):
+        self.threshold = threshold
+        self.fallback = fallback or ExactCount()
+
+    def count(self, queryset: QuerySet) -> int:
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return self.fallback.count(queryset)
+
+        try:
+            estimate = self.estimate(queryset, connection)
+        except EmptyResultSet:  # e.g. queryset.none()
+            return 0
+        if estimate is None or estimate < self.threshold:
+            return self.fallback.count(queryset)
+        return estimate
+
+    @staticmethod
+    def estimate(queryset: QuerySet, connection) -> Optional[int]:
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+                # -1 until the table is vacuumed or analyzed
+                return row[0] if row and row[0] >= 0 else None
+
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+
+_strategy: Optional[CountStrategy] = None
+_strategy_lock = threading.Lock()
+
+
+def get_count_strategy() -> CountStrategy:
+    """
+    Return the process wide strategy selected by
+    `settings.PAGINATION_COUNT_STRATEGY`: 'exact', 'cached' or 'estimate'.
+    The planner estimate is cached too.
+
+    :return: CountStrategy
+    """
+    global _strategy
+    if _strategy is None:
+        with _strategy_lock:
+            if _strategy is None:
+                mode = settings.PAGINATION_COUNT_STRATEGY
+                if mode == "cached":
+                    _strategy = CachedCount(settings.PAGINATION_COUNT_CACHE_TTL, build_cache_backend())
+                elif mode == "estimate":
+                    _strategy = CachedCount(
+                        settings.PAGINATION_COUNT_CACHE_TTL, build_cache_backend(),
+                        fallback=EstimatedCount(settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD)
+                    )
+                else:
+                    _strategy = ExactCount()
+    return _strategy
+
+
+def invalidate_counts(model: Type[Model]) -> None:
+    """
+    Drop the cached counts of the table of `model`, called when rows are
+    created or deleted.
+
+    :param model: The model whose rows were created or deleted.
+    """
+    strategy = get_count_strategy()
+    if isinstance(strategy, CachedCount):
+        strategy.invalidate(model)
@@ -1,5 +1,7 @@
 import re
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 from rest_framework import status
 
@@ -65,26 +67,34 @@ ALLOWED_COLUMNS = {
 }
 
 
+# Reverse index of every accepted header variation, built once at import time
+HEADER_INDEX = {
+    variation.strip().lower(): normalized_column
+    for normalized_column, variations in ALLOWED_COLUMNS.items()
+    for variation in variations
+}
+
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+PHONE_NUMBER_PATTERN = re.compile(r"^\+?\d{10,15}$")
+
+# Columns that must not be blank
+NON_EMPTY_COLUMNS = ("full_name", "first_name", "last_name")
+
+
 def normalize_header(header):
     """Normalize the CSV header to match allowed DB column names."""
-    header = header.strip().lower()  # Remove extra spaces and convert to lowercase
-    for normalized_column, variations in ALLOWED_COLUMNS.items():
-        if header in variations:
-            return normalized_column
-    return None  # Return None if the column is not allowed
+    return HEADER_INDEX.get(header.strip().lower())  # None if the column is not allowed
 
 
 # Validation functions
 def is_valid_email(email):
     """Check if the email format is valid."""
-    pattern = r"[^@]+@[^@]+\.[^@]+"
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def is_valid_phone_number(phone_number):
     """Check if the phone number is valid (only digits and length of 10-15)."""
-    pattern = r"^\+?\d{10,15}$"
-    return re.match(pattern, str(phone_number)) is not None
+    return PHONE_NUMBER_PATTERN.match(str(phone_number)) is not None
 
 
 def is_non_empty(value):
@@ -92,50 +102,89 @@ def is_non_empty(value):
     return value and value.strip() != ""
 
 
-def preprocess_csv(df: pd.DataFrame):
-    """Preprocess CSV headers, map them to DB column names, and validate the values."""
-    processed_data = []
+# Columns every imported user must provide
+REQUIRED_COLUMNS = ("full_name", "email", "phone_number")
 
-    # Get original headers
-    original_headers = list(df.columns)
 
-    # Create a mapping of normalized headers
-    header_mapping = {header: normalize_header(header) for header in original_headers}
+def map_headers(headers) -> Dict[str, str]:
+    """Map the CSV headers to allowed DB column names, dropping unknown headers."""
+    header_mapping = {header: normalize_header(header) for header in headers}
+    return {k: v for k, v in header_mapping.items() if v is not None}
 
-    # Remove any columns that don't have an allowed DB column name
-    valid_headers = {k: v for k, v in header_mapping.items() if v is not None}
 
-    # Remove duplicates based on the email column
-    email_column = None
+def validate_headers(valid_headers: Dict[str, str]):
+    """Raise if one of the required columns is missing from the file."""
+    missing = [column for column in REQUIRED_COLUMNS if column not in valid_headers.values()]
+    if missing:
+        raise_api_error(f"Missing required columns: {', '.join(missing)}")
+
+
+def validate_chunk(df: pd.DataFrame, valid_headers: Dict[str, str], row_offset: int = 0
+                   ) -> Tuple[Dict[int, Dict[str, str]], List[Dict[str, Any]]]:
+    """
+    Validate a chunk of the CSV and split it into valid rows and row errors.
+
+    :param df: chunk of the CSV file.
+    :param valid_headers: mapping of CSV header to DB column name (see map_headers).
+    :param row_offset: number of data rows before this chunk, used for row numbers.
+    :return: (processed rows keyed by row number, errors) where every error is
+             {"row": <1 based data row number>, "errors": [<message>, ...]}
+    """
+    row_numbers = np.arange(row_offset + 1, row_offset + len(df) + 1)
+    columns = {header: df[header].fillna("").astype(str) for header in valid_headers}
+
+    # Whole-column checks, every entry is (message prefix, invalid mask, values)
+    checks = []
     for header, db_column in valid_headers.items():
+        values = columns[header]
         if db_column == "email":
-            email_column = header
-            break
-
-    if email_column:
-        df = df.drop_duplicates(subset=email_column, keep="first")  # Remove duplicate emails
+            checks.append(("Invalid email format: ", ~values.str.match(EMAIL_PATTERN), values))
+        elif db_column == "phone_number":
+            checks.append(("Invalid phone number: ", ~values.str.match(PHONE_NUMBER_PATTERN), values))
+        elif db_column in NON_EMPTY_COLUMNS:
+            checks.append((f"{db_column} cannot be empty.", values.str.strip() == "", None))
+
+    invalid_rows = np.zeros(len(df), dtype=bool)
+    row_errors = {}
+    for message, invalid, values in checks:
+        invalid = invalid.to_numpy(dtype=bool)
+        invalid_rows |= invalid
+        # only failing rows are visited to build their messages
+        for position in np.flatnonzero(invalid):
+            detail = message + values.iat[position] if values is not None else message
+            row_errors.setdefault(position, []).append(detail)
+
+    errors = [
+        {"row": int(row_numbers[position]), "errors": row_errors[position]}
+        for position in sorted(row_errors)
+    ]
+
+    # later headers mapped to the same DB column win, as they did row by row
+    headers_by_column = {db_column: header for header, db_column in valid_headers.items()}
+    db_columns = list(headers_by_column)
+    valid_values = [columns[headers_by_column[column]].to_numpy()[~invalid_rows].tolist() for column in db_columns]
+    processed_data = {
+        row_number: dict(zip(db_columns, values))
+        for row_number, values in zip(row_numbers[~invalid_rows].tolist(), zip(*valid_values))
+    }
+
+    return processed_data, errors
 
-    for _, row in df.iterrows():
-        processed_row = {}
 
-        # Validate each row for required fields
-        for header in valid_headers:
-            db_column = valid_headers[header]
-            value = row[header]
+def preprocess_csv(df: pd.DataFrame):
+    """Preprocess CSV headers, map them to DB column names, and validate the values."""
+    valid_headers = map_headers(df.columns)
 
-            # Add validation for key fields
-            if db_column == "email" and not is_valid_email(value):
-                raise_api_error(f"Invalid email format: {value}")
-            if db_column == "phone_number" and not is_valid_phone_number(value):
-                raise_api_error(f"Invalid phone number: {value}")
-            if db_column in ["first_name", "last_name"] and not is_non_empty(value):
-                raise_api_error(f"{db_column} cannot be empty.")
+    # Remove duplicates based on the email column
+    email_column = next((header for header, column in valid_headers.items() if column == "email"), None)
+    if email_column:
+        df = df.drop_duplicates(subset=email_column, keep="first")  # Remove duplicate emails
 
-            # Add to processed row after passing validation
-            processed_row[db_column] = str(value)
-        processed_data.append(processed_row)
+    processed_data, errors = validate_chunk(df, valid_headers)
+    if errors:
+        raise_api_error(errors[0]["errors"][0])
 
-    return processed_data
+    return list(processed_data.values())
 
 
 def raise_api_error(message: str):
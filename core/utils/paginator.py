@@ -1,6 +1,35 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from functools import reduce
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
 from rest_framework.exceptions import NotFound
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from core.utils.counting import get_count_strategy
+
+
+class CountingPaginator(Paginator):
+    """
+    Django paginator taking its count from the configured count strategy
+    (see core/utils/counting.py) instead of a COUNT(*) per page.
+
+    With an approximate count, pages past the estimate are returned empty.
+    """
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            return get_count_strategy().count(self.object_list)
+        return super().count
 
 
 class Pagination(PageNumberPagination):
@@ -10,6 +39,7 @@ class Pagination(PageNumberPagination):
     """
 
     # Default pagination settings
+    django_paginator_class = CountingPaginator
     page_size = 10  # Default number of items per page
     page_size_query_param = "page_limit"  # Parameter to specify the number of items per page
     page_query_param = "page"  # Parameter to specify the page number
@@ -57,3 +87,173 @@ class Pagination(PageNumberPagination):
             "previous": self.get_previous_link() if self.page else None,  # URL for the previous page
             "result": data  # The actual paginated data (empty array if page is invalid)
         })
+
+
+class CursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination, seeking on the `ordering` columns
+    (created_at, id) instead of counting and skipping rows.
+
+    Every page is a single `WHERE (created_at, id) < (cursor) ORDER BY ...
+    LIMIT n + 1` query, so page N costs the same as page 1. The `next` and
+    `previous` links carry opaque cursors (the position of the last / first
+    row of the page, base64 encoded). The total count is only computed when
+    the client asks for it with `include_count=true`.
+    """
+
+    page_size = 10  # Default number of items per page
+    page_size_query_param = "page_limit"  # Parameter to specify the number of items per page
+    cursor_query_param = "cursor"  # Parameter carrying the opaque cursor
+    count_query_param = "include_count"  # Parameter requesting the total count
+    max_page_size = 100  # Maximum allowed number of items per page
+    ordering = ("-created_at", "-id")  # Seek columns (unless the queryset is ordered), the last one must be unique
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns the page of the queryset after the cursor of the request.
+        An invalid cursor returns an empty list, like an invalid page number
+        does with Pagination.
+
+        Args:
+            queryset: The set of data that needs to be paginated.
+            request: The HTTP request object that may contain pagination parameters.
+            view: The view instance that is using the paginator (optional).
+
+        Returns:
+            The rows of the page, in `ordering` order.
+        """
+        self.request = request
+        self.queryset = queryset
+        self.limit = self.get_page_size(request)
+        self.cursor_ordering = self.get_ordering(queryset)
+        self.next_position = self.previous_position = None
+
+        try:
+            cursor = self.decode_cursor(request, queryset.model)
+        except NotFound:
+            return []
+
+        reverse = cursor is not None and cursor["reverse"]
+        ordering = [self.invert(name) for name in self.cursor_ordering] if reverse else list(self.cursor_ordering)
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, cursor["position"]))
+
+        rows = list(queryset[:self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if reverse:
+            rows.reverse()
+        if rows:
+            if has_more or reverse:
+                self.next_position = self.position(rows[-1])
+            if (has_more and reverse) or (cursor is not None and not reverse):
+                self.previous_position = self.position(rows[0])
+        return rows
+
+    def get_paginated_response(self, data):
+        """
+        Returns a paginated response with the same envelope as Pagination,
+        `total_count` is None unless requested.
+
+        Args:
+            data: The paginated data that needs to be included in the response.
+
+        Returns:
+            A Response object containing pagination details and the paginated data.
+        """
+        return Response({
+            "total_count": self.get_count() if self.count_requested() else None,  # Total number of items
+            "limit": self.limit,  # The number of items per page
+            "next": self.get_link(self.next_position, reverse=False),  # URL for the next page
+            "previous": self.get_link(self.previous_position, reverse=True),  # URL for the previous page
+            "result": data  # The actual paginated data
+        })
+
+    def get_ordering(self, queryset) -> Sequence[str]:
+        """
+        :return: The ordering of the queryset when it orders on plain columns, `ordering` otherwise.
+        """
+        ordering = tuple(queryset.query.order_by)
+        if ordering and all(isinstance(name, str) for name in ordering):
+            return ordering
+        return self.ordering
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def count_requested(self) -> bool:
+        return self.request.query_params.get(self.count_query_param, "").lower() in ("1", "true", "yes")
+
+    def get_count(self) -> int:
+        return get_count_strategy().count(self.queryset)
+
+    def get_link(self, position: Optional[List[Any]], reverse: bool) -> Optional[str]:
+        if position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(position, reverse)
+        )
+
+    def position(self, row) -> List[Any]:
+        """
+        :return: The values of the ordering columns of a row (instance or value row).
+        """
+        if isinstance(row, dict):
+            return [row[name.lstrip("-")] for name in self.cursor_ordering]
+        return [getattr(row, name.lstrip("-")) for name in self.cursor_ordering]
+
+    @staticmethod
+    def invert(name: str) -> str:
+        return name[1:] if name.startswith("-") else f"-{name}"
+
+    @staticmethod
+    def seek_filter(ordering: Sequence[str], position: Sequence[Any]) -> Q:
+        """
+        Rows strictly after `position` in `ordering`:
+        (a > x) OR (a = x AND b > y) OR ..., with < for descending columns.
+
+        :param ordering: The ordering applied to the queryset.
+        :param position: The values of the ordering columns of the cursor row.
+        :return: Q
+        """
+        conditions = []
+        for index, name in enumerate(ordering):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            equal = {other.lstrip("-"): value for other, value in zip(ordering[:index], position)}
+            conditions.append(Q(**equal, **{f"{field}__{lookup}": position[index]}))
+        return reduce(lambda left, right: left | right, conditions)
+
+    @staticmethod
+    def encode_cursor(position: Sequence[Any], reverse: bool) -> str:
+        values = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in position]
+        payload = json.dumps({"p": values, "r": reverse}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request, model) -> Optional[Dict[str, Any]]:
+        """
+        :return: {"position": [...], "reverse": bool}, or None without a cursor.
+        :raise: NotFound for a malformed cursor.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+            values = payload["p"]
+            if len(values) != len(self.cursor_ordering):
+                raise ValueError
+            position = [
+                model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.cursor_ordering, values)
+            ]
+            return {"position": position, "reverse": bool(payload["r"])}
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError):
+            raise NotFound("Invalid cursor")
@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+
+class SlidingWindowCounter:
+    """
+    Counts hits per key over a sliding window.
+
+    The window is approximated from two fixed windows: the count of the
+    current one plus the count of the previous one weighted by how much of
+    it still overlaps the sliding window. Only two counters are kept per key.
+    """
+
+    def hit(self, key: str, window: int) -> float:
+        """
+        Record a hit and count the hits of the last `window` seconds.
+
+        :param key: counter key
+        :param window: window length in seconds
+        :return: the estimated number of hits in the window, this one included.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def estimate(previous: int, current: int, window: int, now: float) -> float:
+        elapsed = (now % window) / window
+        return previous * (1 - elapsed) + current
+
+
+class LocalSlidingWindowCounter(SlidingWindowCounter):
+    """
+    In-process counters, a [window index, previous count, current count]
+    list per key, the least recently used keys are evicted past `max_size`.
+    """
+
+    def __init__(self, max_size: int = 100000):
+        self.max_size = max_size
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, window: int) -> float:
+        now = time.time()
+        index = int(now // window)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = [index, 0, 0]
+            elif counter[0] != index:
+                # the current window became the previous one, or both are over
+                counter[1] = counter[2] if counter[0] == index - 1 else 0
+                counter[0], counter[2] = index, 0
+            counter[2] += 1
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_size:
+                self._counters.popitem(last=False)
+            previous, current = counter[1], counter[2]
+        return self.estimate(previous, current, window, now)
+
+
+class RedisSlidingWindowCounter(SlidingWindowCounter):
+    """
+    Counters shared by every process, one redis key per fixed window,
+    a hit is a single round trip.
+    """
+
+    def __init__(self, url: str):
+        # redis is only required when the redis backend is selected
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def hit(self, key: str, window: int) -> float:
+        now = time.time()
+        index = int(now // window)
+        pipe = self._client.pipeline(transaction=False)
+        pipe.incr(f"{key}:{index}")
+        pipe.expire(f"{key}:{index}", window * 2)
+        pipe.get(f"{key}:{index - 1}")
+        current, _, previous = pipe.execute()
+        return self.estimate(int(previous or 0), current, window, now)
+
+
+def build_counter() -> SlidingWindowCounter:
+    """
+    Build the counter selected by `settings.CACHE_BACKEND`.
+
+    :return: SlidingWindowCounter
+    """
+    if getattr(settings, "CACHE_BACKEND", "local") == "redis":
+        return RedisSlidingWindowCounter(settings.CACHE_REDIS_URL)
+    return LocalSlidingWindowCounter()
+
+
+class RateLimiter:
+    """
+    Limits the requests of an endpoint (scope) per identity, e.g. per IP and
+    per email, with the limits of `settings.RATE_LIMITS[scope]`.
+
+    Usage:
+    >> RateLimiter("login").check(ip="1.2.3.4", email="a@b.c")  # None, or seconds to wait
+    """
+
+    _counter: Optional[SlidingWindowCounter] = None  # shared by every limiter of the process
+
+    def __init__(self, scope: str):
+        self.scope = scope
+
+    @classmethod
+    def counter(cls) -> SlidingWindowCounter:
+        if cls._counter is None:
+            cls._counter = build_counter()
+        return cls._counter
+
+    @property
+    def limits(self) -> Dict[str, Tuple[int, int]]:
+        return settings.RATE_LIMITS.get(self.scope, {})
+
+    def check(self, **identities: Optional[str]) -> Optional[int]:
+        """
+        Record a request and check it against the limit of every identity.
+
+        :param identities: identity kind (as in RATE_LIMITS) to value, None values are skipped.
+        :return: None if allowed, else the seconds to wait before retrying.
+        """
+        retry_after = None
+        for kind, value in identities.items():
+            limit = self.limits.get(kind)
+            if limit is None or value is None:
+                continue
+            max_requests, window = limit
+            if self.counter().hit(f"rate_limit:{self.scope}:{kind}:{value}", window) > max_requests:
+                retry_after = max(retry_after or 0, window - int(time.time() % window))
+        return retry_after
@@ -20,4 +20,4 @@ celery --app asm_project worker --loglevel=info &
 
 # Start Gunicorn
 echo "Starting Gunicorn..."
-exec gunicorn --workers 1 --bind 0.0.0.0:8000 --timeout 600 --access-logfile - asm_project.wsgi:application
+exec gunicorn --workers 1 --bind 0.0.0.0:8000 --timeout 120 --access-logfile - asm_project.wsgi:application
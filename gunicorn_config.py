@@ -5,4 +5,4 @@ print(f"Raw worker value: '{raw_workers}'")  # Show raw value
 workers = int(raw_workers)  # Convert to int
 print(f"Workers set to: {workers}")  # Debug line
 bind = "0.0.0.0:8000"
-timeout = 600
+timeout = int(config('timeout', default=120))  # bulk imports run on celery, sync ones are capped (USER_IMPORT_SYNC_MAX_SIZE)
@@ -0,0 +1,125 @@
+import logging
+import queue
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+logger = logging.getLogger(__name__)
+
+
+class EmailConnectionPool:
+    """
+    Keeps a small set of open (and authenticated) mail connections alive.
+
+    Messages are sent in batches over a pooled connection instead of one
+    SMTP handshake per message. A connection that fails is closed and
+    replaced, connections idle for longer than `max_idle` seconds are
+    dropped before the server times them out.
+
+    Usage:
+    >> sent, failed = EmailConnectionPool(size=2).send_messages(messages)
+    """
+
+    def __init__(self, size: int = 2, max_idle: float = 60, max_reconnects: int = 1, **connection_kwargs):
+        """
+        :param size: Maximum number of connections open at once.
+        :param max_idle: Seconds after which an idle connection is reopened.
+        :param max_reconnects: Reconnect attempts for a message whose send failed.
+        :param connection_kwargs: Passed to django.core.mail.get_connection.
+        """
+        self.size = size
+        self.max_idle = max_idle
+        self.max_reconnects = max_reconnects
+        self.connection_kwargs = connection_kwargs
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _open(self):
+        connection = get_connection(fail_silently=False, **self.connection_kwargs)
+        connection.open()
+        return connection
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:  # the connection is dropped either way
+            logger.debug("Error while closing a mail connection", exc_info=True)
+
+    def _checkout(self):
+        while True:
+            try:
+                connection, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._open()
+            if time.monotonic() - last_used <= self.max_idle:
+                return connection
+            self._close(connection)
+
+    def send_messages(self, messages: Sequence[EmailMessage]) -> Tuple[int, List[EmailMessage]]:
+        """
+        Send the messages over a single pooled connection.
+
+        A failed message triggers a reconnect and is retried, the batch then
+        continues on the new connection. Messages that still fail are
+        returned instead of raising, so callers never resend delivered ones.
+
+        :param messages: The messages to send.
+        :return: (number of sent messages, messages that could not be sent)
+        """
+        sent = 0
+        failed = []
+        connection = None
+        self._slots.acquire()
+        try:
+            for message in messages:
+                for attempt in range(self.max_reconnects + 1):
+                    try:
+                        if connection is None:
+                            connection = self._checkout()
+                        sent += connection.send_messages([message])
+                        break
+                    except Exception as error:
+                        if connection is not None:
+                            self._close(connection)
+                            connection = None
+                        if attempt == self.max_reconnects:
+                            logger.warning(f"Sending email '{message.subject}' to {message.to} failed: {error}")
+                            failed.append(message)
+        finally:
+            if connection is not None:
+                self._idle.put((connection, time.monotonic()))
+            self._slots.release()
+        return sent, failed
+
+    def close(self):
+        """
+        Close every idle connection.
+        """
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(connection)
+
+
+_pool: Optional[EmailConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_email_connection_pool() -> EmailConnectionPool:
+    """
+    Return the process wide connection pool configured by the EMAIL_POOL_* settings.
+
+    :return: EmailConnectionPool
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = EmailConnectionPool(size=settings.EMAIL_POOL_SIZE, max_idle=settings.EMAIL_POOL_MAX_IDLE)
+    return _pool
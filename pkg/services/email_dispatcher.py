@@ -0,0 +1,193 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import List, Optional, Sequence
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+
+from core.queue.email import send_email_messages, serialize_email
+from pkg.services.email_connection_pool import EmailConnectionPool, get_email_connection_pool
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()  # sentinel telling a worker thread to exit
+
+
+class EmailDispatcher:
+    """
+    Base class of the outgoing email dispatchers.
+    """
+
+    def submit(self, email: EmailMessage) -> None:
+        """
+        Queue an email for delivery.
+
+        :param email: The email to send.
+        """
+        raise NotImplementedError
+
+    def submit_many(self, emails: Sequence[EmailMessage]) -> None:
+        """
+        Queue many emails for delivery, they are sent in batches.
+
+        :param emails: The emails to send.
+        """
+        for email in emails:
+            self.submit(email)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting work and wait for queued emails to be delivered.
+
+        :param timeout: Maximum seconds to wait, None waits forever.
+        """
+
+
+class ThreadPoolEmailDispatcher(EmailDispatcher):
+    """
+    Sends emails from a fixed number of worker threads fed by a bounded queue.
+
+    Every worker takes up to `batch_size` queued emails at once and sends
+    them over a pooled connection (see EmailConnectionPool). When the queue
+    is full `submit` blocks for up to `queue_timeout` seconds and then sends
+    the email from the calling thread, so a burst of emails slows the
+    producer down instead of growing memory or threads.
+    Failed sends are retried with exponential backoff by the workers only,
+    emails sent from the calling thread are tried once so a slow SMTP server
+    does not hold the request. The queue is drained when the process exits.
+    """
+
+    def __init__(self, workers: int, queue_size: int, queue_timeout: float,
+                 max_retries: int, retry_backoff: float, batch_size: int,
+                 pool: EmailConnectionPool):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.pool = pool
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start(self):
+        # threads are started on first use, so forked gunicorn workers get their own
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"email-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            atexit.register(self.shutdown, 30)
+
+    def submit(self, email: EmailMessage) -> None:
+        if self._closed:
+            self._deliver([email], max_retries=0)
+            return
+        self._start()
+        try:
+            self._queue.put(email, timeout=self.queue_timeout)
+        except queue.Full:
+            logger.warning("Email queue is full, sending once from the request thread.")
+            self._deliver([email], max_retries=0)
+
+    def _work(self):
+        while True:
+            batch = [self._queue.get()]
+            # take whatever else is already queued, up to a full batch
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            emails = batch[:-1] if stop else batch
+            try:
+                if emails:
+                    self._deliver(emails)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _deliver(self, emails: List[EmailMessage], max_retries: Optional[int] = None):
+        max_retries = self.max_retries if max_retries is None else max_retries
+        for attempt in range(max_retries + 1):
+            _, emails = self.pool.send_messages(emails)
+            if not emails:
+                return
+            if attempt == max_retries:
+                for email in emails:
+                    logger.error(f"Failed to send email '{email.subject}' to {email.to}")
+                return
+            delay = self.retry_backoff * (2 ** attempt)
+            logger.warning(f"Sending {len(emails)} email(s) failed, retrying in {delay}s")
+            time.sleep(delay)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._queue.put(_STOP)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in threads:
+            thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        if any(thread.is_alive() for thread in threads):
+            logger.warning(f"Email workers stopped with {self._queue.qsize()} email(s) still queued.")
+        self.pool.close()
+
+
+class CeleryEmailDispatcher(EmailDispatcher):
+    """
+    Hands emails to the `send_email_messages` celery task in batches of
+    `batch_size`, retries and backoff are handled by celery.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+
+    def submit(self, email: EmailMessage) -> None:
+        self.submit_many([email])
+
+    def submit_many(self, emails: Sequence[EmailMessage]) -> None:
+        payloads = [serialize_email(email) for email in emails]
+        for start in range(0, len(payloads), self.batch_size):
+            send_email_messages.delay(payloads[start:start + self.batch_size])
+
+
+_dispatcher: Optional[EmailDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_email_dispatcher() -> EmailDispatcher:
+    """
+    Return the process wide dispatcher selected by `settings.EMAIL_DISPATCHER`.
+
+    :return: EmailDispatcher
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                if settings.EMAIL_DISPATCHER == "celery":
+                    _dispatcher = CeleryEmailDispatcher(batch_size=settings.EMAIL_BATCH_SIZE)
+                else:
+                    _dispatcher = ThreadPoolEmailDispatcher(
+                        workers=settings.EMAIL_WORKERS,
+                        queue_size=settings.EMAIL_QUEUE_SIZE,
+                        queue_timeout=settings.EMAIL_QUEUE_TIMEOUT,
+                        max_retries=settings.EMAIL_MAX_RETRIES,
+                        retry_backoff=settings.EMAIL_RETRY_BACKOFF,
+                        batch_size=settings.EMAIL_BATCH_SIZE,
+                        pool=get_email_connection_pool(),
+                    )
+    return _dispatcher
@@ -1,84 +1,86 @@
-import threading
+from typing import List, Tuple
 
 from decouple import config
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives, send_mail
-from django.utils.html import strip_tags
+from django.core.mail import EmailMessage, EmailMultiAlternatives
 
-from auth_app.models import UserEntity
+from pkg.services.email_dispatcher import get_email_dispatcher
+from pkg.services.email_templates import EMAIL_TEMPLATES, EmailTemplate
 
 
 class EmailService:
     """
     A service class for handling email-related operations asynchronously.
+    Emails are queued on the configured dispatcher (see email_dispatcher.py)
+    and rendered from templates compiled once (see email_templates.py).
     """
 
     @staticmethod
     def send_email_async(subject: str, message: str, recipient_list: list):
         """
-        Sends an email asynchronously in a separate thread.
+        Sends an email asynchronously through the email dispatcher.
 
         :param subject: The subject of the email.
         :param message: The body of the email.
         :param recipient_list: A list of recipients to whom the email will be sent.
         """
-        email_thread = threading.Thread(
-            target=EmailService._send_email,
-            args=(subject, message, recipient_list)
+        email = EmailMessage(subject, message, from_email=settings.DEFAULT_FROM_EMAIL, to=recipient_list)
+        get_email_dispatcher().submit(email)
+
+    @staticmethod
+    def build_email(template: EmailTemplate, recipient_list: list,
+                    html_content: str, text_content: str) -> EmailMultiAlternatives:
+        """
+        Builds an email with a plain text body and an HTML alternative.
+        :param template: The template the contents were rendered from.
+        :param recipient_list: List of recipients (emails).
+        :param html_content: The rendered HTML content.
+        :param text_content: The plain text fallback.
+        :return: EmailMultiAlternatives
+        """
+        email = EmailMultiAlternatives(
+            template.subject, text_content, from_email=config("FROM_EMAIL"), to=recipient_list
         )
-        email_thread.start()
+        email.attach_alternative(html_content, "text/html")
+        return email
 
     @staticmethod
-    def _send_email(subject: str, message: str, recipient_list: list):
+    def build_template_email(template_name: str, recipient_list: list,
+                             link: str = "") -> EmailMultiAlternatives:
+        """
+        Builds an email from one of the EMAIL_TEMPLATES.
+        :param template_name: Key of the template in EMAIL_TEMPLATES.
+        :param recipient_list: List of recipients (emails).
+        :param link: The link rendered in the email, if any.
+        :return: EmailMultiAlternatives
         """
-        The method that actually sends the email. It is run on a separate thread.
+        template = EMAIL_TEMPLATES[template_name]
+        html_content, text_content = template.render(link)
+        return EmailService.build_email(template, recipient_list, html_content, text_content)
 
-        :param subject: The subject of the email.
-        :param message: The body of the email.
-        :param recipient_list: A list of recipients to whom the email will be sent.
+    @staticmethod
+    def build_template_emails(template_name: str,
+                              recipients: List[Tuple[str, str]]) -> List[EmailMultiAlternatives]:
         """
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipient_list,
-            fail_silently=False,
-        )
+        Builds one email per recipient, rendering the template as a batch.
+        :param template_name: Key of the template in EMAIL_TEMPLATES.
+        :param recipients: List of (email, link) pairs.
+        :return: List[EmailMultiAlternatives]
+        """
+        template = EMAIL_TEMPLATES[template_name]
+        contents = template.render_many([link for _, link in recipients])
+        return [
+            EmailService.build_email(template, [email], html_content, text_content)
+            for (email, _), (html_content, text_content) in zip(recipients, contents)
+        ]
 
     @staticmethod
     def send_welcome_email(recipient_list: list):
         """
         Example of an additional method for sending a welcome email.
         """
-        subject = "Title message"
-        # Create HTML content inline
-        html_content = """
-                    <!DOCTYPE html>
-                    <html>
-                    <head>
-                        <meta charset="UTF-8">
-                        <title>Welcome Message</title>
-                    </head>
-                    <body>
-                        <h2>Welcome to Our Platform!</h2>                        
-                        <p>Thankyou for choosing platform_name, Please use the link to sign in the app.</p>
-                        <br />
-                        <p>If you did not sign up for this account, please ignore this email.</p>
-                        <br>
-                        <p>Best regards,</p>
-                        <p>Your Company Team</p>
-                    </body>
-                    </html>
-                    """
-        # Convert HTML to plain text for fallback
-        text_content = strip_tags(html_content)
-
-        # Create the email object
-        email = EmailMultiAlternatives(subject, text_content, from_email=config("FROM_EMAIL"), to=recipient_list)
-        email.attach_alternative(html_content, "text/html")
-
-        # Send email in a separate thread to avoid blocking the request
-        threading.Thread(target=email.send).start()
+        # Queue the email on the dispatcher to avoid blocking the request
+        get_email_dispatcher().submit(EmailService.build_template_email("welcome", recipient_list))
 
     @staticmethod
     def send_verification_email(recipient_list, verification_link):
@@ -87,74 +89,30 @@ class EmailService:
         :param recipient_list: List of recipients (emails).
         :param verification_link: The URL for email verification.
         """
+        email = EmailService.build_template_email("verification", recipient_list, verification_link)
+        # Queue the email on the dispatcher to avoid blocking the request
+        get_email_dispatcher().submit(email)
 
-        subject = "Verify your email address"
-        # Create HTML content inline
-        html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>Email Verification</title>
-            </head>
-            <body>
-                <h2>Welcome to Our Platform!</h2>
-                <p>Please click the link below to verify your email address:</p>
-                <a href="{verification_link}" target="_blank">Verify your email</a>
-                <p>If you did not sign up for this account, please ignore this email.</p>
-                <br>
-                <p>Best regards,</p>
-                <p>Your Company Team</p>
-            </body>
-            </html>
-            """
-        # Convert HTML to plain text for fallback
-        text_content = strip_tags(html_content)
-
-        # Create the email object
-        email = EmailMultiAlternatives(subject, text_content, from_email=config("FROM_EMAIL"), to=recipient_list)
-        email.attach_alternative(html_content, "text/html")
-
-        # Send email in a separate thread to avoid blocking the request
-        threading.Thread(target=email.send).start()
+    @staticmethod
+    def send_verification_emails(recipients: List[Tuple[str, str]]):
+        """
+        Batch version of send_verification_email, every recipient
+        gets their own link.
+        The emails are sent in batches over pooled connections.
+        :param recipients: List of (email, verification link) pairs.
+        """
+        get_email_dispatcher().submit_many(EmailService.build_template_emails("verification", recipients))
 
     @staticmethod
     def send_forgot_password_email(recipient_list, verification_link):
         """
-        Sends a verification email with a unique verification link.
+        Sends a forgot password email with a unique reset link.
         :param recipient_list: List of recipients (emails).
         :param verification_link: The URL for email verification.
         """
-
-        subject = "Forgot Password"
-        # Create HTML content inline
-        html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>Forgot Password</title>
-                </head>
-                <body>
-                    <h2>Forgot password was requested.</h2>
-                    <p>Please click the link below to reset your password:</p>
-                    <a href="{verification_link}" target="_blank">Reset password</a>
-                    <p>If you did not sign up for this account, please ignore this email.</p>
-                    <br>
-                    <p>Best regards,</p>
-                    <p>Your Company Team</p>
-                </body>
-                </html>
-                """
-        # Convert HTML to plain text for fallback
-        text_content = strip_tags(html_content)
-
-        # Create the email object
-        email = EmailMultiAlternatives(subject, text_content, from_email=config("FROM_EMAIL"), to=recipient_list)
-        email.attach_alternative(html_content, "text/html")
-
-        # Send email in a separate thread to avoid blocking the request
-        threading.Thread(target=email.send).start()
+        email = EmailService.build_template_email("forgot_password", recipient_list, verification_link)
+        # Queue the email on the dispatcher to avoid blocking the request
+        get_email_dispatcher().submit(email)
 
     @staticmethod
     def send_candidate_account_create_email(recipient_list, verification_link):
@@ -163,33 +121,18 @@ class EmailService:
         :param recipient_list: List of recipients (emails).
         :param verification_link: The URL for email verification.
         """
+        email = EmailService.build_template_email("candidate_account_create", recipient_list, verification_link)
+        # Queue the email on the dispatcher to avoid blocking the request
+        get_email_dispatcher().submit(email)
 
-        subject = "Create Account"
-        # Create HTML content inline
-        html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>Create Account</title>
-                </head>
-                <body>
-                    <h2>Welcome to Our Platform!</h2>
-                    <a href="{verification_link}" target="_blank">Complete Account</a>
-                    <p>Please use this link to complete your account.</p>
-                    <p>If you did not sign up for this account, please ignore this email.</p>
-                    <br>
-                    <p>Best regards,</p>
-                    <p>Your Company Team</p>
-                </body>
-                </html>
-                """
-        # Convert HTML to plain text for fallback
-        text_content = strip_tags(html_content)
-
-        # Create the email object
-        email = EmailMultiAlternatives(subject, text_content, from_email=config("FROM_EMAIL"), to=recipient_list)
-        email.attach_alternative(html_content, "text/html")
-
-        # Send email in a separate thread to avoid blocking the request
-        threading.Thread(target=email.send).start()
+    @staticmethod
+    def send_candidate_account_create_emails(recipients: List[Tuple[str, str]]):
+        """
+        Batch version of send_candidate_account_create_email, every
+        recipient gets their own link.
+        The emails are sent in batches over pooled connections.
+        :param recipients: List of (email, verification link) pairs.
+        """
+        get_email_dispatcher().submit_many(
+            EmailService.build_template_emails("candidate_account_create", recipients)
+        )
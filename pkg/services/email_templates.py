@@ -0,0 +1,60 @@
+import os
+from typing import List, Tuple
+
+from django.template import Context, Engine
+from django.utils.html import escape, strip_tags
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "emails")
+
+# Standalone engine, the email templates do not depend on the TEMPLATES setting
+engine = Engine(dirs=[TEMPLATE_DIR], autoescape=True)
+
+# Placeholder rendered in place of the link, it survives both escaping and strip_tags
+LINK_PLACEHOLDER = "__EMAIL_LINK_PLACEHOLDER__"
+
+
+class EmailTemplate:
+    """
+    An email template compiled once, when the module is imported.
+
+    The template is rendered a single time with a placeholder instead of the
+    link, and both the HTML and its plain text alternative (strip_tags) are
+    split around that placeholder. Rendering for a recipient only joins the
+    parts with the escaped link, so no template or HTML parsing happens
+    per message.
+
+    Usage:
+    >> html_content, text_content = EMAIL_TEMPLATES["verification"].render(link)
+    """
+
+    def __init__(self, subject: str, template_name: str):
+        self.subject = subject
+        self.template = engine.get_template(template_name)
+        html_content = self.template.render(Context({"link": LINK_PLACEHOLDER}))
+        self._html_parts = html_content.split(LINK_PLACEHOLDER)
+        self._text_parts = strip_tags(html_content).split(LINK_PLACEHOLDER)
+
+    def render(self, link: str = "") -> Tuple[str, str]:
+        """
+        :param link: The link of the recipient.
+        :return: (html content, plain text content)
+        """
+        return escape(link).join(self._html_parts), link.join(self._text_parts)
+
+    def render_many(self, links: List[str]) -> List[Tuple[str, str]]:
+        """
+        Render the template for many recipients at once.
+
+        :param links: One link per recipient.
+        :return: List of (html content, plain text content), in the order of `links`.
+        """
+        html_parts, text_parts = self._html_parts, self._text_parts
+        return [(escape(link).join(html_parts), link.join(text_parts)) for link in links]
+
+
+EMAIL_TEMPLATES = {
+    "welcome": EmailTemplate("Title message", "welcome.html"),
+    "verification": EmailTemplate("Verify your email address", "verification.html"),
+    "forgot_password": EmailTemplate("Forgot Password", "forgot_password.html"),
+    "candidate_account_create": EmailTemplate("Create Account", "candidate_account_create.html"),
+}